@@ -4,6 +4,8 @@ import os
 import shutil
 import base64
 import redis
+import threading
+import time
 
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +23,7 @@ from open_webui.env import (
     REDIS_URL,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
+    REDIS_CONFIG_SYNC_INTERVAL,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
@@ -251,14 +254,24 @@ class PersistentConfig(Generic[T]):
         self.config_value = self.value
 
 
+REDIS_CONFIG_KEY_PREFIX = "open-webui:config:"
+# Incremented on every config change so other instances know to reload
+REDIS_CONFIG_VERSION_KEY = "open-webui:config-version"
+
+_UNSYNCED = object()
+
+
 class AppConfig:
     _state: dict[str, PersistentConfig]
     _redis: Optional[redis.Redis] = None
+    _redis_version = _UNSYNCED
+    _redis_checked_at: float = 0.0
 
     def __init__(
         self, redis_url: Optional[str] = None, redis_sentinels: Optional[list] = []
     ):
         super().__setattr__("_state", {})
+        super().__setattr__("_sync_lock", threading.Lock())
         if redis_url:
             super().__setattr__(
                 "_redis",
@@ -273,19 +286,57 @@ class AppConfig:
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"open-webui:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                redis_key = f"{REDIS_CONFIG_KEY_PREFIX}{key}"
+                pipe = self._redis.pipeline()
+                pipe.set(redis_key, json.dumps(self._state[key].value))
+                pipe.incr(REDIS_CONFIG_VERSION_KEY)
+                pipe.execute()
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
+        # If Redis is available, pick up values updated by other instances
         if self._redis:
-            redis_key = f"open-webui:config:{key}"
-            redis_value = self._redis.get(redis_key)
+            self._sync_from_redis()
+
+        return self._state[key].value
+
+    def _sync_from_redis(self):
+        """
+        Reload all values from Redis when the config version changed.
+
+        The version is checked at most every REDIS_CONFIG_SYNC_INTERVAL seconds, so
+        attribute reads are memory lookups and changes made on other instances show
+        up within that interval.
+        """
+        now = time.monotonic()
+        if (
+            self._redis_version is not _UNSYNCED
+            and now - self._redis_checked_at < REDIS_CONFIG_SYNC_INTERVAL
+        ):
+            return
+
+        # Another thread is already syncing, use the current values
+        if not self._sync_lock.acquire(blocking=False):
+            return
+
+        try:
+            super().__setattr__("_redis_checked_at", now)
+
+            version = self._redis.get(REDIS_CONFIG_VERSION_KEY)
+            if version == self._redis_version:
+                return
+
+            keys = list(self._state.keys())
+            redis_values = self._redis.mget(
+                [f"{REDIS_CONFIG_KEY_PREFIX}{key}" for key in keys]
+            )
+
+            for key, redis_value in zip(keys, redis_values):
+                if redis_value is None:
+                    continue
 
-            if redis_value is not None:
                 try:
                     decoded_value = json.loads(redis_value)
 
@@ -297,7 +348,11 @@ class AppConfig:
                 except json.JSONDecodeError:
                     log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
 
-        return self._state[key].value
+            super().__setattr__("_redis_version", version)
+        except redis.RedisError as e:
+            log.warning(f"Failed to sync config from Redis: {e}")
+        finally:
+            self._sync_lock.release()
 
 
 ####################################
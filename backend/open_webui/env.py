@@ -318,6 +318,48 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Realtime chat saves and socket event persistence are coalesced per message and
+# written at most every CHAT_SAVE_FLUSH_INTERVAL seconds (or after
+# CHAT_SAVE_FLUSH_MAX_UPDATES updates), and always when the response completes
+try:
+    CHAT_SAVE_FLUSH_INTERVAL = float(os.environ.get("CHAT_SAVE_FLUSH_INTERVAL", "1"))
+except ValueError:
+    CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+try:
+    CHAT_SAVE_FLUSH_MAX_UPDATES = int(
+        os.environ.get("CHAT_SAVE_FLUSH_MAX_UPDATES", "100")
+    )
+except ValueError:
+    CHAT_SAVE_FLUSH_MAX_UPDATES = 100
+
+# Owners shown with listed models, knowledge, prompts and tools are read with one
+# query and cached in memory (at most USER_CACHE_SIZE users, each for up to
+# USER_CACHE_TTL seconds so changes made by other instances are picked up)
+try:
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "1000"))
+except ValueError:
+    USER_CACHE_SIZE = 1000
+
+try:
+    USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "60"))
+except ValueError:
+    USER_CACHE_TTL = 60.0
+
+# Stream chat:completion content as appended text ("content_delta") instead of
+# re-sending the full serialized message for every token
+ENABLE_CHAT_RESPONSE_STREAM_DELTA = (
+    os.environ.get("ENABLE_CHAT_RESPONSE_STREAM_DELTA", "True").lower() == "true"
+)
+
+# Send a full content snapshot every N deltas so clients can resync
+try:
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL = int(
+        os.environ.get("CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL", "200")
+    )
+except ValueError:
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL = 200
+
 ####################################
 # REDIS
 ####################################
@@ -326,6 +368,15 @@ REDIS_URL = os.environ.get("REDIS_URL", "")
 REDIS_SENTINEL_HOSTS = os.environ.get("REDIS_SENTINEL_HOSTS", "")
 REDIS_SENTINEL_PORT = os.environ.get("REDIS_SENTINEL_PORT", "26379")
 
+# AppConfig values are read from memory; Redis is checked for config changes made
+# by other instances at most every REDIS_CONFIG_SYNC_INTERVAL seconds
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(
+        os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "1")
+    )
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 1.0
+
 ####################################
 # WEBUI_AUTH (Required for security)
 ####################################
@@ -385,6 +436,22 @@ WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
 
+# user-list/usage broadcasts are coalesced and sent at most every
+# WEBSOCKET_PRESENCE_BROADCAST_INTERVAL seconds, only when they changed
+try:
+    WEBSOCKET_PRESENCE_BROADCAST_INTERVAL = float(
+        os.environ.get("WEBSOCKET_PRESENCE_BROADCAST_INTERVAL", "1")
+    )
+except ValueError:
+    WEBSOCKET_PRESENCE_BROADCAST_INTERVAL = 1.0
+
+# Sessions in Redis expire WEBSOCKET_SESSION_TTL seconds after their worker last
+# refreshed them, so the sessions of a worker that died don't stay active
+try:
+    WEBSOCKET_SESSION_TTL = int(os.environ.get("WEBSOCKET_SESSION_TTL", "60"))
+except ValueError:
+    WEBSOCKET_SESSION_TTL = 60
+
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
 if AIOHTTP_CLIENT_TIMEOUT == "":
@@ -395,6 +462,28 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT = 300
 
+# Upstream (OpenAI/Ollama) connections are pooled and kept alive per host
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "100")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 100
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
+try:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = int(
+        os.environ.get("AIOHTTP_CLIENT_DNS_CACHE_TTL", "300")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = 300
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -408,6 +497,97 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = 10
 
+# Model lists are served from memory and refreshed in the background once they are
+# older than MODELS_CACHE_REFRESH_INTERVAL seconds
+try:
+    MODELS_CACHE_REFRESH_INTERVAL = float(
+        os.environ.get("MODELS_CACHE_REFRESH_INTERVAL", "30")
+    )
+except ValueError:
+    MODELS_CACHE_REFRESH_INTERVAL = 30.0
+
+# Upstreams whose model list request failed are skipped for
+# MODELS_UPSTREAM_RETRY_INTERVAL seconds instead of waiting for their timeout again
+try:
+    MODELS_UPSTREAM_RETRY_INTERVAL = float(
+        os.environ.get("MODELS_UPSTREAM_RETRY_INTERVAL", "30")
+    )
+except ValueError:
+    MODELS_UPSTREAM_RETRY_INTERVAL = 30.0
+
+# Loaded functions and tools are compared with their stored content (by hash) at
+# most every PLUGIN_MODULE_CHECK_INTERVAL seconds and reloaded when it changed
+try:
+    PLUGIN_MODULE_CHECK_INTERVAL = float(
+        os.environ.get("PLUGIN_MODULE_CHECK_INTERVAL", "30")
+    )
+except ValueError:
+    PLUGIN_MODULE_CHECK_INTERVAL = 30.0
+
+####################################
+# FILE INGESTION
+####################################
+
+# Uploaded files are extracted and embedded by background workers reading the
+# file_job table. Disable the in-process worker to run them in a separate process
+# only (python -m open_webui.utils.file_ingestion)
+ENABLE_FILE_INGESTION_WORKER = (
+    os.environ.get("ENABLE_FILE_INGESTION_WORKER", "True").lower() == "true"
+)
+
+try:
+    FILE_INGESTION_WORKER_CONCURRENCY = int(
+        os.environ.get("FILE_INGESTION_WORKER_CONCURRENCY", "4")
+    )
+except ValueError:
+    FILE_INGESTION_WORKER_CONCURRENCY = 4
+
+# Content extraction (loaders, transcription) and embedding are limited separately
+try:
+    FILE_INGESTION_EXTRACTION_CONCURRENCY = int(
+        os.environ.get("FILE_INGESTION_EXTRACTION_CONCURRENCY", "2")
+    )
+except ValueError:
+    FILE_INGESTION_EXTRACTION_CONCURRENCY = 2
+
+try:
+    FILE_INGESTION_EMBEDDING_CONCURRENCY = int(
+        os.environ.get("FILE_INGESTION_EMBEDDING_CONCURRENCY", "2")
+    )
+except ValueError:
+    FILE_INGESTION_EMBEDDING_CONCURRENCY = 2
+
+try:
+    FILE_INGESTION_POLL_INTERVAL = float(
+        os.environ.get("FILE_INGESTION_POLL_INTERVAL", "1")
+    )
+except ValueError:
+    FILE_INGESTION_POLL_INTERVAL = 1.0
+
+# Running jobs not updated for this many seconds (worker died) are retried, up to
+# FILE_INGESTION_MAX_ATTEMPTS times
+try:
+    FILE_INGESTION_JOB_TIMEOUT = int(
+        os.environ.get("FILE_INGESTION_JOB_TIMEOUT", "3600")
+    )
+except ValueError:
+    FILE_INGESTION_JOB_TIMEOUT = 3600
+
+try:
+    FILE_INGESTION_MAX_ATTEMPTS = int(
+        os.environ.get("FILE_INGESTION_MAX_ATTEMPTS", "3")
+    )
+except ValueError:
+    FILE_INGESTION_MAX_ATTEMPTS = 3
+
+# On shutdown, running jobs get this many seconds to finish
+try:
+    FILE_INGESTION_SHUTDOWN_TIMEOUT = float(
+        os.environ.get("FILE_INGESTION_SHUTDOWN_TIMEOUT", "30")
+    )
+except ValueError:
+    FILE_INGESTION_SHUTDOWN_TIMEOUT = 30.0
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -50,6 +50,7 @@ from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     app as socket_app,
+    periodic_session_pool_refresh,
     periodic_usage_pool_cleanup,
 )
 from open_webui.routers import (
@@ -342,6 +343,7 @@ from open_webui.env import (
     RESET_CONFIG_ON_START,
     OFFLINE_MODE,
     ENABLE_OTEL,
+    ENABLE_FILE_INGESTION_WORKER,
 )
 
 
@@ -356,7 +358,11 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
-from open_webui.utils.access_control import has_access
+from open_webui.utils.message_buffer import chat_message_buffer
+from open_webui.utils.http_client import http_clients
+from open_webui.utils.file_ingestion import create_file_ingestion_worker
+from open_webui.utils.plugin import warm_up_plugin_modules
+from open_webui.utils.access_control import has_access, user_group_ids_scope
 
 from open_webui.utils.auth import (
     get_license_data,
@@ -424,8 +430,26 @@ async def lifespan(app: FastAPI):
         get_license_data(app, LICENSE_KEY)
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_session_pool_refresh())
+
+    if ENABLE_FILE_INGESTION_WORKER:
+        app.state.FILE_INGESTION_WORKER = create_file_ingestion_worker(app)
+        app.state.FILE_INGESTION_WORKER.start()
+
+    # Load the active filters, pipes and tools before serving the first chat
+    await asyncio.to_thread(warm_up_plugin_modules, app)
+
     yield
 
+    if app.state.FILE_INGESTION_WORKER:
+        await app.state.FILE_INGESTION_WORKER.stop()
+
+    # Write message updates still held by the write-behind buffer
+    chat_message_buffer.flush_all()
+
+    # Close the pooled upstream (OpenAI/Ollama) connections
+    await http_clients.close()
+
 
 app = FastAPI(
     docs_url="/docs" if ENV == "dev" else None,
@@ -443,6 +467,7 @@ app.state.config = AppConfig(
 
 app.state.WEBUI_NAME = WEBUI_NAME
 app.state.LICENSE_METADATA = None
+app.state.FILE_INGESTION_WORKER = None
 
 
 ########################################
@@ -890,6 +915,14 @@ async def check_url(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def memoize_user_group_ids(request: Request, call_next):
+    # Access checks of a request (e.g. per model or knowledge base) share one read
+    # of the user's groups
+    with user_group_ids_scope():
+        return await call_next(request)
+
+
 @app.middleware("http")
 async def inspect_websocket(request: Request, call_next):
     if (
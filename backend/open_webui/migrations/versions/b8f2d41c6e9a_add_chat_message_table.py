@@ -0,0 +1,165 @@
+"""Add chat_message table
+
+Revision ID: b8f2d41c6e9a
+Revises: 3781e22d8b01
+Create Date: 2025-03-04 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select
+
+import time
+
+revision = "b8f2d41c6e9a"
+down_revision = "3781e22d8b01"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 100
+
+
+chat_table = table(
+    "chat",
+    sa.Column("id", sa.String()),
+    sa.Column("chat", sa.JSON()),
+)
+
+chat_message_table = table(
+    "chat_message",
+    sa.Column("chat_id", sa.Text()),
+    sa.Column("id", sa.Text()),
+    sa.Column("parent_id", sa.Text()),
+    sa.Column("role", sa.Text()),
+    sa.Column("model", sa.Text()),
+    sa.Column("content", sa.Text()),
+    sa.Column("status_history", sa.JSON()),
+    sa.Column("data", sa.JSON()),
+    sa.Column("created_at", sa.BigInteger()),
+    sa.Column("updated_at", sa.BigInteger()),
+)
+
+
+def message_to_row(chat_id, message_id, message, now):
+    # Same layout as open_webui.models.chats.message_to_row_values
+    content = message.get("content")
+    data = {
+        key: value
+        for key, value in message.items()
+        if key not in ("content", "statusHistory")
+    }
+    if content is not None and not isinstance(content, str):
+        data["content"] = content
+        content = None
+
+    model = message.get("model")
+    return {
+        "chat_id": chat_id,
+        "id": message_id,
+        "parent_id": message.get("parentId"),
+        "role": message.get("role"),
+        "model": model if isinstance(model, str) else None,
+        "content": content,
+        "status_history": message.get("statusHistory"),
+        "data": data,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def upgrade():
+    op.create_table(
+        "chat_message",
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("parent_id", sa.Text(), nullable=True),
+        sa.Column("role", sa.Text(), nullable=True),
+        sa.Column("model", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("status_history", sa.JSON(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("chat_id", "id"),
+    )
+
+    # Move history.messages of every chat into chat_message rows
+    connection = op.get_bind()
+    chat_ids = [row.id for row in connection.execute(select(chat_table.c.id))]
+    now = int(time.time())
+
+    for i in range(0, len(chat_ids), BATCH_SIZE):
+        results = connection.execute(
+            select(chat_table.c.id, chat_table.c.chat).where(
+                chat_table.c.id.in_(chat_ids[i : i + BATCH_SIZE])
+            )
+        ).fetchall()
+
+        for row in results:
+            chat = row.chat
+            history = chat.get("history") if isinstance(chat, dict) else None
+            if not isinstance(history, dict) or not isinstance(
+                history.get("messages"), dict
+            ):
+                continue
+
+            rows = [
+                message_to_row(row.id, message_id, message, now)
+                for message_id, message in history["messages"].items()
+                if isinstance(message, dict)
+            ]
+            if rows:
+                connection.execute(sa.insert(chat_message_table), rows)
+
+            connection.execute(
+                sa.update(chat_table)
+                .where(chat_table.c.id == row.id)
+                .values(chat={**chat, "history": {**history, "messages": {}}})
+            )
+
+
+def downgrade():
+    # Move the messages back into the chat JSON
+    connection = op.get_bind()
+    chat_ids = [
+        row.chat_id
+        for row in connection.execute(select(chat_message_table.c.chat_id).distinct())
+    ]
+
+    for chat_id in chat_ids:
+        messages = {}
+        for message in connection.execute(
+            select(chat_message_table)
+            .where(chat_message_table.c.chat_id == chat_id)
+            .order_by(chat_message_table.c.created_at)
+        ):
+            data = dict(message.data or {})
+            if message.content is not None:
+                data["content"] = message.content
+            if message.status_history is not None:
+                data["statusHistory"] = message.status_history
+            messages[message.id] = data
+
+        chat = connection.execute(
+            select(chat_table.c.chat).where(chat_table.c.id == chat_id)
+        ).scalar()
+        history = chat.get("history") if isinstance(chat, dict) else None
+        if not isinstance(history, dict):
+            continue
+
+        connection.execute(
+            sa.update(chat_table)
+            .where(chat_table.c.id == chat_id)
+            .values(
+                chat={
+                    **chat,
+                    "history": {
+                        **history,
+                        "messages": {**history.get("messages", {}), **messages},
+                    },
+                }
+            )
+        )
+
+    op.drop_table("chat_message")
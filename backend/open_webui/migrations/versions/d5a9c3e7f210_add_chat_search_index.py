@@ -0,0 +1,48 @@
+"""Add chat search index
+
+Revision ID: d5a9c3e7f210
+Revises: b8f2d41c6e9a
+Create Date: 2025-03-05 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d5a9c3e7f210"
+down_revision = "b8f2d41c6e9a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    # pg_trgm lets the chat search's ILIKE '%text%' use GIN indexes. Creating the
+    # extension needs the privilege to do so; without it search keeps scanning.
+    try:
+        with conn.begin_nested():
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        print(f"Skipping chat search index, pg_trgm is not available: {e}")
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS chat_message_content_trgm_idx "
+        "ON chat_message USING gin (content gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS chat_title_trgm_idx "
+        "ON chat USING gin (title gin_trgm_ops)"
+    )
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS chat_message_content_trgm_idx")
+    op.execute("DROP INDEX IF EXISTS chat_title_trgm_idx")
@@ -0,0 +1,43 @@
+"""Add file_job table
+
+Revision ID: e1c4b7a9f352
+Revises: d5a9c3e7f210
+Create Date: 2025-03-10 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e1c4b7a9f352"
+down_revision = "d5a9c3e7f210"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "file_job",
+        sa.Column("id", sa.String(), nullable=False, primary_key=True),
+        sa.Column("file_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+
+    # Workers claim the oldest pending job
+    op.create_index(
+        "file_job_status_created_at_idx", "file_job", ["status", "created_at"]
+    )
+    op.create_index("file_job_file_id_idx", "file_job", ["file_id"])
+
+
+def downgrade():
+    op.drop_index("file_job_file_id_idx", table_name="file_job")
+    op.drop_index("file_job_status_created_at_idx", table_name="file_job")
+    op.drop_table("file_job")
@@ -0,0 +1,66 @@
+"""Add group_member table
+
+Revision ID: f3b8d2c6a417
+Revises: e1c4b7a9f352
+Create Date: 2025-03-12 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select
+
+import time
+
+revision = "f3b8d2c6a417"
+down_revision = "e1c4b7a9f352"
+branch_labels = None
+depends_on = None
+
+
+group_table = table(
+    "group",
+    sa.Column("id", sa.Text()),
+    sa.Column("user_ids", sa.JSON()),
+)
+
+group_member_table = table(
+    "group_member",
+    sa.Column("group_id", sa.Text()),
+    sa.Column("user_id", sa.Text()),
+    sa.Column("created_at", sa.BigInteger()),
+)
+
+
+def upgrade():
+    op.create_table(
+        "group_member",
+        sa.Column("group_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("group_id", "user_id"),
+    )
+
+    # Access checks look up the groups of a user
+    op.create_index("group_member_user_id_idx", "group_member", ["user_id"])
+
+    # Index the members of the existing groups, group.user_ids stays as is
+    connection = op.get_bind()
+    now = int(time.time())
+
+    for row in connection.execute(
+        select(group_table.c.id, group_table.c.user_ids)
+    ).fetchall():
+        user_ids = row.user_ids if isinstance(row.user_ids, list) else []
+        rows = [
+            {"group_id": row.id, "user_id": user_id, "created_at": now}
+            for user_id in dict.fromkeys(user_ids)
+            if isinstance(user_id, str)
+        ]
+        if rows:
+            connection.execute(sa.insert(group_member_table), rows)
+
+
+def downgrade():
+    op.drop_index("group_member_user_id_idx", table_name="group_member")
+    op.drop_table("group_member")
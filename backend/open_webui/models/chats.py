@@ -10,7 +10,7 @@ from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, case, literal
 from sqlalchemy.sql import exists
 
 ####################
@@ -42,6 +42,30 @@ class Chat(Base):
     business_registration_number = Column(Text, nullable=True)
 
 
+class ChatMessage(Base):
+    """
+    A message of a chat's history (chat.chat["history"]["messages"]), stored as its
+    own row so message updates don't rewrite the whole chat document.
+    """
+
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, primary_key=True)
+    id = Column(Text, primary_key=True)
+
+    parent_id = Column(Text, nullable=True)
+    role = Column(Text, nullable=True)
+    model = Column(Text, nullable=True)
+
+    content = Column(Text, nullable=True)
+    status_history = Column(JSON, nullable=True)
+    # The remaining message fields (childrenIds, files, sources, usage, ...)
+    data = Column(JSON, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -107,11 +131,172 @@ class ChatTitleIdResponse(BaseModel):
     updated_at: int
     created_at: int
 
+
+class ChatSearchResponse(ChatTitleIdResponse):
+    # Excerpt of the first matching message and the [start, end) of the match in it
+    snippet: Optional[str] = None
+    snippet_match: Optional[list[int]] = None
+
 class ChatCompany(BaseModel):
     business_registration_number: str
 
 
+####################
+# Chat messages
+#
+# history.messages is kept in the chat_message table; the stored chat JSON keeps the
+# rest of the document (title, history.currentId, messages, ...) with an empty
+# history.messages that is filled back in when a ChatModel is returned.
+####################
+
+# Number of chats whose messages are loaded per query
+CHAT_MESSAGE_LOAD_BATCH_SIZE = 500
+
+# Characters of context around the match in search snippets
+SEARCH_SNIPPET_CONTEXT = 60
+
+
+def split_chat_messages(chat: Optional[dict]) -> tuple[Optional[dict], dict]:
+    history = chat.get("history") if isinstance(chat, dict) else None
+    if not isinstance(history, dict) or not isinstance(history.get("messages"), dict):
+        return chat, {}
+
+    return {**chat, "history": {**history, "messages": {}}}, history["messages"]
+
+
+def merge_chat_messages(chat: Optional[dict], messages: dict) -> Optional[dict]:
+    history = chat.get("history") if isinstance(chat, dict) else None
+    if not isinstance(history, dict):
+        return chat
+
+    # Chats that were not split yet still have their messages inline
+    return {
+        **chat,
+        "history": {**history, "messages": {**history.get("messages", {}), **messages}},
+    }
+
+
+def get_inline_messages(chat: Optional[dict]) -> dict:
+    history = chat.get("history") if isinstance(chat, dict) else None
+    if not isinstance(history, dict):
+        return {}
+    return history.get("messages") or {}
+
+
+def message_to_row_values(message: dict) -> dict:
+    content = message.get("content")
+    data = {
+        key: value
+        for key, value in message.items()
+        if key not in ("content", "statusHistory")
+    }
+    if content is not None and not isinstance(content, str):
+        data["content"] = content
+        content = None
+
+    return {
+        "parent_id": message.get("parentId"),
+        "role": message.get("role"),
+        "model": message.get("model") if isinstance(message.get("model"), str) else None,
+        "content": content,
+        "status_history": message.get("statusHistory"),
+        "data": data,
+    }
+
+
+def row_to_message(row: ChatMessage) -> dict:
+    message = dict(row.data or {})
+    if row.content is not None:
+        message["content"] = row.content
+    if row.status_history is not None:
+        message["statusHistory"] = row.status_history
+    return message
+
+
 class ChatTable:
+    def _get_messages_by_chat_ids(self, db, chat_ids: list[str]) -> dict[str, dict]:
+        messages = {chat_id: {} for chat_id in chat_ids}
+        for i in range(0, len(chat_ids), CHAT_MESSAGE_LOAD_BATCH_SIZE):
+            rows = (
+                db.query(ChatMessage)
+                .filter(
+                    ChatMessage.chat_id.in_(
+                        chat_ids[i : i + CHAT_MESSAGE_LOAD_BATCH_SIZE]
+                    )
+                )
+                .order_by(ChatMessage.created_at)
+            )
+            for row in rows:
+                messages[row.chat_id][row.id] = row_to_message(row)
+        return messages
+
+    def _sync_chat_messages(self, db, chat_id: str, messages: dict):
+        """Write messages as the chat's rows, only touching rows that changed."""
+        existing = {
+            row.id: row for row in db.query(ChatMessage).filter_by(chat_id=chat_id)
+        }
+        now = int(time.time())
+
+        for message_id, message in messages.items():
+            if not isinstance(message, dict):
+                continue
+
+            values = message_to_row_values(message)
+            row = existing.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=chat_id,
+                        id=message_id,
+                        **values,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            elif any(getattr(row, key) != value for key, value in values.items()):
+                for key, value in values.items():
+                    setattr(row, key, value)
+                row.updated_at = now
+
+        for row in existing.values():
+            db.delete(row)
+
+    def _set_chat(self, db, chat: Chat, data: dict) -> dict:
+        """Store data as the chat's document, returns its history.messages"""
+        chat.chat, messages = split_chat_messages(data)
+        self._sync_chat_messages(db, chat.id, messages)
+        return messages
+
+    def _delete_chat_messages(self, db, *criteria):
+        db.query(ChatMessage).filter(
+            ChatMessage.chat_id.in_(select(Chat.id).where(*criteria))
+        ).delete(synchronize_session=False)
+
+    def _to_chat_model(
+        self, db, chat: Chat, messages: Optional[dict] = None
+    ) -> ChatModel:
+        if messages is None:
+            return self._to_chat_models(db, [chat])[0]
+
+        model = ChatModel.model_validate(chat)
+        model.chat = merge_chat_messages(model.chat, messages)
+        return model
+
+    def _to_chat_models(self, db, chats: list[Chat]) -> list[ChatModel]:
+        chats = list(chats)
+        messages = self._get_messages_by_chat_ids(
+            db,
+            [
+                chat.id
+                for chat in chats
+                if isinstance(chat.chat, dict)
+                and isinstance(chat.chat.get("history"), dict)
+            ],
+        )
+        return [
+            self._to_chat_model(db, chat, messages.get(chat.id, {})) for chat in chats
+        ]
+
     def update_business_registration_number_by_chat_id(
         self, chat_id: str, business_registration_number: str
     ) -> Optional[ChatModel]:
@@ -125,7 +310,7 @@ class ChatTable:
             db.commit()
             db.refresh(chat)
             
-            return ChatModel.model_validate(chat) if chat else None
+            return self._to_chat_model(db, chat) if chat else None
 
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> str:
         with get_db() as db:
@@ -146,6 +331,7 @@ class ChatTable:
             )
 
             result = Chat(**chat.model_dump())
+            self._set_chat(db, result, form_data.chat)
             db.add(result)
             db.commit()
             db.refresh(result)
@@ -177,22 +363,23 @@ class ChatTable:
             )
 
             result = Chat(**chat.model_dump())
+            messages = self._set_chat(db, result, form_data.chat)
             db.add(result)
             db.commit()
             db.refresh(result)
-            return ChatModel.model_validate(result) if result else None
+            return self._to_chat_model(db, result, messages) if result else None
 
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = chat
+                messages = self._set_chat(db, chat_item, chat)
                 chat_item.title = chat["title"] if "title" in chat else "New Chat"
                 chat_item.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(db, chat_item, messages)
         except Exception:
             return None
 
@@ -227,68 +414,129 @@ class ChatTable:
         return self.get_chat_by_id(id)
 
     def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            chat = db.get(Chat, id)
+            if chat is None:
+                return None
 
-        return chat.chat.get("title", "New Chat")
+            return (chat.chat or {}).get("title", "New Chat")
 
     def get_messages_by_chat_id(self, id: str) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            chat = db.get(Chat, id)
+            if chat is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}) or {}
+            return {
+                **get_inline_messages(chat.chat),
+                **self._get_messages_by_chat_ids(db, [id])[id],
+            }
 
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            row = db.query(ChatMessage).filter_by(chat_id=id, id=message_id).first()
+            if row is not None:
+                return row_to_message(row)
+
+            chat = db.get(Chat, id)
+            if chat is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            return get_inline_messages(chat.chat).get(message_id, {})
 
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+    ) -> Optional[dict]:
+        return self.apply_message_updates_by_id_and_message_id(
+            id, message_id, message
+        )
 
-        chat = chat.chat
-        history = chat.get("history", {})
+    def add_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[dict]:
+        return self.apply_message_updates_by_id_and_message_id(
+            id, message_id, {}, status_history=[status], upsert=False
+        )
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+    def apply_message_updates_by_id_and_message_id(
+        self,
+        id: str,
+        message_id: str,
+        message: dict,
+        content_suffix: str = "",
+        status_history: list[dict] = [],
+        upsert: bool = True,
+    ) -> Optional[dict]:
+        """
+        Apply several coalesced message updates to the message's row.
 
-        history["currentId"] = message_id
+        message is merged into the stored message (like upsert), content_suffix is
+        appended to the resulting content and status_history is appended to the
+        message's statusHistory. Returns the updated message.
+        """
+        with get_db() as db:
+            chat = db.get(Chat, id)
+            if chat is None:
+                return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            row = db.query(ChatMessage).filter_by(chat_id=id, id=message_id).first()
+            if row is not None:
+                current = row_to_message(row)
+            else:
+                current = get_inline_messages(chat.chat).get(message_id)
 
-    def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+            if upsert:
+                updated_message = {**(current or {}), **message}
+                if content_suffix:
+                    updated_message["content"] = (
+                        updated_message.get("content", "") + content_suffix
+                    )
+            elif current is not None:
+                updated_message = current
+            else:
+                return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+            if status_history:
+                updated_message["statusHistory"] = [
+                    *updated_message.get("statusHistory", []),
+                    *status_history,
+                ]
+
+            now = int(time.time())
+            values = message_to_row_values(updated_message)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=id,
+                        id=message_id,
+                        **values,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            else:
+                for key, value in values.items():
+                    setattr(row, key, value)
+                row.updated_at = now
+
+            if upsert:
+                history = (chat.chat or {}).get("history") or {}
+                if history.get("currentId") != message_id:
+                    chat.chat = {
+                        **(chat.chat or {}),
+                        "history": {
+                            "messages": {},
+                            **history,
+                            "currentId": message_id,
+                        },
+                    }
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+            chat.updated_at = now
+            db.commit()
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            return updated_message
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -309,6 +557,9 @@ class ChatTable:
                 }
             )
             shared_result = Chat(**shared_chat.model_dump())
+            messages = self._get_messages_by_chat_ids(db, [chat_id])[chat_id]
+            self._sync_chat_messages(db, shared_chat.id, messages)
+            shared_chat.chat = merge_chat_messages(shared_chat.chat, messages)
             db.add(shared_result)
             db.commit()
             db.refresh(shared_result)
@@ -335,18 +586,21 @@ class ChatTable:
 
                 shared_chat.title = chat.title
                 shared_chat.chat = chat.chat
+                messages = self._get_messages_by_chat_ids(db, [chat_id])[chat_id]
+                self._sync_chat_messages(db, shared_chat.id, messages)
 
                 shared_chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(shared_chat)
 
-                return ChatModel.model_validate(shared_chat)
+                return self._to_chat_model(db, shared_chat, messages)
         except Exception:
             return None
 
     def delete_shared_chat_by_chat_id(self, chat_id: str) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_messages(db, Chat.user_id == f"shared-{chat_id}")
                 db.query(Chat).filter_by(user_id=f"shared-{chat_id}").delete()
                 db.commit()
 
@@ -363,7 +617,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -375,7 +629,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -387,7 +641,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -411,7 +665,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_list_by_user_id(
         self,
@@ -433,7 +687,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -484,13 +738,13 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat = db.get(Chat, id)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -512,7 +766,7 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -523,7 +777,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -532,7 +786,7 @@ class ChatTable:
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -541,7 +795,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -550,7 +804,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -560,14 +814,41 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
     ) -> list[ChatModel]:
+        if not search_text.strip():
+            return self.get_chat_list_by_user_id(user_id, include_archived, skip, limit)
+
+        results = self.search_chats_by_user_id(
+            user_id, search_text, include_archived, skip, limit
+        )
+
+        with get_db() as db:
+            chats = {
+                chat.id: chat
+                for chat in db.query(Chat).filter(
+                    Chat.id.in_([result.id for result in results])
+                )
+            }
+            return self._to_chat_models(
+                db, [chats[result.id] for result in results if result.id in chats]
+            )
+
+    def search_chats_by_user_id(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        order_by: str = "updated_at",
+    ) -> list[ChatSearchResponse]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Search the user's chats by title and message content, allowing pagination using skip and limit.
+
+        Messages are matched in the chat_message table (trigram indexed on PostgreSQL).
+        With order_by="rank", chats matching by title and then by number of matching
+        messages come first. Each result has a snippet of its first matching message.
         """
         search_text = search_text.lower().strip()
-
-        if not search_text:
-            return self.get_chat_list_by_user_id(user_id, include_archived, skip, limit)
-
         search_text_words = search_text.split(" ")
 
         # search_text might contain 'tag:tag_name' format so we need to extract the tag_name, split the search_text and remove the tags
@@ -582,36 +863,75 @@ class ChatTable:
         ]
 
         search_text = " ".join(search_text_words)
+        search_pattern = f"%{search_text}%"
 
         with get_db() as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            dialect_name = db.bind.dialect.name
+            if dialect_name == "sqlite":
+                content_match = func.lower(ChatMessage.content).like(search_pattern)
+                find_position = func.instr
+            elif dialect_name == "postgresql":
+                content_match = ChatMessage.content.ilike(search_pattern)
+                find_position = func.strpos
+            else:
+                raise NotImplementedError(
+                    f"Unsupported dialect: {db.bind.dialect.name}"
+                )
 
+            user_chat_ids = select(Chat.id).where(Chat.user_id == user_id)
             if not include_archived:
-                query = query.filter(Chat.archived == False)
+                user_chat_ids = user_chat_ids.where(Chat.archived == False)
+
+            title_match = case((Chat.title.ilike(search_pattern), 1), else_=0)
+            if search_text:
+                message_matches = (
+                    select(
+                        ChatMessage.chat_id,
+                        func.count().label("match_count"),
+                    )
+                    .where(ChatMessage.chat_id.in_(user_chat_ids), content_match)
+                    .group_by(ChatMessage.chat_id)
+                    .subquery()
+                )
+                match_count = func.coalesce(message_matches.c.match_count, 0)
+
+                query = (
+                    db.query(
+                        Chat.id,
+                        Chat.title,
+                        Chat.updated_at,
+                        Chat.created_at,
+                        match_count.label("match_count"),
+                    )
+                    .outerjoin(message_matches, message_matches.c.chat_id == Chat.id)
+                    .filter(
+                        or_(
+                            Chat.title.ilike(search_pattern),
+                            message_matches.c.chat_id.isnot(None),
+                        ),
+                    )
+                )
+            else:
+                query = db.query(
+                    Chat.id,
+                    Chat.title,
+                    Chat.updated_at,
+                    Chat.created_at,
+                    literal(0).label("match_count"),
+                )
 
-            query = query.order_by(Chat.updated_at.desc())
+            query = query.filter(Chat.user_id == user_id)
+            if not include_archived:
+                query = query.filter(Chat.archived == False)
 
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1 
-                                FROM json_each(Chat.chat, '$.messages') AS message 
-                                WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
+            if order_by == "rank" and search_text:
+                query = query.order_by(
+                    title_match.desc(), match_count.desc(), Chat.updated_at.desc()
                 )
+            else:
+                query = query.order_by(Chat.updated_at.desc())
 
+            if dialect_name == "sqlite":
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -643,24 +963,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1
-                                FROM json_array_elements(Chat.chat->'messages') AS message
-                                WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -690,18 +992,68 @@ class ChatTable:
                             ]
                         )
                     )
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
 
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
             log.info(f"The number of chats: {len(all_chats)}")
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            snippets = {}
+            matched_chat_ids = [chat.id for chat in all_chats if chat.match_count]
+            if matched_chat_ids:
+                snippets = self._get_search_snippets(
+                    db, matched_chat_ids, search_text, content_match, find_position
+                )
+
+            return [
+                ChatSearchResponse.model_validate(
+                    {
+                        "id": chat.id,
+                        "title": chat.title,
+                        "updated_at": chat.updated_at,
+                        "created_at": chat.created_at,
+                        **snippets.get(chat.id, {}),
+                    }
+                )
+                for chat in all_chats
+            ]
+
+    def _get_search_snippets(
+        self, db, chat_ids: list[str], search_text: str, content_match, find_position
+    ) -> dict[str, dict]:
+        """Excerpts around the first match in the first matching message of each chat"""
+        position = find_position(func.lower(ChatMessage.content), search_text)
+        start = case(
+            (position > SEARCH_SNIPPET_CONTEXT, position - SEARCH_SNIPPET_CONTEXT),
+            else_=1,
+        )
+        rows = (
+            db.query(
+                ChatMessage.chat_id,
+                position.label("position"),
+                start.label("start"),
+                func.substr(
+                    ChatMessage.content,
+                    start,
+                    len(search_text) + 2 * SEARCH_SNIPPET_CONTEXT,
+                ).label("excerpt"),
+            )
+            .filter(ChatMessage.chat_id.in_(chat_ids), content_match)
+            .order_by(ChatMessage.created_at)
+            .all()
+        )
+
+        snippets = {}
+        for row in rows:
+            if row.chat_id in snippets or not row.position:
+                continue
+
+            match_start = row.position - row.start
+            snippets[row.chat_id] = {
+                "snippet": row.excerpt,
+                "snippet_match": [match_start, match_start + len(search_text)],
+            }
+        return snippets
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
@@ -714,7 +1066,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -729,7 +1081,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -742,7 +1094,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -781,7 +1133,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -802,7 +1154,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -878,6 +1230,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_messages(db, Chat.id == id)
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -888,6 +1241,7 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_messages(db, Chat.id == id, Chat.user_id == user_id)
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -900,6 +1254,7 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                self._delete_chat_messages(db, Chat.user_id == user_id)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -912,6 +1267,9 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_messages(
+                    db, Chat.user_id == user_id, Chat.folder_id == folder_id
+                )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -925,6 +1283,7 @@ class ChatTable:
                 chats_by_user = db.query(Chat).filter_by(user_id=user_id).all()
                 shared_chat_ids = [f"shared-{chat.id}" for chat in chats_by_user]
 
+                self._delete_chat_messages(db, Chat.user_id.in_(shared_chat_ids))
                 db.query(Chat).filter(Chat.user_id.in_(shared_chat_ids)).delete()
                 db.commit()
 
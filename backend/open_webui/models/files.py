@@ -1,11 +1,12 @@
 import logging
 import time
+import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Text, JSON
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -233,3 +234,221 @@ class FilesTable:
 
 
 Files = FilesTable()
+
+
+####################
+# File Jobs DB Schema
+#
+# Background ingestion (extraction, embedding) of uploaded files. Jobs are
+# pending until a worker claims them, then running and finally completed or
+# failed. See open_webui/utils/file_ingestion.py.
+####################
+
+
+class FileJob(Base):
+    __tablename__ = "file_job"
+    id = Column(String, primary_key=True)
+    file_id = Column(String)
+    user_id = Column(String)
+
+    status = Column(String)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String, nullable=True)
+
+    # Parameters of the job (content_type)
+    data = Column(JSON, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("file_job_status_created_at_idx", "status", "created_at"),
+        Index("file_job_file_id_idx", "file_id"),
+    )
+
+
+class FileJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    file_id: str
+    user_id: str
+
+    status: str
+    error: Optional[str] = None
+    attempts: int = 0
+    worker_id: Optional[str] = None
+
+    data: Optional[dict] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class FileJobResponse(BaseModel):
+    id: str
+    file_id: str
+    status: str
+    error: Optional[str] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class FileJobsTable:
+    def insert_new_job(
+        self, file_id: str, user_id: str, data: Optional[dict] = None
+    ) -> Optional[FileJobModel]:
+        with get_db() as db:
+            job = FileJobModel(
+                **{
+                    "id": str(uuid.uuid4()),
+                    "file_id": file_id,
+                    "user_id": user_id,
+                    "status": "pending",
+                    "data": data,
+                    "created_at": int(time.time()),
+                    "updated_at": int(time.time()),
+                }
+            )
+
+            try:
+                result = FileJob(**job.model_dump())
+                db.add(result)
+                db.commit()
+                return job
+            except Exception as e:
+                log.exception(f"Error inserting a new file job: {e}")
+                return None
+
+    def get_job_by_id(self, id: str) -> Optional[FileJobModel]:
+        with get_db() as db:
+            job = db.get(FileJob, id)
+            return FileJobModel.model_validate(job) if job else None
+
+    def get_latest_job_by_file_id(self, file_id: str) -> Optional[FileJobModel]:
+        with get_db() as db:
+            job = (
+                db.query(FileJob)
+                .filter_by(file_id=file_id)
+                .order_by(FileJob.created_at.desc())
+                .first()
+            )
+            return FileJobModel.model_validate(job) if job else None
+
+    def claim_next_job(self, worker_id: str) -> Optional[FileJobModel]:
+        """
+        Marks the oldest pending job as running for worker_id and returns it.
+        The status check in the UPDATE makes the claim safe across workers; on
+        PostgreSQL the row lock is skipped by other workers instead of waited on.
+        """
+        with get_db() as db:
+            while True:
+                job = (
+                    db.query(FileJob)
+                    .filter_by(status="pending")
+                    .order_by(FileJob.created_at)
+                    .with_for_update(skip_locked=True)
+                    .first()
+                )
+                if job is None:
+                    db.commit()
+                    return None
+
+                claimed = (
+                    db.query(FileJob)
+                    .filter_by(id=job.id, status="pending")
+                    .update(
+                        {
+                            "status": "running",
+                            "worker_id": worker_id,
+                            "attempts": FileJob.attempts + 1,
+                            "updated_at": int(time.time()),
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+
+                if claimed:
+                    # The UPDATE bypassed the session, reload the claimed row
+                    db.refresh(job)
+                    return FileJobModel.model_validate(job)
+
+    def update_job_status_by_id(
+        self, id: str, status: str, error: Optional[str] = None
+    ) -> Optional[FileJobModel]:
+        with get_db() as db:
+            job = db.get(FileJob, id)
+            if job is None:
+                return None
+
+            job.status = status
+            job.error = error
+            job.updated_at = int(time.time())
+            db.commit()
+            return FileJobModel.model_validate(job)
+
+    def requeue_stale_jobs(self, timeout: int, max_attempts: int) -> int:
+        """Returns running jobs not updated for timeout seconds to the queue"""
+        with get_db() as db:
+            stale_before = int(time.time()) - timeout
+            stale = db.query(FileJob).filter(
+                FileJob.status == "running", FileJob.updated_at < stale_before
+            )
+
+            failed = stale.filter(FileJob.attempts >= max_attempts).update(
+                {
+                    "status": "failed",
+                    "error": "File processing did not complete",
+                    "updated_at": int(time.time()),
+                },
+                synchronize_session=False,
+            )
+            requeued = stale.filter(FileJob.attempts < max_attempts).update(
+                {"status": "pending", "worker_id": None},
+                synchronize_session=False,
+            )
+            db.commit()
+            return failed + requeued
+
+    def release_jobs_by_worker_id(
+        self, worker_id: str, exclude_ids: list[str] = []
+    ) -> int:
+        """
+        Returns the running jobs of a worker that is shutting down, except
+        exclude_ids (still processing), to the queue. The attempt is not counted.
+        """
+        with get_db() as db:
+            released = (
+                db.query(FileJob)
+                .filter_by(status="running", worker_id=worker_id)
+                .filter(FileJob.id.notin_(exclude_ids))
+                .update(
+                    {
+                        "status": "pending",
+                        "worker_id": None,
+                        "attempts": FileJob.attempts - 1,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return released
+
+    def delete_jobs_by_file_id(self, file_id: str) -> bool:
+        with get_db() as db:
+            db.query(FileJob).filter_by(file_id=file_id).delete()
+            db.commit()
+            return True
+
+    def delete_all_jobs(self) -> bool:
+        with get_db() as db:
+            db.query(FileJob).delete()
+            db.commit()
+            return True
+
+
+FileJobs = FileJobsTable()
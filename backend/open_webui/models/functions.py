@@ -155,6 +155,19 @@ class FunctionsTable:
                 .all()
             ]
 
+    def get_filter_functions_with_valves(
+        self, active_only=True
+    ) -> list[tuple[FunctionModel, dict]]:
+        with get_db() as db:
+            query = db.query(Function).filter_by(type="filter")
+            if active_only:
+                query = query.filter_by(is_active=True)
+
+            return [
+                (FunctionModel.model_validate(function), function.valves or {})
+                for function in query.all()
+            ]
+
     def get_global_action_functions(self) -> list[FunctionModel]:
         with get_db() as db:
             return [
@@ -14,7 +14,7 @@ from open_webui.models.users import Users, UserResponse
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import filter_accessible
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -129,10 +129,14 @@ class KnowledgeTable:
     def get_knowledge_bases(self) -> list[KnowledgeUserModel]:
         with get_db() as db:
             knowledge_bases = []
-            for knowledge in (
+            all_knowledge = (
                 db.query(Knowledge).order_by(Knowledge.updated_at.desc()).all()
-            ):
-                user = Users.get_user_by_id(knowledge.user_id)
+            )
+            users = Users.get_users_by_ids(
+                [knowledge.user_id for knowledge in all_knowledge]
+            )
+            for knowledge in all_knowledge:
+                user = users.get(knowledge.user_id)
                 knowledge_bases.append(
                     KnowledgeUserModel.model_validate(
                         {
@@ -146,13 +150,7 @@ class KnowledgeTable:
     def get_knowledge_bases_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[KnowledgeUserModel]:
-        knowledge_bases = self.get_knowledge_bases()
-        return [
-            knowledge_base
-            for knowledge_base in knowledge_bases
-            if knowledge_base.user_id == user_id
-            or has_access(user_id, permission, knowledge_base.access_control)
-        ]
+        return filter_accessible(user_id, self.get_knowledge_bases(), permission)
 
     def get_knowledge_by_id(self, id: str) -> Optional[KnowledgeModel]:
         try:
@@ -15,7 +15,7 @@ from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import filter_accessible
 
 
 log = logging.getLogger(__name__)
@@ -176,8 +176,10 @@ class ModelsTable:
     def get_models(self) -> list[ModelUserResponse]:
         with get_db() as db:
             models = []
-            for model in db.query(Model).filter(Model.base_model_id != None).all():
-                user = Users.get_user_by_id(model.user_id)
+            all_models = db.query(Model).filter(Model.base_model_id != None).all()
+            users = Users.get_users_by_ids([model.user_id for model in all_models])
+            for model in all_models:
+                user = users.get(model.user_id)
                 models.append(
                     ModelUserResponse.model_validate(
                         {
@@ -198,13 +200,7 @@ class ModelsTable:
     def get_models_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[ModelUserResponse]:
-        models = self.get_models()
-        return [
-            model
-            for model in models
-            if model.user_id == user_id
-            or has_access(user_id, permission, model.access_control)
-        ]
+        return filter_accessible(user_id, self.get_models(), permission)
 
     def get_model_by_id(self, id: str) -> Optional[ModelModel]:
         try:
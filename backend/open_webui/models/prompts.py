@@ -7,7 +7,7 @@ from open_webui.models.users import Users, UserResponse
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import filter_accessible
 
 ####################
 # Prompts DB Schema
@@ -105,8 +105,10 @@ class PromptsTable:
         with get_db() as db:
             prompts = []
 
-            for prompt in db.query(Prompt).order_by(Prompt.timestamp.desc()).all():
-                user = Users.get_user_by_id(prompt.user_id)
+            all_prompts = db.query(Prompt).order_by(Prompt.timestamp.desc()).all()
+            users = Users.get_users_by_ids([prompt.user_id for prompt in all_prompts])
+            for prompt in all_prompts:
+                user = users.get(prompt.user_id)
                 prompts.append(
                     PromptUserResponse.model_validate(
                         {
@@ -121,14 +123,7 @@ class PromptsTable:
     def get_prompts_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[PromptUserResponse]:
-        prompts = self.get_prompts()
-
-        return [
-            prompt
-            for prompt in prompts
-            if prompt.user_id == user_id
-            or has_access(user_id, permission, prompt.access_control)
-        ]
+        return filter_accessible(user_id, self.get_prompts(), permission)
 
     def update_prompt_by_command(
         self, command: str, form_data: PromptForm
@@ -8,7 +8,7 @@ from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import filter_accessible
 
 
 log = logging.getLogger(__name__)
@@ -145,8 +145,10 @@ class ToolsTable:
     def get_tools(self) -> list[ToolUserModel]:
         with get_db() as db:
             tools = []
-            for tool in db.query(Tool).order_by(Tool.updated_at.desc()).all():
-                user = Users.get_user_by_id(tool.user_id)
+            all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
+            users = Users.get_users_by_ids([tool.user_id for tool in all_tools])
+            for tool in all_tools:
+                user = users.get(tool.user_id)
                 tools.append(
                     ToolUserModel.model_validate(
                         {
@@ -160,14 +162,7 @@ class ToolsTable:
     def get_tools_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[ToolUserModel]:
-        tools = self.get_tools()
-
-        return [
-            tool
-            for tool in tools
-            if tool.user_id == user_id
-            or has_access(user_id, permission, tool.access_control)
-        ]
+        return filter_accessible(user_id, self.get_tools(), permission)
 
     def get_tool_valves_by_id(self, id: str) -> Optional[dict]:
         try:
@@ -1,9 +1,12 @@
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional
 import random
 import string
 
 from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.env import USER_CACHE_SIZE, USER_CACHE_TTL
 
 
 from open_webui.models.chats import Chats
@@ -103,7 +106,48 @@ class UserUpdateForm(BaseModel):
     is_manager: Optional[bool] = False
 
 
+class UserCache:
+    """
+    LRU of UserModels for hydrating list rows with their owner. Entries expire
+    after ttl seconds and are dropped by every UsersTable update or delete of the
+    user.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._users: OrderedDict[str, tuple[float, UserModel]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, id: str) -> Optional[UserModel]:
+        with self._lock:
+            entry = self._users.get(id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._users[id]
+                return None
+            self._users.move_to_end(id)
+            return entry[1]
+
+    def set(self, user: UserModel):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._users[user.id] = (time.monotonic(), user)
+            self._users.move_to_end(user.id)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+
+    def invalidate(self, id: str):
+        with self._lock:
+            self._users.pop(id, None)
+
+
 class UsersTable:
+    def __init__(self):
+        self._cache = UserCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
     def insert_new_user(
         self,
         id: str,
@@ -202,6 +246,26 @@ class UsersTable:
             users = db.query(User).filter(User.id.in_(user_ids)).all()
             return [UserModel.model_validate(user) for user in users]
 
+    def get_users_by_ids(self, user_ids: list[str]) -> dict[str, UserModel]:
+        """
+        Returns the existing users of user_ids by id, reading the ones not in the
+        cache with a single query. Meant for hydrating list rows with their owner.
+        """
+        users = {}
+        missing_ids = []
+        for id in dict.fromkeys(user_ids):
+            user = self._cache.get(id)
+            if user is not None:
+                users[id] = user
+            else:
+                missing_ids.append(id)
+
+        if missing_ids:
+            for user in self.get_users_by_user_ids(missing_ids):
+                self._cache.set(user)
+                users[user.id] = user
+        return users
+
     def get_num_users(self) -> Optional[int]:
         with get_db() as db:
             return db.query(User).count()
@@ -235,6 +299,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self._cache.invalidate(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -249,6 +314,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self._cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -262,6 +328,7 @@ class UsersTable:
                     {"last_active_at": int(time.time())}
                 )
                 db.commit()
+                self._cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -275,6 +342,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self._cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -286,6 +354,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self._cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -305,6 +374,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self._cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -323,6 +393,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    self._cache.invalidate(id)
 
                 return True
             else:
@@ -335,6 +406,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self._cache.invalidate(id)
                 return True if result == 1 else False
         except Exception:
             return False
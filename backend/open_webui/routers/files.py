@@ -20,6 +20,8 @@ from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.models.files import (
     FileForm,
+    FileJobResponse,
+    FileJobs,
     FileModel,
     FileModelResponse,
     Files,
@@ -28,8 +30,8 @@ from open_webui.models.knowledge import Knowledges
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
 from open_webui.routers.retrieval import ProcessFileForm, process_file
-from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
+from open_webui.utils.file_ingestion import IMAGE_CONTENT_TYPES
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
 
@@ -112,33 +114,28 @@ def upload_file(
                 }
             ),
         )
-        if process:
-            try:
-                if file.content_type in [
-                    "audio/mpeg",
-                    "audio/wav",
-                    "audio/ogg",
-                    "audio/x-m4a",
-                ]:
-                    file_path = Storage.get_file(file_path)
-                    result = transcribe(request, file_path)
-
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=id, content=result.get("text", "")),
-                        user=user,
-                    )
-                elif file.content_type not in ["image/png", "image/jpeg", "image/gif"]:
-                    process_file(request, ProcessFileForm(file_id=id), user=user)
+        if process and file.content_type not in IMAGE_CONTENT_TYPES:
+            # Extraction/transcription and embedding run in a file ingestion
+            # worker, the client follows the job through "file-events"
+            job = FileJobs.insert_new_job(
+                id, user.id, {"content_type": file.content_type}
+            )
+            if job:
+                if request.app.state.FILE_INGESTION_WORKER:
+                    request.app.state.FILE_INGESTION_WORKER.notify()
 
-                file_item = Files.get_file_by_id(id=id)
-            except Exception as e:
-                log.exception(e)
-                log.error(f"Error processing file: {file_item.id}")
                 file_item = FileModelResponse(
                     **{
                         **file_item.model_dump(),
-                        "error": str(e.detail) if hasattr(e, "detail") else str(e),
+                        "job": FileJobResponse(**job.model_dump()).model_dump(),
+                    }
+                )
+            else:
+                log.error(f"Error queueing file for processing: {file_item.id}")
+                file_item = FileModelResponse(
+                    **{
+                        **file_item.model_dump(),
+                        "error": ERROR_MESSAGES.DEFAULT("Error processing file"),
                     }
                 )
 
@@ -186,6 +183,7 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
 async def delete_all_files(user=Depends(get_admin_user)):
     result = Files.delete_all_files()
     if result:
+        FileJobs.delete_all_jobs()
         try:
             Storage.delete_all_files()
         except Exception as e:
@@ -231,6 +229,35 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
         )
 
 
+############################
+# Get File Job By Id
+############################
+
+
+@router.get("/{id}/job", response_model=Optional[FileJobResponse])
+async def get_file_job_by_id(id: str, user=Depends(get_verified_user)):
+    file = Files.get_file_by_id(id)
+
+    if not file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if (
+        file.user_id == user.id
+        or user.role == "admin"
+        or has_access_to_file(id, "read", user)
+    ):
+        job = FileJobs.get_latest_job_by_file_id(id)
+        return FileJobResponse(**job.model_dump()) if job else None
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+
 ############################
 # Get File Data Content By Id
 ############################
@@ -502,6 +529,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
 
         result = Files.delete_file_by_id(id)
         if result:
+            FileJobs.delete_jobs_by_file_id(id)
             try:
                 Storage.delete_file(file.path)
             except Exception as e:
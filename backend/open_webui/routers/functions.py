@@ -9,11 +9,17 @@ from open_webui.models.functions import (
     FunctionResponse,
     Functions,
 )
-from open_webui.utils.plugin import load_function_module_by_id, replace_imports
+from open_webui.utils.plugin import (
+    get_function_module,
+    load_function_module_by_id,
+    replace_imports,
+)
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.model_registry import model_registry
+from open_webui.utils.filter import invalidate_filter, invalidate_filter_plan
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
@@ -73,6 +79,8 @@ async def create_new_function(
             FUNCTIONS[form_data.id] = function_module
 
             function = Functions.insert_new_function(user.id, function_type, form_data)
+            model_registry.invalidate("models")
+            invalidate_filter_plan()
 
             function_cache_dir = CACHE_DIR / "functions" / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -127,6 +135,8 @@ async def toggle_function_by_id(id: str, user=Depends(get_admin_user)):
         function = Functions.update_function_by_id(
             id, {"is_active": not function.is_active}
         )
+        model_registry.invalidate("models")
+        invalidate_filter_plan()
 
         if function:
             return function
@@ -154,6 +164,8 @@ async def toggle_global_by_id(id: str, user=Depends(get_admin_user)):
         function = Functions.update_function_by_id(
             id, {"is_global": not function.is_global}
         )
+        model_registry.invalidate("models")
+        invalidate_filter_plan()
 
         if function:
             return function
@@ -192,6 +204,8 @@ async def update_function_by_id(
         log.debug(updated)
 
         function = Functions.update_function_by_id(id, updated)
+        model_registry.invalidate("models")
+        invalidate_filter_plan()
 
         if function:
             return function
@@ -223,6 +237,8 @@ async def delete_function_by_id(
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
+        model_registry.invalidate("models")
+        invalidate_filter_plan()
 
     return result
 
@@ -262,11 +278,7 @@ async def get_function_valves_spec_by_id(
 ):
     function = Functions.get_function_by_id(id)
     if function:
-        if id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[id]
-        else:
-            function_module, function_type, frontmatter = load_function_module_by_id(id)
-            request.app.state.FUNCTIONS[id] = function_module
+        function_module = get_function_module(request, id)
 
         if hasattr(function_module, "Valves"):
             Valves = function_module.Valves
@@ -290,11 +302,7 @@ async def update_function_valves_by_id(
 ):
     function = Functions.get_function_by_id(id)
     if function:
-        if id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[id]
-        else:
-            function_module, function_type, frontmatter = load_function_module_by_id(id)
-            request.app.state.FUNCTIONS[id] = function_module
+        function_module = get_function_module(request, id)
 
         if hasattr(function_module, "Valves"):
             Valves = function_module.Valves
@@ -303,6 +311,10 @@ async def update_function_valves_by_id(
                 form_data = {k: v for k, v in form_data.items() if v is not None}
                 valves = Valves(**form_data)
                 Functions.update_function_valves_by_id(id, valves.model_dump())
+                invalidate_filter(id)
+                # Pipe valves can change the models a function provides
+                model_registry.invalidate("models")
+                invalidate_filter_plan()
                 return valves.model_dump()
             except Exception as e:
                 log.exception(f"Error updating function values by id {id}: {e}")
@@ -353,11 +365,7 @@ async def get_function_user_valves_spec_by_id(
 ):
     function = Functions.get_function_by_id(id)
     if function:
-        if id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[id]
-        else:
-            function_module, function_type, frontmatter = load_function_module_by_id(id)
-            request.app.state.FUNCTIONS[id] = function_module
+        function_module = get_function_module(request, id)
 
         if hasattr(function_module, "UserValves"):
             UserValves = function_module.UserValves
@@ -377,11 +385,7 @@ async def update_function_user_valves_by_id(
     function = Functions.get_function_by_id(id)
 
     if function:
-        if id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[id]
-        else:
-            function_module, function_type, frontmatter = load_function_module_by_id(id)
-            request.app.state.FUNCTIONS[id] = function_module
+        function_module = get_function_module(request, id)
 
         if hasattr(function_module, "UserValves"):
             UserValves = function_module.UserValves
@@ -23,6 +23,7 @@ from open_webui.storage.provider import Storage
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.model_registry import model_registry
 
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -633,6 +634,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
                     is_active=model.is_active,
                 )
                 Models.update_model_by_id(model.id, model_form)
+                model_registry.invalidate("models")
 
     # Clean up vector DB
     try:
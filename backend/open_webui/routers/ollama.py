@@ -12,7 +12,6 @@ import time
 from typing import Optional, Union
 from urllib.parse import urlparse
 import aiohttp
-from aiocache import cached
 import requests
 from open_webui.models.users import UserModel
 
@@ -45,6 +44,8 @@ from open_webui.utils.payload import (
     apply_model_system_prompt_to_body,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.http_client import get_http_session, release_response
+from open_webui.utils.model_registry import model_registry, upstream_health
 from open_webui.utils.access_control import has_access
 
 
@@ -74,39 +75,34 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-            ) as response:
-                return await response.json()
+        async with get_http_session(url).get(
+            url,
+            timeout=timeout,
+            headers={
+                "Content-Type": "application/json",
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": user.name,
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
-    if response:
-        response.close()
-    if session:
-        await session.close()
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # The session is shared, only release the connection back to its pool
+    await release_response(response)
 
 
 async def send_post_request(
@@ -120,13 +116,10 @@ async def send_post_request(
 
     r = None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
-        r = await session.post(
+        r = await get_http_session(url).post(
             url,
             data=payload,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             headers={
                 "Content-Type": "application/json",
                 **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -154,13 +147,11 @@ async def send_post_request(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             res = await r.json()
-            await cleanup_response(r, session)
+            await cleanup_response(r)
             return res
 
     except Exception as e:
@@ -173,6 +164,7 @@ async def send_post_request(
                     detail = f"Ollama: {res.get('error', 'Unknown error')}"
             except Exception:
                 detail = f"Ollama: {e}"
+            await cleanup_response(r)
 
         raise HTTPException(
             status_code=r.status if r else 500,
@@ -180,6 +172,25 @@ async def send_post_request(
         )
 
 
+def invalidate_models():
+    model_registry.invalidate("ollama", "models")
+
+
+def invalidate_models_on_completion(response):
+    # Pulled/created models are listed once the streamed response has completed
+    if isinstance(response, StreamingResponse) and response.background:
+        cleanup = response.background
+
+        async def complete():
+            await cleanup()
+            invalidate_models()
+
+        response.background = BackgroundTask(complete)
+    else:
+        invalidate_models()
+    return response
+
+
 def get_api_key(idx, url, configs):
     parsed_url = urlparse(url)
     base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
@@ -288,6 +299,8 @@ async def update_config(
         if key in keys
     }
 
+    invalidate_models()
+
     return {
         "ENABLE_OLLAMA_API": request.app.state.config.ENABLE_OLLAMA_API,
         "OLLAMA_BASE_URLS": request.app.state.config.OLLAMA_BASE_URLS,
@@ -295,16 +308,29 @@ async def update_config(
     }
 
 
-@cached(ttl=1)
+async def send_models_request(url, key=None, user: UserModel = None):
+    # Upstreams that recently failed are skipped until their retry interval passed
+    if not upstream_health.is_available(url):
+        return None
+    return await upstream_health.track(
+        url, send_get_request(f"{url}/api/tags", key, user=user)
+    )
+
+
 async def get_all_models(request: Request, user: UserModel = None):
-    log.info("get_all_models()")
+    key, user = model_registry.user_scope("ollama", user)
+    return await model_registry.get(key, lambda: load_all_models(request, user=user))
+
+
+async def load_all_models(request: Request, user: UserModel = None):
+    log.info("load_all_models()")
     if request.app.state.config.ENABLE_OLLAMA_API:
         request_tasks = []
         for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(send_models_request(url, user=user))
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -317,9 +343,7 @@ async def get_all_models(request: Request, user: UserModel = None):
                 key = api_config.get("key", None)
 
                 if enable:
-                    request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
-                    )
+                    request_tasks.append(send_models_request(url, key, user=user))
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
@@ -576,12 +600,13 @@ async def pull_model(
     # Admin should be able to pull models from any source
     payload = {**form_data.model_dump(exclude_none=True), "insecure": True}
 
-    return await send_post_request(
+    response = await send_post_request(
         url=f"{url}/api/pull",
         payload=json.dumps(payload),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
     )
+    return invalidate_models_on_completion(response)
 
 
 class PushModelForm(BaseModel):
@@ -640,12 +665,13 @@ async def create_model(
     log.debug(f"form_data: {form_data}")
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
 
-    return await send_post_request(
+    response = await send_post_request(
         url=f"{url}/api/create",
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
     )
+    return invalidate_models_on_completion(response)
 
 
 class CopyModelForm(BaseModel):
@@ -697,6 +723,7 @@ async def copy_model(
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
         r.raise_for_status()
+        invalidate_models()
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -762,6 +789,7 @@ async def delete_model(
             },
         )
         r.raise_for_status()
+        invalidate_models()
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -26,6 +26,7 @@ from open_webui.constants import ERROR_MESSAGES
 from open_webui.routers.openai import get_all_models_responses
 
 from open_webui.utils.auth import get_admin_user
+from open_webui.utils.model_registry import model_registry
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -227,6 +228,7 @@ async def upload_pipeline(
 
         r.raise_for_status()
         data = r.json()
+        model_registry.invalidate("openai", "models")
 
         return {**data}
     except Exception as e:
@@ -278,6 +280,7 @@ async def add_pipeline(
 
         r.raise_for_status()
         data = r.json()
+        model_registry.invalidate("openai", "models")
 
         return {**data}
     except Exception as e:
@@ -323,6 +326,7 @@ async def delete_pipeline(
 
         r.raise_for_status()
         data = r.json()
+        model_registry.invalidate("openai", "models")
 
         return {**data}
     except Exception as e:
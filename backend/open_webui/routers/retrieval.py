@@ -3,6 +3,7 @@ import logging
 import mimetypes
 import os
 import shutil
+import threading
 
 import uuid
 from datetime import datetime
@@ -89,12 +90,20 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     DOCKER,
+    FILE_INGESTION_EMBEDDING_CONCURRENCY,
+    FILE_INGESTION_EXTRACTION_CONCURRENCY,
 )
 from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Files being extracted (loaders, transcription) and embedded at the same time
+FILE_EXTRACTION_SLOTS = threading.BoundedSemaphore(
+    FILE_INGESTION_EXTRACTION_CONCURRENCY
+)
+FILE_EMBEDDING_SLOTS = threading.BoundedSemaphore(FILE_INGESTION_EMBEDDING_CONCURRENCY)
+
 ##########################################
 #
 # Utility functions
@@ -1027,9 +1036,10 @@ def process_file(
                     DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                     MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                 )
-                docs = loader.load(
-                    file.filename, file.meta.get("content_type"), file_path
-                )
+                with FILE_EXTRACTION_SLOTS:
+                    docs = loader.load(
+                        file.filename, file.meta.get("content_type"), file_path
+                    )
 
                 docs = [
                     Document(
@@ -1070,18 +1080,19 @@ def process_file(
 
         if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
             try:
-                result = save_docs_to_vector_db(
-                    request,
-                    docs=docs,
-                    collection_name=collection_name,
-                    metadata={
-                        "file_id": file.id,
-                        "name": file.filename,
-                        "hash": hash,
-                    },
-                    add=(True if form_data.collection_name else False),
-                    user=user,
-                )
+                with FILE_EMBEDDING_SLOTS:
+                    result = save_docs_to_vector_db(
+                        request,
+                        docs=docs,
+                        collection_name=collection_name,
+                        metadata={
+                            "file_id": file.id,
+                            "name": file.filename,
+                            "hash": hash,
+                        },
+                        add=(True if form_data.collection_name else False),
+                        user=user,
+                    )
 
                 if result:
                     Files.update_file_metadata_by_id(
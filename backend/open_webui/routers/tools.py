@@ -10,7 +10,11 @@ from open_webui.models.tools import (
     ToolUserResponse,
     Tools,
 )
-from open_webui.utils.plugin import load_tools_module_by_id, replace_imports
+from open_webui.utils.plugin import (
+    get_tools_module,
+    load_tools_module_by_id,
+    replace_imports,
+)
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -329,11 +333,7 @@ async def get_tools_valves_spec_by_id(
 ):
     tools = Tools.get_tool_by_id(id)
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tools_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tools_module(request, id)
 
         if hasattr(tools_module, "Valves"):
             Valves = tools_module.Valves
@@ -372,11 +372,7 @@ async def update_tools_valves_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    if id in request.app.state.TOOLS:
-        tools_module = request.app.state.TOOLS[id]
-    else:
-        tools_module, _ = load_tools_module_by_id(id)
-        request.app.state.TOOLS[id] = tools_module
+    tools_module = get_tools_module(request, id)
 
     if not hasattr(tools_module, "Valves"):
         raise HTTPException(
@@ -428,11 +424,7 @@ async def get_tools_user_valves_spec_by_id(
 ):
     tools = Tools.get_tool_by_id(id)
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tools_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tools_module(request, id)
 
         if hasattr(tools_module, "UserValves"):
             UserValves = tools_module.UserValves
@@ -452,11 +444,7 @@ async def update_tools_user_valves_by_id(
     tools = Tools.get_tool_by_id(id)
 
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tools_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tools_module(request, id)
 
         if hasattr(tools_module, "UserValves"):
             UserValves = tools_module.UserValves
@@ -7,7 +7,6 @@ from redis import asyncio as aioredis
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
-from open_webui.models.chats import Chats
 from open_webui.utils.redis import (
     parse_redis_sentinel_url,
     get_sentinels_from_env,
@@ -21,9 +20,22 @@ from open_webui.env import (
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_PRESENCE_BROADCAST_INTERVAL,
+    WEBSOCKET_SESSION_TTL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock
+from open_webui.socket.utils import (
+    DiffBroadcaster,
+    LocalBroadcastState,
+    LocalLock,
+    LocalSessionPool,
+    LocalUsagePool,
+    RedisBroadcastState,
+    RedisLock,
+    RedisSessionPool,
+    RedisUsagePool,
+)
+from open_webui.utils.message_buffer import chat_message_buffer
 
 from open_webui.env import (
     GLOBAL_LOG_LEVEL,
@@ -71,25 +83,33 @@ else:
 # Timeout duration in seconds
 TIMEOUT_DURATION = 3
 
-# Dictionary to maintain the user pool
+# Pools of connected sessions/users and of models in use
 
 if WEBSOCKET_MANAGER == "redis":
     log.debug("Using Redis to manage websockets.")
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
-    SESSION_POOL = RedisDict(
-        "open-webui:session_pool",
+    SESSION_POOL = RedisSessionPool(
+        "open-webui:sessions",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
+        ttl=WEBSOCKET_SESSION_TTL,
     )
-    USER_POOL = RedisDict(
-        "open-webui:user_pool",
+    USAGE_POOL = RedisUsagePool(
+        "open-webui:usage_models",
+        timeout=TIMEOUT_DURATION,
+        redis_url=WEBSOCKET_REDIS_URL,
+        redis_sentinels=redis_sentinels,
+    )
+
+    user_list_state = RedisBroadcastState(
+        "open-webui:broadcast:user-list",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
     )
-    USAGE_POOL = RedisDict(
-        "open-webui:usage_pool",
+    usage_state = RedisBroadcastState(
+        "open-webui:broadcast:usage",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
     )
@@ -100,55 +120,52 @@ if WEBSOCKET_MANAGER == "redis":
         timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
         redis_sentinels=redis_sentinels,
     )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
-    aquire_func = release_func = renew_func = lambda: True
+    SESSION_POOL = LocalSessionPool()
+    USAGE_POOL = LocalUsagePool(timeout=TIMEOUT_DURATION)
+    user_list_state = LocalBroadcastState()
+    usage_state = LocalBroadcastState()
+    clean_up_lock = LocalLock()
 
 
 async def periodic_usage_pool_cleanup():
-    if not aquire_func():
+    if not await clean_up_lock.aquire_lock():
         log.debug("Usage pool cleanup lock already exists. Not running it.")
         return
     log.debug("Running periodic_usage_pool_cleanup")
+    session_cleanup_at = 0.0
     try:
         while True:
-            if not renew_func():
+            if not await clean_up_lock.renew_lock():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
+            # Expired models are already left out of get_models_in_use(), this
+            # only drops them from the pool
+            expired = await USAGE_POOL.cleanup()
 
-                for sid in expired_sids:
-                    del connections[sid]
+            if expired:
+                usage_broadcaster.schedule()
 
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
-
-            if send_usage:
-                # Emit updated usage information after cleaning
-                await sio.emit("usage", {"models": get_models_in_use()})
+            # Sessions of workers that died expire, drop them from the user sets
+            if time.monotonic() - session_cleanup_at >= WEBSOCKET_SESSION_TTL:
+                session_cleanup_at = time.monotonic()
+                if await SESSION_POOL.cleanup():
+                    user_list_broadcaster.schedule()
 
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
-        release_func()
+        await clean_up_lock.release_lock()
+
+
+async def periodic_session_pool_refresh():
+    # Runs in every worker, keeps the sessions connected to it from expiring
+    while True:
+        await asyncio.sleep(WEBSOCKET_SESSION_TTL / 3)
+        try:
+            await SESSION_POOL.refresh()
+        except Exception as e:
+            log.error(f"Error refreshing the session pool: {e}")
 
 
 app = socketio.ASGIApp(
@@ -157,26 +174,51 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
-    return models_in_use
+    return await USAGE_POOL.get_models_in_use()
+
+
+# The models in use are only shown to admins
+ADMIN_ROOM = "role:admin"
+
+user_list_broadcaster = DiffBroadcaster(
+    sio.emit,
+    "user-list",
+    "user_ids",
+    SESSION_POOL.get_user_ids,
+    min_interval=WEBSOCKET_PRESENCE_BROADCAST_INTERVAL,
+    store=user_list_state,
+)
+usage_broadcaster = DiffBroadcaster(
+    sio.emit,
+    "usage",
+    "models",
+    get_models_in_use,
+    min_interval=WEBSOCKET_PRESENCE_BROADCAST_INTERVAL,
+    room=ADMIN_ROOM,
+    store=usage_state,
+)
+
+
+async def add_session(sid, user):
+    await SESSION_POOL.add(sid, user.model_dump())
+    if user.role == "admin":
+        await sio.enter_room(sid, ADMIN_ROOM)
+        await usage_broadcaster.send_snapshot(sid)
+
+    await user_list_broadcaster.send_snapshot(sid)
+    user_list_broadcaster.schedule()
 
 
 @sio.on("usage")
 async def usage(sid, data):
     model_id = data["model"]
     # Record the timestamp for the last update
-    current_time = int(time.time())
+    await USAGE_POOL.touch(model_id)
 
-    # Store the new usage data and task
-    USAGE_POOL[model_id] = {
-        **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-        sid: {"updated_at": current_time},
-    }
-
-    # Broadcast the usage data to all clients
-    await sio.emit("usage", {"models": get_models_in_use()})
+    # Broadcast the usage data if the models in use changed
+    usage_broadcaster.schedule()
 
 
 @sio.event
@@ -189,15 +231,9 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            await add_session(sid, user)
 
             # print(f"user {user.name}({user.id}) connected with session ID {sid}")
-            await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
-            await sio.emit("usage", {"models": get_models_in_use()})
 
 
 @sio.on("user-join")
@@ -215,11 +251,7 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump()
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    await add_session(sid, user)
 
     # Join all the channels
     channels = Channels.get_channels_by_user_id(user.id)
@@ -229,7 +261,6 @@ async def user_join(sid, data):
 
     # print(f"user {user.name}({user.id}) connected with session ID {sid}")
 
-    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
     return {"id": user.id, "name": user.name}
 
 
@@ -270,13 +301,17 @@ async def channel_events(sid, data):
     event_type = event_data["type"]
 
     if event_type == "typing":
+        user = await SESSION_POOL.get(sid)
+        if user is None:
+            return
+
         await sio.emit(
             "channel-events",
             {
                 "channel_id": data["channel_id"],
                 "message_id": data.get("message_id", None),
                 "data": event_data,
-                "user": UserNameResponse(**SESSION_POOL[sid]).model_dump(),
+                "user": UserNameResponse(**user).model_dump(),
             },
             room=room,
         )
@@ -284,22 +319,21 @@ async def channel_events(sid, data):
 
 @sio.on("user-list")
 async def user_list(sid):
-    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    await user_list_broadcaster.send_snapshot(sid)
 
 
-@sio.event
-async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+@sio.on("usage-list")
+async def usage_list(sid):
+    user = await SESSION_POOL.get(sid)
+    if user and user.get("role") == "admin":
+        await usage_broadcaster.send_snapshot(sid)
 
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
 
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
-
-        await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+@sio.event
+async def disconnect(sid):
+    user = await SESSION_POOL.remove(sid)
+    if user:
+        user_list_broadcaster.schedule()
     else:
         pass
         # print(f"Unknown session ID {sid} disconnected")
@@ -311,7 +345,7 @@ def get_event_emitter(request_info, update_db=True):
 
         session_ids = list(
             set(
-                USER_POOL.get(user_id, [])
+                await SESSION_POOL.get_session_ids(user_id)
                 + (
                     [request_info.get("session_id")]
                     if request_info.get("session_id")
@@ -332,34 +366,25 @@ def get_event_emitter(request_info, update_db=True):
             )
 
         if update_db:
+            # Coalesced per message and written behind (see MessageWriteBuffer)
             if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
+                chat_message_buffer.add_message_status(
                     request_info["chat_id"],
                     request_info["message_id"],
                     event_data.get("data", {}),
                 )
 
             if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                content = message.get("content", "")
-                content += event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_message_buffer.append_message_content(
                     request_info["chat_id"],
                     request_info["message_id"],
-                    {
-                        "content": content,
-                    },
+                    event_data.get("data", {}).get("content", ""),
                 )
 
             if "type" in event_data and event_data["type"] == "replace":
                 content = event_data.get("data", {}).get("content", "")
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_message_buffer.upsert_message(
                     request_info["chat_id"],
                     request_info["message_id"],
                     {
@@ -389,28 +414,30 @@ def get_event_call(request_info):
 get_event_caller = get_event_call
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def emit_to_user(user_id: str, event: str, data: dict):
+    for session_id in await SESSION_POOL.get_session_ids(user_id):
+        await sio.emit(event, data, to=session_id)
+
+
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = sio.manager.get_participants(
         namespace="/",
         room=room,
     )
 
-    active_user_ids = list(
-        set(
-            [SESSION_POOL.get(session_id[0])["id"] for session_id in active_session_ids]
-        )
+    users = await SESSION_POOL.get_many(
+        [session_id[0] for session_id in active_session_ids]
     )
+    active_user_ids = list(set([user["id"] for user in users if user]))
     return active_user_ids
 
 
-def get_active_status_by_user_id(user_id):
-    if user_id in USER_POOL:
-        return True
-    return False
+async def get_active_status_by_user_id(user_id):
+    return await SESSION_POOL.is_user_active(user_id)
@@ -1,6 +1,15 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
-from open_webui.utils.redis import get_redis_connection
+from typing import Awaitable, Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.redis import get_async_redis_connection
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
 
 
 class RedisLock:
@@ -9,83 +18,445 @@ class RedisLock:
         self.lock_id = str(uuid.uuid4())
         self.timeout_secs = timeout_secs
         self.lock_obtained = False
-        self.redis = get_redis_connection(
+        self.redis = get_async_redis_connection(
             redis_url, redis_sentinels, decode_responses=True
         )
 
-    def aquire_lock(self):
+    async def aquire_lock(self):
         # nx=True will only set this key if it _hasn't_ already been set
-        self.lock_obtained = self.redis.set(
+        self.lock_obtained = await self.redis.set(
             self.lock_name, self.lock_id, nx=True, ex=self.timeout_secs
         )
         return self.lock_obtained
 
-    def renew_lock(self):
+    async def renew_lock(self):
         # xx=True will only set this key if it _has_ already been set
-        return self.redis.set(
+        return await self.redis.set(
             self.lock_name, self.lock_id, xx=True, ex=self.timeout_secs
         )
 
-    def release_lock(self):
-        lock_value = self.redis.get(self.lock_name)
+    async def release_lock(self):
+        lock_value = await self.redis.get(self.lock_name)
         if lock_value and lock_value == self.lock_id:
-            self.redis.delete(self.lock_name)
+            await self.redis.delete(self.lock_name)
 
 
-class RedisDict:
-    def __init__(self, name, redis_url, redis_sentinels=[]):
+class LocalLock:
+    async def aquire_lock(self):
+        return True
+
+    async def renew_lock(self):
+        return True
+
+    async def release_lock(self):
+        return True
+
+
+####################
+# Session pool
+#
+# Connected sessions (sid -> user) and the sessions of each user.
+####################
+
+
+class LocalSessionPool:
+    def __init__(self):
+        self.sessions: dict[str, dict] = {}
+        self.users: dict[str, set[str]] = {}
+
+    async def add(self, sid: str, user: dict):
+        self.sessions[sid] = user
+        self.users.setdefault(user["id"], set()).add(sid)
+
+    async def remove(self, sid: str) -> Optional[dict]:
+        user = self.sessions.pop(sid, None)
+        if user is None:
+            return None
+
+        sids = self.users.get(user["id"], set())
+        sids.discard(sid)
+        if not sids:
+            self.users.pop(user["id"], None)
+        return user
+
+    async def get(self, sid: str) -> Optional[dict]:
+        return self.sessions.get(sid)
+
+    async def get_many(self, sids: list[str]) -> list[Optional[dict]]:
+        return [self.sessions.get(sid) for sid in sids]
+
+    async def get_user_ids(self) -> list[str]:
+        return list(self.users.keys())
+
+    async def get_session_ids(self, user_id: str) -> list[str]:
+        return list(self.users.get(user_id, ()))
+
+    async def is_user_active(self, user_id: str) -> bool:
+        return user_id in self.users
+
+    async def refresh(self):
+        pass
+
+    async def cleanup(self) -> int:
+        return 0
+
+
+# Remove a session from its user's set and the user from the active users once
+# they have no sessions left, atomically so a concurrent connect isn't lost
+_REMOVE_SESSION_SCRIPT = """
+redis.call('SREM', KEYS[1], ARGV[1])
+if redis.call('SCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# Same for a session whose key expired, unless it was added back meanwhile
+_PRUNE_SESSION_SCRIPT = """
+local pruned = 0
+if ARGV[1] ~= '' and redis.call('EXISTS', KEYS[3]) == 0 then
+    pruned = redis.call('SREM', KEYS[1], ARGV[1])
+end
+if redis.call('SCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[2])
+end
+return pruned
+"""
+
+
+class RedisSessionPool:
+    """
+    Sessions as one key per sid ({name}:session:{sid}), the sids of each user as a
+    set ({name}:user:{user_id}) and the connected user ids as a set ({name}:users),
+    so every operation is a single round-trip (pipelined where it touches several
+    keys) instead of reading and rewriting a shared hash entry.
+
+    Session keys expire after ttl seconds unless the worker holding the sid
+    refreshes them (refresh()), so the sessions of a worker that died without
+    running disconnect go away; cleanup() then drops their sids and users from the
+    sets.
+    """
+
+    def __init__(self, name, redis_url, redis_sentinels=[], ttl: int = 60):
         self.name = name
-        self.redis = get_redis_connection(
+        self.ttl = ttl
+        self.redis = get_async_redis_connection(
             redis_url, redis_sentinels, decode_responses=True
         )
+        self._remove_session = self.redis.register_script(_REMOVE_SESSION_SCRIPT)
+        self._prune_session = self.redis.register_script(_PRUNE_SESSION_SCRIPT)
+
+        # Sessions connected to this worker (sid -> user), kept alive by refresh()
+        self._local_sessions: dict[str, dict] = {}
 
-    def __setitem__(self, key, value):
-        serialized_value = json.dumps(value)
-        self.redis.hset(self.name, key, serialized_value)
+    def _session_key(self, sid: str) -> str:
+        return f"{self.name}:session:{sid}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.name}:user:{user_id}"
+
+    @property
+    def _users_key(self) -> str:
+        return f"{self.name}:users"
+
+    async def add(self, sid: str, user: dict):
+        self._local_sessions[sid] = user
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._session_key(sid), json.dumps(user), ex=self.ttl)
+            pipe.sadd(self._user_key(user["id"]), sid)
+            pipe.sadd(self._users_key, user["id"])
+            await pipe.execute()
+
+    async def remove(self, sid: str) -> Optional[dict]:
+        self._local_sessions.pop(sid, None)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._session_key(sid))
+            pipe.delete(self._session_key(sid))
+            value, _ = await pipe.execute()
 
-    def __getitem__(self, key):
-        value = self.redis.hget(self.name, key)
         if value is None:
-            raise KeyError(key)
-        return json.loads(value)
+            return None
+
+        user = json.loads(value)
+        await self._remove_session(
+            keys=[self._user_key(user["id"]), self._users_key],
+            args=[sid, user["id"]],
+        )
+        return user
+
+    async def get(self, sid: str) -> Optional[dict]:
+        value = await self.redis.get(self._session_key(sid))
+        return json.loads(value) if value is not None else None
+
+    async def get_many(self, sids: list[str]) -> list[Optional[dict]]:
+        if not sids:
+            return []
+        values = await self.redis.mget([self._session_key(sid) for sid in sids])
+        return [json.loads(value) if value is not None else None for value in values]
+
+    async def get_user_ids(self) -> list[str]:
+        return list(await self.redis.smembers(self._users_key))
+
+    async def get_session_ids(self, user_id: str) -> list[str]:
+        return list(await self.redis.smembers(self._user_key(user_id)))
+
+    async def is_user_active(self, user_id: str) -> bool:
+        return bool(await self.redis.sismember(self._users_key, user_id))
+
+    async def refresh(self):
+        """Extends the session keys of this worker's sids by ttl seconds"""
+        sessions = list(self._local_sessions.items())
+        if not sessions:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for sid, _ in sessions:
+                pipe.expire(self._session_key(sid), self.ttl)
+            refreshed = await pipe.execute()
+
+        # Sessions that expired anyway (e.g. the refresh was late) are added back
+        for (sid, user), exists in zip(sessions, refreshed):
+            if not exists and sid in self._local_sessions:
+                await self.add(sid, user)
+
+    async def cleanup(self) -> int:
+        """
+        Removes the sids whose session key expired from the user sets, and users
+        left without sessions from the connected users. Returns the number of
+        sids removed.
+        """
+        removed = 0
+        for user_id in await self.get_user_ids():
+            sids = await self.get_session_ids(user_id)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                # With no sessions left only the user is checked
+                for sid in sids or [""]:
+                    await self._prune_session(
+                        keys=[
+                            self._user_key(user_id),
+                            self._users_key,
+                            self._session_key(sid),
+                        ],
+                        args=[sid, user_id],
+                        client=pipe,
+                    )
+                removed += sum(await pipe.execute())
+        return removed
+
+
+####################
+# Usage pool
+#
+# Models in use: a model stays in use for timeout seconds after the last "usage"
+# heartbeat of any session.
+####################
+
+
+class LocalUsagePool:
+    def __init__(self, timeout: int):
+        self.timeout = timeout
+        self.models: dict[str, float] = {}
+
+    async def touch(self, model_id: str):
+        self.models[model_id] = time.time()
+
+    async def get_models_in_use(self) -> list[str]:
+        now = time.time()
+        return [
+            model_id
+            for model_id, updated_at in self.models.items()
+            if now - updated_at <= self.timeout
+        ]
+
+    async def cleanup(self) -> int:
+        now = time.time()
+        expired = [
+            model_id
+            for model_id, updated_at in self.models.items()
+            if now - updated_at > self.timeout
+        ]
+        for model_id in expired:
+            del self.models[model_id]
+        return len(expired)
+
+
+class RedisUsagePool:
+    """
+    Sorted set of model ids scored by their last heartbeat time. A heartbeat is a
+    single ZADD and expired models are filtered by score on read, so nothing needs
+    to rewrite the entries to expire them.
+    """
+
+    def __init__(self, name, timeout: int, redis_url, redis_sentinels=[]):
+        self.name = name
+        self.timeout = timeout
+        self.redis = get_async_redis_connection(
+            redis_url, redis_sentinels, decode_responses=True
+        )
+
+    async def touch(self, model_id: str):
+        await self.redis.zadd(self.name, {model_id: time.time()})
+
+    async def get_models_in_use(self) -> list[str]:
+        return list(
+            await self.redis.zrangebyscore(
+                self.name, time.time() - self.timeout, "+inf"
+            )
+        )
+
+    async def cleanup(self) -> int:
+        return await self.redis.zremrangebyscore(
+            self.name, "-inf", f"({time.time() - self.timeout}"
+        )
+
+
+####################
+# Presence broadcasts
+####################
+
+
+class LocalBroadcastState:
+    """The last broadcast snapshot of a set and its sequence number"""
+
+    def __init__(self):
+        self.seq = 0
+        self.state: Optional[list] = None
+
+    async def swap(self, state: list) -> Optional[tuple[int, Optional[list]]]:
+        """
+        Stores state (sorted) as the latest snapshot. Returns its sequence number
+        and the previous snapshot, or None if the state didn't change.
+        """
+        if state == self.state:
+            return None
+
+        previous, self.state = self.state, state
+        self.seq += 1
+        return self.seq, previous
+
+    async def get(self) -> Optional[tuple[int, list]]:
+        return (self.seq, self.state) if self.state is not None else None
+
+
+# Replace the snapshot and bump its sequence number unless it is unchanged,
+# returning the sequence number and the previous snapshot
+_SWAP_BROADCAST_STATE_SCRIPT = """
+local previous = redis.call('GET', KEYS[2])
+if previous == ARGV[1] then
+    return false
+end
+local seq = redis.call('INCR', KEYS[1])
+redis.call('SET', KEYS[2], ARGV[1])
+return {seq, previous or ''}
+"""
+
+
+class RedisBroadcastState:
+    """
+    LocalBroadcastState shared by all workers ({name}:seq and {name}:state), so
+    every worker diffs against the snapshot clients last received, whichever
+    worker sent it.
+    """
+
+    def __init__(self, name, redis_url, redis_sentinels=[]):
+        self.name = name
+        self.redis = get_async_redis_connection(
+            redis_url, redis_sentinels, decode_responses=True
+        )
+        self._swap = self.redis.register_script(_SWAP_BROADCAST_STATE_SCRIPT)
+
+    async def swap(self, state: list) -> Optional[tuple[int, Optional[list]]]:
+        result = await self._swap(
+            keys=[f"{self.name}:seq", f"{self.name}:state"], args=[json.dumps(state)]
+        )
+        if not result:
+            return None
+
+        seq, previous = result
+        return int(seq), json.loads(previous) if previous else None
+
+    async def get(self) -> Optional[tuple[int, list]]:
+        seq, state = await self.redis.mget(f"{self.name}:seq", f"{self.name}:state")
+        return (int(seq), json.loads(state)) if state is not None else None
+
+
+class DiffBroadcaster:
+    """
+    Coalesces broadcasts of a set (connected user ids, models in use).
+
+    schedule() marks the set as possibly changed; it is then read and emitted at
+    most every min_interval seconds, and only if it differs from the last
+    snapshot in store (shared by all workers with RedisBroadcastState). The first
+    emit is the full list ({key: [...]}), later ones only the difference from the
+    snapshot ({"added": [...], "removed": [...]}). Every emit carries the
+    snapshot's sequence number ("seq"); clients that connect, or that miss a
+    number, get the full list through send_snapshot().
+    """
 
-    def __delitem__(self, key):
-        result = self.redis.hdel(self.name, key)
-        if result == 0:
-            raise KeyError(key)
+    def __init__(
+        self,
+        emit: Callable[..., Awaitable],
+        event: str,
+        key: str,
+        get_state: Callable[[], Awaitable[list]],
+        min_interval: float,
+        room: Optional[str] = None,
+        store=None,
+    ):
+        self.emit = emit
+        self.event = event
+        self.key = key
+        self.get_state = get_state
+        self.min_interval = min_interval
+        self.room = room
+        self.store = store if store is not None else LocalBroadcastState()
 
-    def __contains__(self, key):
-        return self.redis.hexists(self.name, key)
+        self._last_emit_at = 0.0
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
 
-    def __len__(self):
-        return self.redis.hlen(self.name)
+    def schedule(self):
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
 
-    def keys(self):
-        return self.redis.hkeys(self.name)
+    async def _swap_state(self) -> Optional[tuple[int, Optional[list], list]]:
+        state = sorted(set(await self.get_state()))
+        result = await self.store.swap(state)
+        return (*result, state) if result is not None else None
 
-    def values(self):
-        return [json.loads(v) for v in self.redis.hvals(self.name)]
+    async def send_snapshot(self, sid: str):
+        snapshot = await self.store.get()
+        if snapshot is None:
+            await self._swap_state()
+            snapshot = await self.store.get()
 
-    def items(self):
-        return [(k, json.loads(v)) for k, v in self.redis.hgetall(self.name).items()]
+        seq, state = snapshot
+        await self.emit(self.event, {self.key: state, "seq": seq}, to=sid)
 
-    def get(self, key, default=None):
-        try:
-            return self[key]
-        except KeyError:
-            return default
+    async def _run(self):
+        while self._dirty:
+            delay = self._last_emit_at + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-    def clear(self):
-        self.redis.delete(self.name)
+            # Changes scheduled while reading are picked up by the next iteration
+            self._dirty = False
+            try:
+                result = await self._swap_state()
+                if result is None:
+                    continue
 
-    def update(self, other=None, **kwargs):
-        if other is not None:
-            for k, v in other.items() if hasattr(other, "items") else other:
-                self[k] = v
-        for k, v in kwargs.items():
-            self[k] = v
+                seq, previous, state = result
+                if previous is None:
+                    data = {self.key: state}
+                else:
+                    data = {
+                        "added": sorted(set(state) - set(previous)),
+                        "removed": sorted(set(previous) - set(state)),
+                    }
 
-    def setdefault(self, key, default=None):
-        if key not in self:
-            self[key] = default
-        return self[key]
+                self._last_emit_at = time.monotonic()
+                await self.emit(self.event, {**data, "seq": seq}, room=self.room)
+            except Exception as e:
+                log.error(f"Error broadcasting {self.event}: {e}")
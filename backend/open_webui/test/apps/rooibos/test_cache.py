@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+
+from rooibos.utils import cache
+from rooibos.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+class FakeRedis:
+    """The subset of redis commands TTLCache uses, with expiry on the fake clock"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values = {}
+        self.expires = {}
+        self.sorted_sets = {}
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= self.clock.now:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+
+    def get(self, key):
+        return self.values[key] if self._alive(key) else None
+
+    def mget(self, *keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        if ex:
+            self.expires[key] = self.clock.now + ex
+
+    def incr(self, key):
+        self.values[key] = str(int(self.get(key) or 0) + 1)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sorted_sets.pop(key, None)
+
+    def expire(self, key, seconds):
+        pass
+
+    def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, min, max):
+        members = self.sorted_sets.get(key, {})
+        for member in [m for m, score in members.items() if score <= max]:
+            del members[member]
+
+    def zcard(self, key):
+        return len(self.sorted_sets.get(key, {}))
+
+    def zpopmin(self, key, count):
+        members = self.sorted_sets.get(key, {})
+        popped = sorted(members.items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del members[member]
+        return popped
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append(
+                    (getattr(redis, name), args, kwargs)
+                )
+
+            def execute(self):
+                return [func(*args, **kwargs) for func, args, kwargs in self.calls]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def redis_cache(monkeypatch, clock):
+    redis = FakeRedis(clock)
+    monkeypatch.setattr(cache, "get_redis_connection", lambda *args, **kwargs: redis)
+    return TTLCache("test", ttl=60, maxsize=2, redis_url="redis://test")
+
+
+def test_entries_expire_after_ttl(clock):
+    ttl_cache = TTLCache("test", ttl=60, maxsize=10)
+    ttl_cache.set("a", {"value": 1})
+
+    clock.now += 59
+    assert ttl_cache.get("a") == {"value": 1}
+
+    clock.now += 1
+    assert ttl_cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttl_cache = TTLCache("test", ttl=60, maxsize=2)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    assert ttl_cache.get("a") == 1
+
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+
+
+def test_expired_entries_are_evicted_first(clock):
+    ttl_cache = TTLCache("test", ttl=60, maxsize=2)
+    ttl_cache.set("a", 1)
+    clock.now += 30
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+
+    clock.now += 31
+    ttl_cache.set("c", 3)
+    assert ttl_cache._entries.keys() == {"b", "c"}
+
+
+def test_invalidate_drops_entries_and_stale_sets(clock):
+    ttl_cache = TTLCache("test", ttl=60, maxsize=10)
+    ttl_cache.set("a", 1)
+    generation = ttl_cache.generation()
+
+    ttl_cache.invalidate()
+    assert ttl_cache.get("a") is None
+
+    # Set with the generation read before the invalidation is not stored
+    ttl_cache.set("b", 2, generation)
+    assert ttl_cache.get("b") is None
+
+
+def test_redis_entries_expire_after_ttl(redis_cache, clock):
+    redis_cache.set("a", 1)
+    assert redis_cache.get("a") == 1
+
+    clock.now += 60
+    assert redis_cache.get("a") is None
+
+
+def test_redis_oldest_entry_is_evicted(redis_cache, clock):
+    redis_cache.set("a", 1)
+    clock.now += 1
+    redis_cache.set("b", 2)
+    clock.now += 1
+    redis_cache.set("c", 3)
+
+    assert redis_cache.get("a") is None
+    assert redis_cache.get("b") == 2
+    assert redis_cache.get("c") == 3
+    assert redis_cache._redis.zcard(redis_cache._index_key()) == 2
+
+
+def test_redis_invalidate(redis_cache):
+    redis_cache.set("a", 1)
+    redis_cache.invalidate()
+    assert redis_cache.get("a") is None
+
+
+def test_async_access(redis_cache):
+    async def run():
+        await redis_cache.aset("a", {"value": 1})
+        return await redis_cache.aget("a")
+
+    assert asyncio.run(run()) == {"value": 1}
+
+
+def test_disabled_cache():
+    ttl_cache = TTLCache("test", ttl=0, maxsize=10)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") is None
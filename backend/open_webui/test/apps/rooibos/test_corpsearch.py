@@ -0,0 +1,140 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rooibos.routers import corpsearch
+
+BASE_PATH = "/api/v1/rooibos/corpsearch"
+
+COMPANIES = [
+    {
+        "master_id": 1,
+        "company_name": "가나전자",
+        "distance_from_search": 1.5,
+    },
+    {
+        "master_id": 2,
+        "company_name": "다라물산",
+        "distance_from_search": 2.5,
+    },
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalar(self):
+        return len(self.rows)
+
+    def fetchall(self):
+        return [SimpleNamespace(_mapping=row) for row in self.rows]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client for the corpsearch router, with the queries answered by COMPANIES"""
+    queries = []
+
+    @contextmanager
+    def get_db():
+        yield None
+
+    def execute_query(db, sql_query, params=[], **kwargs):
+        queries.append((sql_query, params))
+        return FakeResult(COMPANIES)
+
+    monkeypatch.setattr(corpsearch, "get_db", get_db)
+    monkeypatch.setattr(corpsearch, "execute_query", execute_query)
+    monkeypatch.setattr(corpsearch, "has_schema_feature", lambda *args: False)
+    corpsearch.corpsearch_cache.invalidate()
+
+    app = FastAPI()
+    app.include_router(corpsearch.router, prefix=BASE_PATH)
+    with TestClient(app) as client:
+        client.queries = queries
+        yield client
+
+
+def test_search_companies(client):
+    response = client.get(
+        f"{BASE_PATH}/",
+        params={"query": "전자", "userLatitude": "37.5", "userLongitude": "127.0"},
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["success"] is True
+    assert [company["master_id"] for company in data["data"]] == [1, 2]
+    assert data["total"] == 2
+    assert data["next_cursor"] is None
+    assert data["query"]["search"] == "전자"
+
+
+def test_search_companies_page(client):
+    response = client.get(
+        f"{BASE_PATH}/",
+        params={"query": "전자", "limit": "2", "count": "none"},
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["total"] is None
+    assert data["next_cursor"] is not None
+
+    # The page size is passed to the data query, no count query with count=none
+    assert len(client.queries) == 1
+    sql_query, params = client.queries[0]
+    assert "LIMIT" in sql_query
+    assert params[-1] == 2
+
+    response = client.get(
+        f"{BASE_PATH}/",
+        params={
+            "query": "전자",
+            "limit": "2",
+            "count": "none",
+            "cursor": data["next_cursor"],
+        },
+    )
+    assert response.status_code == 200
+    assert len(client.queries) == 2
+
+
+def test_search_companies_invalid_limit(client):
+    response = client.get(f"{BASE_PATH}/", params={"limit": "abc"})
+    assert response.status_code == 400
+
+
+def test_lookup_location_uses_stored_result(monkeypatch):
+    """Geocode results stored in rb_geocode_cache are served without calling Naver"""
+    stored = {"latitude": 37.5, "longitude": 127.0}
+    queries = []
+
+    @contextmanager
+    def get_db():
+        yield None
+
+    def execute_query(db, sql_query, params=[], **kwargs):
+        queries.append((sql_query, params))
+        return SimpleNamespace(first=lambda: (stored,))
+
+    async def get_coordinates(query):
+        raise AssertionError("Naver API should not be called")
+
+    monkeypatch.setattr(corpsearch, "get_db", get_db)
+    monkeypatch.setattr(corpsearch, "execute_query", execute_query)
+    monkeypatch.setattr(corpsearch, "has_schema_feature", lambda *args: True)
+    monkeypatch.setattr(corpsearch, "get_coordinates", get_coordinates)
+    corpsearch.geocode_cache.invalidate()
+
+    assert asyncio.run(corpsearch.lookup_location("  서울시  중구 ")) == stored
+    assert queries[0][1] == ["서울시 중구", corpsearch.GEOCODE_CACHE_TTL]
+
+    # The second lookup is served from the cache
+    assert asyncio.run(corpsearch.lookup_location("서울시 중구")) == stored
+    assert len(queries) == 1
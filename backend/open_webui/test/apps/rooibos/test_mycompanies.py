@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_webui.utils.auth import get_verified_user
+from rooibos.routers import mycompanies
+
+BASE_PATH = "/api/v1/rooibos/mycompanies"
+
+BOOKMARKS = [
+    {
+        "bookmark_id": "1",
+        "bookmark_user_id": "owner",
+        "business_registration_number": "1234567890",
+        "access_control": None,
+        "files": [],
+    },
+    {
+        "bookmark_id": "2",
+        "bookmark_user_id": "other",
+        "business_registration_number": "2345678901",
+        "access_control": None,
+        "files": [],
+    },
+    {
+        "bookmark_id": "3",
+        "bookmark_user_id": "other",
+        "business_registration_number": "3456789012",
+        "access_control": {"write": {"group_ids": ["group"]}},
+        "files": [],
+    },
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return [SimpleNamespace(_mapping=dict(row)) for row in self.rows]
+
+
+@pytest.fixture
+def app(monkeypatch):
+    @contextmanager
+    def get_db():
+        yield None
+
+    monkeypatch.setattr(mycompanies, "get_db", get_db)
+    monkeypatch.setattr(
+        mycompanies, "execute_query", lambda *args, **kwargs: FakeResult(BOOKMARKS)
+    )
+    monkeypatch.setattr(mycompanies, "get_chat_summaries", lambda db, owners: [])
+    monkeypatch.setattr(
+        mycompanies.Groups,
+        "get_groups_by_member_id",
+        lambda user_id: [SimpleNamespace(id="group")] if user_id == "owner" else [],
+    )
+
+    app = FastAPI()
+    app.include_router(mycompanies.router, prefix=BASE_PATH)
+    return app
+
+
+def get_batch(app, user, body):
+    app.dependency_overrides = {get_verified_user: lambda: user}
+    with TestClient(app) as client:
+        response = client.post(f"{BASE_PATH}/batch", json=body)
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    return [item["bookmark"]["bookmark_id"] for item in response.json()["data"]]
+
+
+def test_batch_filters_by_session_user(app):
+    user = SimpleNamespace(id="owner", role="user")
+    # user_id in the body is ignored
+    body = {"ids": ["1", "2", "3"], "user_id": "other"}
+    assert get_batch(app, user, body) == ["1", "3"]
+
+
+def test_batch_admin_gets_all(app):
+    user = SimpleNamespace(id="admin", role="admin")
+    assert get_batch(app, user, {"ids": ["1", "2", "3"]}) == ["1", "2", "3"]
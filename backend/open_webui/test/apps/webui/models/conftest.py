@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    """
+    Returns a function that creates tables on an in-memory SQLite database and
+    points the get_db of a models module at it, returning the engine
+    """
+    engines = []
+
+    def create(module, tables):
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        for table in tables:
+            table.__table__.create(engine)
+        SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+        )
+
+        @contextmanager
+        def get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        monkeypatch.setattr(module, "get_db", get_db)
+        engines.append(engine)
+        return engine
+
+    yield create
+
+    for engine in engines:
+        engine.dispose()
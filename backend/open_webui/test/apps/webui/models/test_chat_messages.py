@@ -0,0 +1,159 @@
+import copy
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.runtime.migration import MigrationContext
+from alembic.operations import Operations
+
+from open_webui.models import chats
+from open_webui.models.chats import Chat, ChatForm, ChatMessage, Chats
+
+MIGRATION_PATH = (
+    Path(chats.__file__).parent.parent
+    / "migrations"
+    / "versions"
+    / "b8f2d41c6e9a_add_chat_message_table.py"
+)
+
+CHAT = {
+    "title": "Test chat",
+    "models": ["model"],
+    "history": {
+        "currentId": "2",
+        "messages": {
+            "1": {
+                "id": "1",
+                "parentId": None,
+                "childrenIds": ["2"],
+                "role": "user",
+                "content": "Hello",
+                "timestamp": 1,
+            },
+            "2": {
+                "id": "2",
+                "parentId": "1",
+                "childrenIds": [],
+                "role": "assistant",
+                "model": "model",
+                "content": "Hi there",
+                "statusHistory": [{"action": "web_search", "done": True}],
+                "timestamp": 2,
+            },
+        },
+    },
+}
+
+
+@pytest.fixture
+def engine(sqlite_db):
+    """Only the chat table, the migration creates chat_message"""
+    return sqlite_db(chats, [Chat])
+
+
+def run_migration(engine, direction):
+    spec = importlib.util.spec_from_file_location("migration", MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            getattr(migration, direction)()
+
+
+def get_stored_chat(id):
+    with chats.get_db() as db:
+        return db.get(Chat, id).chat
+
+
+def get_message_ids(id):
+    with chats.get_db() as db:
+        return {row.id for row in db.query(ChatMessage).filter_by(chat_id=id)}
+
+
+def test_split_and_merge_chat_messages():
+    chat, messages = chats.split_chat_messages(CHAT)
+    assert chat["history"] == {"currentId": "2", "messages": {}}
+    assert messages == CHAT["history"]["messages"]
+    assert chats.merge_chat_messages(chat, messages) == CHAT
+
+    # Documents without history are stored as is
+    assert chats.split_chat_messages({"title": "New Chat"}) == (
+        {"title": "New Chat"},
+        {},
+    )
+
+
+def test_message_row_round_trip():
+    for message in CHAT["history"]["messages"].values():
+        row = ChatMessage(**chats.message_to_row_values(message))
+        assert chats.row_to_message(row) == message
+
+    # Non-string content stays in data
+    message = {"role": "user", "content": [{"type": "text", "text": "Hello"}]}
+    row = ChatMessage(**chats.message_to_row_values(message))
+    assert row.content is None
+    assert chats.row_to_message(row) == message
+
+
+def test_migration_moves_messages_to_rows(engine):
+    with engine.begin() as connection:
+        connection.execute(
+            Chat.__table__.insert(),
+            {
+                "id": "chat",
+                "user_id": "user",
+                "title": "Test chat",
+                "chat": CHAT,
+                "created_at": 1,
+                "updated_at": 1,
+            },
+        )
+
+    run_migration(engine, "upgrade")
+    assert get_stored_chat("chat")["history"]["messages"] == {}
+    assert get_message_ids("chat") == {"1", "2"}
+    assert Chats.get_chat_by_id("chat").chat == CHAT
+
+    run_migration(engine, "downgrade")
+    assert get_stored_chat("chat") == CHAT
+
+
+def test_chat_round_trip(engine):
+    ChatMessage.__table__.create(engine)
+
+    id = Chats.insert_new_chat("user", ChatForm(chat=copy.deepcopy(CHAT)))
+    assert get_stored_chat(id)["history"]["messages"] == {}
+    assert get_message_ids(id) == {"1", "2"}
+    assert Chats.get_chat_by_id(id).chat == CHAT
+
+    # Streamed content and a status are appended to the message's row
+    Chats.apply_message_updates_by_id_and_message_id(
+        id,
+        "2",
+        {"done": True},
+        content_suffix="!",
+        status_history=[{"action": "done"}],
+    )
+    message = Chats.get_message_by_id_and_message_id(id, "2")
+    assert message["content"] == "Hi there!"
+    assert message["done"] is True
+    assert message["statusHistory"] == [
+        {"action": "web_search", "done": True},
+        {"action": "done"},
+    ]
+
+    # A new message is added as a row and becomes the current one
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        id, "3", {"id": "3", "parentId": "2", "role": "user", "content": "Thanks"}
+    )
+    chat = Chats.get_chat_by_id(id).chat
+    assert chat["history"]["currentId"] == "3"
+    assert chat["history"]["messages"]["2"] == message
+    assert chat["history"]["messages"]["3"]["content"] == "Thanks"
+
+    # Saving the chat without a message removes its row
+    del chat["history"]["messages"]["1"]
+    Chats.update_chat_by_id(id, chat)
+    assert get_message_ids(id) == {"2", "3"}
+    assert Chats.get_chat_by_id(id).chat == chat
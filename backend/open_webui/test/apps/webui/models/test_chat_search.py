@@ -0,0 +1,70 @@
+import pytest
+
+from open_webui.models import chats
+from open_webui.models.chats import Chat, ChatForm, ChatMessage, Chats
+
+
+@pytest.fixture(autouse=True)
+def db(sqlite_db):
+    return sqlite_db(chats, [Chat, ChatMessage])
+
+
+def insert_chat(title, contents, user_id="user", updated_at=0):
+    messages = {
+        str(idx): {"id": str(idx), "role": "user", "content": content}
+        for idx, content in enumerate(contents)
+    }
+    id = Chats.insert_new_chat(
+        user_id, ChatForm(chat={"title": title, "history": {"messages": messages}})
+    )
+    with chats.get_db() as db:
+        db.query(Chat).filter_by(id=id).update({"updated_at": updated_at})
+        db.commit()
+    return id
+
+
+def test_search_by_title_and_content():
+    by_title = insert_chat("Apple pie", ["How long to bake?"], updated_at=1)
+    by_content = insert_chat("Dessert", ["An APPLE a day"], updated_at=2)
+    insert_chat("Other", ["Nothing here"], updated_at=3)
+    insert_chat("Apple", ["apple"], user_id="other")
+
+    results = Chats.search_chats_by_user_id("user", "apple")
+    assert [result.id for result in results] == [by_content, by_title]
+
+    # The snippet excerpts the first matching message
+    assert results[0].snippet == "An APPLE a day"
+    assert results[0].snippet_match == [3, 8]
+    assert results[1].snippet is None
+
+
+def test_search_rank_and_pagination():
+    insert_chat("Notes", ["pasta"], updated_at=3)
+    insert_chat("Notes", ["pasta", "more pasta"], updated_at=2)
+    by_title = insert_chat("Pasta", [], updated_at=1)
+
+    results = Chats.search_chats_by_user_id("user", "pasta", order_by="rank")
+    assert results[0].id == by_title
+    assert [len(Chats.get_messages_by_chat_id(r.id)) for r in results[1:]] == [2, 1]
+
+    results = Chats.search_chats_by_user_id("user", "pasta", skip=1, limit=1)
+    assert len(results) == 1
+
+
+def test_search_snippet_context():
+    content = "x" * 100 + "needle" + "y" * 100
+    insert_chat("Haystack", [content])
+
+    (result,) = Chats.search_chats_by_user_id("user", "needle")
+    start, end = result.snippet_match
+    assert result.snippet[start:end] == "needle"
+    assert len(result.snippet) == len("needle") + 2 * chats.SEARCH_SNIPPET_CONTEXT
+
+
+def test_search_excludes_archived():
+    id = insert_chat("Archived apple", [])
+    Chats.toggle_chat_archive_by_id(id)
+
+    assert Chats.search_chats_by_user_id("user", "apple") == []
+    results = Chats.search_chats_by_user_id("user", "apple", include_archived=True)
+    assert [result.id for result in results] == [id]
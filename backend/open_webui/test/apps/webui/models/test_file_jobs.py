@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from open_webui.models import files
+from open_webui.models.files import FileJob, FileJobs
+
+
+@pytest.fixture(autouse=True)
+def db(sqlite_db):
+    return sqlite_db(files, [FileJob])
+
+
+def insert_job(file_id, created_at):
+    job = FileJobs.insert_new_job(file_id, "user")
+    with files.get_db() as db:
+        db.query(FileJob).filter_by(id=job.id).update({"created_at": created_at})
+        db.commit()
+    return job
+
+
+def make_stale(job_id):
+    with files.get_db() as db:
+        db.query(FileJob).filter_by(id=job_id).update(
+            {"updated_at": int(time.time()) - 100}
+        )
+        db.commit()
+
+
+def test_claim_next_job():
+    first = insert_job("file-1", 1)
+    second = insert_job("file-2", 2)
+
+    job = FileJobs.claim_next_job("worker-a")
+    assert job.id == first.id
+    assert job.status == "running"
+    assert job.worker_id == "worker-a"
+    assert job.attempts == 1
+
+    # A claimed job is not claimed again
+    job = FileJobs.claim_next_job("worker-b")
+    assert job.id == second.id
+    assert job.worker_id == "worker-b"
+
+    assert FileJobs.claim_next_job("worker-a") is None
+
+
+def test_requeue_stale_jobs():
+    job = insert_job("file-1", 1)
+    FileJobs.claim_next_job("worker-a")
+
+    # Running jobs within the timeout stay with their worker
+    assert FileJobs.requeue_stale_jobs(timeout=60, max_attempts=2) == 0
+
+    make_stale(job.id)
+    assert FileJobs.requeue_stale_jobs(timeout=60, max_attempts=2) == 1
+    job = FileJobs.get_job_by_id(job.id)
+    assert job.status == "pending"
+    assert job.worker_id is None
+
+    job = FileJobs.claim_next_job("worker-b")
+    assert job.worker_id == "worker-b"
+    assert job.attempts == 2
+
+    # Failed for good after max_attempts
+    make_stale(job.id)
+    assert FileJobs.requeue_stale_jobs(timeout=60, max_attempts=2) == 1
+    job = FileJobs.get_job_by_id(job.id)
+    assert job.status == "failed"
+    assert job.error is not None
+    assert FileJobs.claim_next_job("worker-a") is None
+
+
+def test_release_jobs_by_worker_id():
+    first = insert_job("file-1", 1)
+    second = insert_job("file-2", 2)
+    FileJobs.claim_next_job("worker-a")
+    FileJobs.claim_next_job("worker-b")
+
+    assert FileJobs.release_jobs_by_worker_id("worker-a") == 1
+
+    job = FileJobs.get_job_by_id(first.id)
+    assert job.status == "pending"
+    assert job.worker_id is None
+    assert job.attempts == 0
+    assert FileJobs.get_job_by_id(second.id).worker_id == "worker-b"
+
+    assert FileJobs.claim_next_job("worker-b").id == first.id
+
+
+def test_release_jobs_excludes_processing_jobs():
+    first = insert_job("file-1", 1)
+    second = insert_job("file-2", 2)
+    FileJobs.claim_next_job("worker-a")
+    FileJobs.claim_next_job("worker-a")
+
+    # The job still being processed stays with its worker
+    assert FileJobs.release_jobs_by_worker_id("worker-a", [first.id]) == 1
+    assert FileJobs.get_job_by_id(first.id).status == "running"
+    assert FileJobs.get_job_by_id(second.id).status == "pending"
@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+from open_webui.utils import model_registry as registry_module
+from open_webui.utils.model_registry import ModelRegistry
+
+USER_A = SimpleNamespace(id="a")
+USER_B = SimpleNamespace(id="b")
+
+
+class Upstream:
+    """Model list loader recording which user each load was made for"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.loaded_for = []
+
+    async def load(self, user):
+        self.loaded_for.append(user.id if user else None)
+        return [f"model-{user.id if user else 'shared'}"]
+
+    async def get_models(self, user):
+        key, load_user = self.registry.user_scope("openai", user)
+        return await self.registry.get(key, lambda: self.load(load_user))
+
+
+def test_shared_list_is_loaded_without_user(monkeypatch):
+    monkeypatch.setattr(registry_module, "ENABLE_FORWARD_USER_INFO_HEADERS", False)
+    upstream = Upstream(ModelRegistry(refresh_interval=0))
+
+    async def run():
+        assert await upstream.get_models(USER_A) == ["model-shared"]
+        # Starts a background refresh, for another user than the first load
+        assert await upstream.get_models(USER_B) == ["model-shared"]
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert upstream.loaded_for == [None, None]
+
+
+def test_lists_are_cached_per_user_when_forwarding(monkeypatch):
+    monkeypatch.setattr(registry_module, "ENABLE_FORWARD_USER_INFO_HEADERS", True)
+    registry = ModelRegistry(refresh_interval=60)
+    upstream = Upstream(registry)
+
+    async def run():
+        assert await upstream.get_models(USER_A) == ["model-a"]
+        assert await upstream.get_models(USER_B) == ["model-b"]
+        assert await upstream.get_models(USER_A) == ["model-a"]
+        assert upstream.loaded_for == ["a", "b"]
+
+        # Invalidating a list drops the lists of every user
+        registry.invalidate("openai")
+        assert await upstream.get_models(USER_A) == ["model-a"]
+        assert upstream.loaded_for == ["a", "b", "a"]
+
+    asyncio.run(run())
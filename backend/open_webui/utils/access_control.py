@@ -1,4 +1,6 @@
-from typing import Optional, Union, List, Dict, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Union, List, Dict, Any, Set
 from open_webui.models.users import Users, UserModel
 from open_webui.models.groups import Groups
 
@@ -7,6 +9,36 @@ from open_webui.config import DEFAULT_USER_PERMISSIONS
 import json
 
 
+# Group ids of the users checked during the current request (user id -> group ids)
+_user_group_ids: ContextVar[Optional[Dict[str, Set[str]]]] = ContextVar(
+    "user_group_ids", default=None
+)
+
+
+@contextmanager
+def user_group_ids_scope():
+    """
+    Memoizes get_user_group_ids() until the block exits, so the access checks of
+    one request read the caller's groups once.
+    """
+    token = _user_group_ids.set({})
+    try:
+        yield
+    finally:
+        _user_group_ids.reset(token)
+
+
+def get_user_group_ids(user_id: str) -> Set[str]:
+    memo = _user_group_ids.get()
+    if memo is not None and user_id in memo:
+        return memo[user_id]
+
+    group_ids = set(Groups.get_group_ids_by_member_id(user_id))
+    if memo is not None:
+        memo[user_id] = group_ids
+    return group_ids
+
+
 def fill_missing_permissions(
     permissions: Dict[str, Any], default_permissions: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -111,19 +143,37 @@ def has_access(
     user_id: str,
     type: str = "write",
     access_control: Optional[dict] = None,
+    user_group_ids: Optional[Set[str]] = None,
 ) -> bool:
     if access_control is None:
         return type == "read"
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
-    user_group_ids = [group.id for group in user_groups]
     permission_access = access_control.get(type, {})
     permitted_group_ids = permission_access.get("group_ids", [])
     permitted_user_ids = permission_access.get("user_ids", [])
 
-    return user_id in permitted_user_ids or any(
-        group_id in permitted_group_ids for group_id in user_group_ids
-    )
+    if user_id in permitted_user_ids:
+        return True
+    if not permitted_group_ids:
+        return False
+
+    if user_group_ids is None:
+        user_group_ids = get_user_group_ids(user_id)
+    return any(group_id in user_group_ids for group_id in permitted_group_ids)
+
+
+def filter_accessible(user_id: str, rows: list, type: str = "write") -> list:
+    """
+    Returns the rows (anything with user_id and access_control) that the user owns
+    or has type access to, reading the user's groups once for all of them.
+    """
+    user_group_ids = get_user_group_ids(user_id)
+    return [
+        row
+        for row in rows
+        if row.user_id == user_id
+        or has_access(user_id, type, row.access_control, user_group_ids)
+    ]
 
 
 # Get all users with access to a resource
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import FastAPI, Request
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    FILE_INGESTION_JOB_TIMEOUT,
+    FILE_INGESTION_MAX_ATTEMPTS,
+    FILE_INGESTION_POLL_INTERVAL,
+    FILE_INGESTION_SHUTDOWN_TIMEOUT,
+    FILE_INGESTION_WORKER_CONCURRENCY,
+    SRC_LOG_LEVELS,
+)
+from open_webui.models.files import FileJobModel, FileJobs, Files
+from open_webui.models.users import Users
+from open_webui.routers.audio import transcribe
+from open_webui.routers.retrieval import (
+    FILE_EXTRACTION_SLOTS,
+    ProcessFileForm,
+    process_file,
+)
+from open_webui.socket.main import emit_to_user
+from open_webui.storage.provider import Storage
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+AUDIO_CONTENT_TYPES = ["audio/mpeg", "audio/wav", "audio/ogg", "audio/x-m4a"]
+IMAGE_CONTENT_TYPES = ["image/png", "image/jpeg", "image/gif"]
+
+# How often stale running jobs (worker died) are looked for
+REQUEUE_INTERVAL = 60
+
+
+def process_file_job(request: Request, job: FileJobModel):
+    """Extracts (or transcribes) and embeds the job's file, blocking"""
+    file = Files.get_file_by_id(job.file_id)
+    if file is None:
+        raise Exception(ERROR_MESSAGES.NOT_FOUND)
+
+    user = Users.get_user_by_id(job.user_id)
+    content_type = (job.data or {}).get("content_type")
+
+    if content_type in AUDIO_CONTENT_TYPES:
+        with FILE_EXTRACTION_SLOTS:
+            result = transcribe(request, Storage.get_file(file.path))
+
+        process_file(
+            request,
+            ProcessFileForm(file_id=file.id, content=result.get("text", "")),
+            user=user,
+        )
+    else:
+        process_file(request, ProcessFileForm(file_id=file.id), user=user)
+
+
+class FileIngestionWorker:
+    """
+    Claims pending jobs from the file_job table and processes up to concurrency of
+    them at a time in its own thread pool, so long extractions don't hold the
+    request threadpool. Several workers (app instances or standalone processes,
+    python -m open_webui.utils.file_ingestion) can share the table.
+
+    Status changes are sent to the uploading user's sessions as "file-events".
+    """
+
+    def __init__(self, app: FastAPI, concurrency: int, poll_interval: float):
+        self.app = app
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # process_file/transcribe only use request.app
+        self._request = Request({"type": "http", "app": app})
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="file-ingestion"
+        )
+        self._running: set[asyncio.Task] = set()
+        # Ids of the jobs being processed in the thread pool; once stopped, jobs
+        # that didn't start are not started anymore
+        self._processing: set[str] = set()
+        self._processing_lock = threading.Lock()
+        self._stopped = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = FILE_INGESTION_SHUTDOWN_TIMEOUT):
+        """
+        Stops claiming jobs and waits up to timeout seconds for the running ones.
+        Claimed jobs that didn't start go back to pending for another worker;
+        jobs still processing are left to requeue_stale_jobs.
+        """
+        if self._task is not None:
+            self._task.cancel()
+
+        tasks = [task for task in [self._task, *self._running] if task is not None]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+        with self._processing_lock:
+            self._stopped = True
+            processing = list(self._processing)
+
+        for task in tasks:
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        try:
+            released = await asyncio.to_thread(
+                FileJobs.release_jobs_by_worker_id, self.worker_id, processing
+            )
+            if released:
+                log.info(f"Released {released} file jobs of {self.worker_id}")
+        except Exception as e:
+            log.exception(f"Error releasing file jobs: {e}")
+
+    def notify(self):
+        """Wakes the worker up for a new job, callable from any thread"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run_in_executor(self, func, *args):
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        log.info(f"File ingestion worker {self.worker_id} started")
+
+        requeued_at = 0.0
+        while True:
+            self._wakeup.clear()
+            try:
+                if time.monotonic() - requeued_at >= REQUEUE_INTERVAL:
+                    requeued_at = time.monotonic()
+                    requeued = await self._run_in_executor(
+                        FileJobs.requeue_stale_jobs,
+                        FILE_INGESTION_JOB_TIMEOUT,
+                        FILE_INGESTION_MAX_ATTEMPTS,
+                    )
+                    if requeued:
+                        log.warning(f"Requeued {requeued} stale file jobs")
+
+                while len(self._running) < self.concurrency:
+                    job = await self._run_in_executor(
+                        FileJobs.claim_next_job, self.worker_id
+                    )
+                    if job is None:
+                        break
+
+                    task = asyncio.create_task(self._process(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+            except Exception as e:
+                log.exception(f"Error claiming file jobs: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _process_job(self, job: FileJobModel) -> Optional[FileJobModel]:
+        """Processes the job and stores its outcome, in the thread pool"""
+        with self._processing_lock:
+            if self._stopped:
+                return None
+            self._processing.add(job.id)
+
+        try:
+            process_file_job(self._request, job)
+            return FileJobs.update_job_status_by_id(job.id, "completed")
+        except Exception as e:
+            log.exception(f"Error processing file {job.file_id}: {e}")
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+            return FileJobs.update_job_status_by_id(job.id, "failed", error)
+        finally:
+            with self._processing_lock:
+                self._processing.discard(job.id)
+
+    async def _process(self, job: FileJobModel):
+        await self._emit(job, "running")
+        try:
+            job = await self._run_in_executor(self._process_job, job)
+        finally:
+            # A slot is free, claim the next job right away
+            self._wakeup.set()
+
+        if job is not None:
+            await self._emit(job, job.status, job.error)
+
+    async def _emit(self, job: FileJobModel, status: str, error: Optional[str] = None):
+        try:
+            await emit_to_user(
+                job.user_id,
+                "file-events",
+                {
+                    "job_id": job.id,
+                    "file_id": job.file_id,
+                    "status": status,
+                    "error": error,
+                },
+            )
+        except Exception as e:
+            log.debug(f"Error sending file event: {e}")
+
+
+def create_file_ingestion_worker(app: FastAPI) -> FileIngestionWorker:
+    return FileIngestionWorker(
+        app,
+        concurrency=FILE_INGESTION_WORKER_CONCURRENCY,
+        poll_interval=FILE_INGESTION_POLL_INTERVAL,
+    )
+
+
+async def main():
+    # Loads the app (config, embedding models) without serving it
+    from open_webui.main import app
+
+    await create_file_ingestion_worker(app).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
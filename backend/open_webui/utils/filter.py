@@ -1,112 +1,235 @@
 import inspect
 import logging
+import time
+from typing import Optional
 
-from open_webui.utils.plugin import load_function_module_by_id
-from open_webui.models.functions import Functions
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.plugin import get_function_module
+from open_webui.models.functions import FunctionModel, Functions
+from open_webui.env import MODELS_CACHE_REFRESH_INTERVAL, SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
-def get_sorted_filter_ids(model: dict):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
+class FilterPlan:
+    """
+    The active filter functions and their priorities, read with one query and
+    shared by every chat (inlet, stream, outlet) until a function or its valves
+    change (invalidate_filter_plan). Changes made by other instances are picked up
+    after MODELS_CACHE_REFRESH_INTERVAL seconds.
+    """
 
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
-    if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
+    def __init__(self, version: int):
+        self.version = version
+        self.loaded_at = time.monotonic()
 
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+        self.functions: dict[str, FunctionModel] = {}
+        self.priorities: dict[str, int] = {}
+        for function, valves in Functions.get_filter_functions_with_valves():
+            self.functions[function.id] = function
+            self.priorities[function.id] = valves.get("priority", 0)
 
-    filter_ids = [fid for fid in filter_ids if fid in enabled_filter_ids]
-    filter_ids.sort(key=get_priority)
-    return filter_ids
+        self.global_ids = [
+            function.id for function in self.functions.values() if function.is_global
+        ]
+        # Sorted filter ids by the filterIds of a model
+        self._filter_ids: dict[tuple, list[str]] = {}
 
+    def get_filter_ids(self, model: dict) -> list[str]:
+        model_filter_ids = ()
+        if "info" in model and "meta" in model["info"]:
+            model_filter_ids = tuple(model["info"]["meta"].get("filterIds", []))
 
-async def process_filter_functions(
-    request, filter_functions, filter_type, form_data, extra_params
-):
-    skip_files = None
+        filter_ids = self._filter_ids.get(model_filter_ids)
+        if filter_ids is None:
+            filter_ids = [
+                filter_id
+                for filter_id in dict.fromkeys(self.global_ids + list(model_filter_ids))
+                if filter_id in self.functions
+            ]
+            filter_ids.sort(key=lambda filter_id: self.priorities[filter_id])
+            self._filter_ids[model_filter_ids] = filter_ids
+        return filter_ids
 
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
-        if not filter:
-            continue
 
-        if filter_id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[filter_id]
-        else:
-            function_module, _, _ = load_function_module_by_id(filter_id)
-            request.app.state.FUNCTIONS[filter_id] = function_module
+_filter_plan: Optional[FilterPlan] = None
+_filter_plan_version = 0
 
-        # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
-            continue
+
+def invalidate_filter_plan():
+    global _filter_plan_version
+    _filter_plan_version += 1
+
+
+def get_filter_plan() -> FilterPlan:
+    global _filter_plan
+    if (
+        _filter_plan is None
+        or _filter_plan.version != _filter_plan_version
+        or time.monotonic() - _filter_plan.loaded_at >= MODELS_CACHE_REFRESH_INTERVAL
+    ):
+        _filter_plan = FilterPlan(_filter_plan_version)
+    return _filter_plan
+
+
+def get_sorted_filter_ids(model: dict) -> list[str]:
+    return get_filter_plan().get_filter_ids(model)
+
+
+def get_sorted_filter_functions(model: dict) -> list[FunctionModel]:
+    plan = get_filter_plan()
+    return [plan.functions[filter_id] for filter_id in plan.get_filter_ids(model)]
+
+
+class CompiledFilter:
+    """
+    A filter function's handler for one filter type with what calling it needs:
+    its parameters and the validated valves. Cached per (function id, filter
+    type) until the function is updated or its module reloaded.
+    """
+
+    def __init__(self, function, function_module, filter_type: str):
+        self.id = function.id
+        self.updated_at = function.updated_at
+        self.module = function_module
+
+        self.handler = getattr(function_module, filter_type, None)
+        self.is_coroutine = inspect.iscoroutinefunction(self.handler)
+        self.parameters = (
+            set(inspect.signature(self.handler).parameters) if self.handler else set()
+        )
 
         # Check if the function has a file_handler variable
-        if filter_type == "inlet" and hasattr(function_module, "file_handler"):
-            skip_files = function_module.file_handler
+        self.file_handler = (
+            function_module.file_handler
+            if filter_type == "inlet" and hasattr(function_module, "file_handler")
+            else None
+        )
 
-        # Apply valves to the function
+        self.valves = None
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+            valves = Functions.get_function_valves_by_id(function.id)
+            self.valves = function_module.Valves(**(valves if valves else {}))
+
+        self.UserValves = (
+            function_module.UserValves
+            if "__user__" in self.parameters and hasattr(function_module, "UserValves")
+            else None
+        )
+
+
+_compiled_filters: dict[tuple[str, str], CompiledFilter] = {}
 
-        try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
-
-            params = {"body": form_data}
-            if filter_type == "stream":
-                params = {"event": form_data}
-
-            params = params | {
-                k: v
-                for k, v in {
-                    **extra_params,
-                    "__id__": filter_id,
-                }.items()
-                if k in sig.parameters
-            }
-
-            # Handle user parameters
-            if "__user__" in sig.parameters:
-                if hasattr(function_module, "UserValves"):
+
+def invalidate_filter(function_id: str):
+    """Drops the compiled handlers of a function, called when its valves change"""
+    for key in [key for key in _compiled_filters if key[0] == function_id]:
+        del _compiled_filters[key]
+
+
+def get_compiled_filter(request, function, filter_type: str) -> CompiledFilter:
+    function_module = get_function_module(request, function.id)
+
+    key = (function.id, filter_type)
+    compiled = _compiled_filters.get(key)
+    if (
+        compiled is None
+        or compiled.module is not function_module
+        or compiled.updated_at != function.updated_at
+    ):
+        compiled = CompiledFilter(function, function_module, filter_type)
+        _compiled_filters[key] = compiled
+    return compiled
+
+
+class FilterChain:
+    """
+    The filters of a request for one filter type, in order. Filters without a
+    handler for the type are left out. Built once and run for every event of a
+    response ("stream"), user valves are read once per user.
+    """
+
+    def __init__(self, filters: list[CompiledFilter], filter_type: str):
+        self.filters = filters
+        self.filter_type = filter_type
+        self._user_valves: dict[tuple[str, str], object] = {}
+
+    def _get_user_valves(self, filter: CompiledFilter, user_id: str):
+        key = (filter.id, user_id)
+        if key not in self._user_valves:
+            self._user_valves[key] = filter.UserValves(
+                **Functions.get_user_valves_by_id_and_user_id(filter.id, user_id)
+            )
+        return self._user_valves[key]
+
+    async def run(self, form_data, extra_params):
+        skip_files = None
+
+        for filter in self.filters:
+            if filter.file_handler is not None:
+                skip_files = filter.file_handler
+
+            # Apply valves to the function
+            if filter.valves is not None:
+                filter.module.valves = filter.valves
+
+            try:
+                # Prepare parameters
+                params = {"body": form_data}
+                if self.filter_type == "stream":
+                    params = {"event": form_data}
+
+                params = params | {
+                    k: v
+                    for k, v in {
+                        **extra_params,
+                        "__id__": filter.id,
+                    }.items()
+                    if k in filter.parameters
+                }
+
+                # Handle user parameters
+                if filter.UserValves is not None:
                     try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
+                        params["__user__"]["valves"] = self._get_user_valves(
+                            filter, params["__user__"]["id"]
                         )
                     except Exception as e:
                         log.exception(f"Failed to get user values: {e}")
 
-            # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
-            else:
-                form_data = handler(**params)
+                # Execute handler
+                if filter.is_coroutine:
+                    form_data = await filter.handler(**params)
+                else:
+                    form_data = filter.handler(**params)
+
+            except Exception as e:
+                log.debug(f"Error in {self.filter_type} handler {filter.id}: {e}")
+                raise e
 
-        except Exception as e:
-            log.debug(f"Error in {filter_type} handler {filter_id}: {e}")
-            raise e
+        # Handle file cleanup for inlet
+        if skip_files and "files" in form_data.get("metadata", {}):
+            del form_data["files"]
+            del form_data["metadata"]["files"]
 
-    # Handle file cleanup for inlet
-    if skip_files and "files" in form_data.get("metadata", {}):
-        del form_data["files"]
-        del form_data["metadata"]["files"]
+        return form_data, {}
 
-    return form_data, {}
+
+def get_filter_chain(request, filter_functions, filter_type) -> FilterChain:
+    filters = []
+    for function in filter_functions:
+        if not function:
+            continue
+
+        compiled = get_compiled_filter(request, function, filter_type)
+        if compiled.handler:
+            filters.append(compiled)
+
+    return FilterChain(filters, filter_type)
+
+
+async def process_filter_functions(
+    request, filter_functions, filter_type, form_data, extra_params
+):
+    chain = get_filter_chain(request, filter_functions, filter_type)
+    return await chain.run(form_data, extra_params)
@@ -0,0 +1,80 @@
+import logging
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class HTTPClientRegistry:
+    """
+    Application-lifetime aiohttp sessions for upstream APIs, one per origin
+    (scheme://host:port), so requests reuse keep-alive connections instead of
+    paying a TCP/TLS handshake each time.
+
+    Timeouts are passed per request; responses must be released (or read fully)
+    to return their connection to the pool. close() is called on shutdown.
+    """
+
+    def __init__(
+        self, limit_per_host: int, keepalive_timeout: float, dns_cache_ttl: int
+    ):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        parsed_url = urlparse(url)
+        origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        session = self._sessions.get(origin)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                # Timeouts are set per request
+                timeout=aiohttp.ClientTimeout(total=None),
+                trust_env=True,
+            )
+            self._sessions[origin] = session
+        return session
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Error closing HTTP session: {e}")
+
+
+http_clients = HTTPClientRegistry(
+    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl=AIOHTTP_CLIENT_DNS_CACHE_TTL,
+)
+
+
+def get_http_session(url: str) -> aiohttp.ClientSession:
+    return http_clients.get_session(url)
+
+
+async def release_response(response: Optional[aiohttp.ClientResponse]):
+    # Returns the connection to the pool if the body was read, closes it otherwise
+    if response:
+        response.release()
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from open_webui.env import (
+    CHAT_SAVE_FLUSH_INTERVAL,
+    CHAT_SAVE_FLUSH_MAX_UPDATES,
+    SRC_LOG_LEVELS,
+)
+from open_webui.models.chats import Chats
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class PendingMessageUpdate:
+    def __init__(self):
+        # Fields merged into the stored message
+        self.message = {}
+        # Content appended to the stored content ("message" events)
+        self.content_suffix = ""
+        # Entries appended to the message's statusHistory
+        self.status_history = []
+        self.upsert = False
+        self.updates = 0
+        self.created_at = time.monotonic()
+
+
+class MessageWriteBuffer:
+    """
+    Write-behind buffer for chat message updates.
+
+    Every upsert_message_to_chat_by_id_and_message_id call is a read and write of
+    the message row, so updates are coalesced per (chat_id, message_id) and written
+    with a single read and write when the entry is flush_interval seconds old, after
+    max_updates updates, or when flush() is called for the message (response
+    completed or cancelled). Entries are written in the order they were queued,
+    and a flushed entry only applies its own changes on top of the current row,
+    so a later direct write is never overwritten by older buffered state as long
+    as the message is flushed before it.
+    """
+
+    def __init__(self, flush_interval: float, max_updates: int):
+        self.flush_interval = flush_interval
+        self.max_updates = max_updates
+        self._pending: dict[tuple[str, str], PendingMessageUpdate] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _get_pending(self, chat_id: str, message_id: str) -> PendingMessageUpdate:
+        key = (chat_id, message_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = PendingMessageUpdate()
+            self._pending[key] = pending
+        return pending
+
+    def _updated(self, chat_id: str, message_id: str, pending: PendingMessageUpdate):
+        pending.updates += 1
+        if self.flush_interval <= 0 or pending.updates >= self.max_updates:
+            self.flush(chat_id, message_id)
+        else:
+            self._schedule_flush()
+
+    def upsert_message(self, chat_id: str, message_id: str, message: dict):
+        pending = self._get_pending(chat_id, message_id)
+        pending.upsert = True
+        if "content" in message:
+            pending.content_suffix = ""
+        pending.message.update(message)
+        self._updated(chat_id, message_id, pending)
+
+    def append_message_content(self, chat_id: str, message_id: str, content: str):
+        pending = self._get_pending(chat_id, message_id)
+        pending.upsert = True
+        if "content" in pending.message:
+            pending.message["content"] = f"{pending.message['content']}{content}"
+        else:
+            pending.content_suffix = f"{pending.content_suffix}{content}"
+        self._updated(chat_id, message_id, pending)
+
+    def add_message_status(self, chat_id: str, message_id: str, status: dict):
+        pending = self._get_pending(chat_id, message_id)
+        pending.status_history.append(status)
+        self._updated(chat_id, message_id, pending)
+
+    def flush(self, chat_id: str, message_id: str):
+        pending = self._pending.pop((chat_id, message_id), None)
+        if pending is None:
+            return
+
+        try:
+            Chats.apply_message_updates_by_id_and_message_id(
+                chat_id,
+                message_id,
+                pending.message,
+                content_suffix=pending.content_suffix,
+                status_history=pending.status_history,
+                upsert=pending.upsert,
+            )
+        except Exception as e:
+            log.exception(f"Error saving message {chat_id}/{message_id}: {e}")
+
+    def flush_all(self):
+        for chat_id, message_id in list(self._pending.keys()):
+            self.flush(chat_id, message_id)
+
+    def _schedule_flush(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to flush later (sync caller), write now
+            self.flush_all()
+            return
+        self._flush_task = loop.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            for key, pending in list(self._pending.items()):
+                if now - pending.created_at >= self.flush_interval:
+                    self.flush(*key)
+
+
+chat_message_buffer = MessageWriteBuffer(
+    flush_interval=CHAT_SAVE_FLUSH_INTERVAL,
+    max_updates=CHAT_SAVE_FLUSH_MAX_UPDATES,
+)
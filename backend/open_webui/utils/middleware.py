@@ -46,7 +46,6 @@ from open_webui.utils.webhook import post_webhook
 
 
 from open_webui.models.users import UserModel
-from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.retrieval.utils import get_sources_from_files
@@ -70,8 +69,10 @@ from open_webui.utils.misc import (
 )
 from open_webui.utils.tools import get_tools
 from open_webui.utils.plugin import load_function_module_by_id
+from open_webui.utils.message_buffer import chat_message_buffer
 from open_webui.utils.filter import (
-    get_sorted_filter_ids,
+    get_filter_chain,
+    get_sorted_filter_functions,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
@@ -88,6 +89,8 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
+    ENABLE_CHAT_RESPONSE_STREAM_DELTA,
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL,
 )
 from open_webui.constants import TASKS
 
@@ -784,10 +787,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
         raise e
 
     try:
-        filter_functions = [
-            Functions.get_function_by_id(filter_id)
-            for filter_id in get_sorted_filter_ids(model)
-        ]
+        filter_functions = get_sorted_filter_functions(model)
 
         form_data, flags = await process_filter_functions(
             request=request,
@@ -1079,6 +1079,9 @@ async def process_chat_response(
     # Non-streaming response
     if not isinstance(response, StreamingResponse):
         if event_emitter:
+            # Write buffered message updates before saving the response
+            chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
+
             if "error" in response:
                 error = response["error"].get("detail", response["error"])
                 Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -1134,7 +1137,7 @@ async def process_chat_response(
                     )
 
                     # Send a webhook notification if the user is not active
-                    if get_active_status_by_user_id(user.id) is None:
+                    if await get_active_status_by_user_id(user.id) is None:
                         webhook_url = Users.get_user_webhook_url_by_id(user.id)
                         if webhook_url:
                             post_webhook(
@@ -1175,16 +1178,16 @@ async def process_chat_response(
         "__request__": request,
         "__model__": model,
     }
-    filter_functions = [
-        Functions.get_function_by_id(filter_id)
-        for filter_id in get_sorted_filter_ids(model)
-    ]
+    filter_functions = get_sorted_filter_functions(model)
+    # Resolved once, the stream filters run for every delta of the response
+    stream_filter_chain = get_filter_chain(request, filter_functions, "stream")
 
     # Streaming response
     if event_emitter and event_caller:
         task_id = str(uuid4())  # Create a unique task ID.
         model_id = form_data.get("model", "")
 
+        chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
         Chats.upsert_message_to_chat_by_id_and_message_id(
             metadata["chat_id"],
             metadata["message_id"],
@@ -1209,119 +1212,201 @@ async def process_chat_response(
 
         # Handle as a background task
         async def post_response_handler(response, events):
-            def serialize_content_blocks(content_blocks, raw=False):
-                content = ""
-
-                for block in content_blocks:
-                    if block["type"] == "text":
-                        content = f"{content}{block['content'].strip()}\n"
-                    elif block["type"] == "tool_calls":
-                        attributes = block.get("attributes", {})
+            def serialize_content_block(content, block, raw=False):
+                if block["type"] == "text":
+                    content = f"{content}{block['content'].strip()}\n"
+                elif block["type"] == "tool_calls":
+                    attributes = block.get("attributes", {})
 
-                        tool_calls = block.get("content", [])
-                        results = block.get("results", [])
+                    tool_calls = block.get("content", [])
+                    results = block.get("results", [])
 
-                        if results:
+                    if results:
 
-                            tool_calls_display_content = ""
-                            for tool_call in tool_calls:
+                        tool_calls_display_content = ""
+                        for tool_call in tool_calls:
 
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
+                            tool_call_id = tool_call.get("id", "")
+                            tool_name = tool_call.get("function", {}).get("name", "")
+                            tool_arguments = tool_call.get("function", {}).get(
+                                "arguments", ""
+                            )
 
-                                tool_result = None
-                                tool_result_files = None
-                                for result in results:
-                                    if tool_call_id == result.get("tool_call_id", ""):
-                                        tool_result = result.get("content", None)
-                                        tool_result_files = result.get("files", None)
-                                        break
+                            tool_result = None
+                            tool_result_files = None
+                            for result in results:
+                                if tool_call_id == result.get("tool_call_id", ""):
+                                    tool_result = result.get("content", None)
+                                    tool_result_files = result.get("files", None)
+                                    break
 
-                                if tool_result:
-                                    tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
-                                else:
-                                    tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
+                            if tool_result:
+                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
+                            else:
+                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
 
-                            if not raw:
-                                content = f"{content}\n{tool_calls_display_content}\n\n"
-                        else:
-                            tool_calls_display_content = ""
+                        if not raw:
+                            content = f"{content}\n{tool_calls_display_content}\n\n"
+                    else:
+                        tool_calls_display_content = ""
 
-                            for tool_call in tool_calls:
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
+                        for tool_call in tool_calls:
+                            tool_call_id = tool_call.get("id", "")
+                            tool_name = tool_call.get("function", {}).get("name", "")
+                            tool_arguments = tool_call.get("function", {}).get(
+                                "arguments", ""
+                            )
 
-                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
+                            tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
 
-                            if not raw:
-                                content = f"{content}\n{tool_calls_display_content}\n\n"
+                        if not raw:
+                            content = f"{content}\n{tool_calls_display_content}\n\n"
 
-                    elif block["type"] == "reasoning":
-                        reasoning_display_content = "\n".join(
-                            (f"> {line}" if not line.startswith(">") else line)
-                            for line in block["content"].splitlines()
-                        )
+                elif block["type"] == "reasoning":
+                    reasoning_display_content = "\n".join(
+                        (f"> {line}" if not line.startswith(">") else line)
+                        for line in block["content"].splitlines()
+                    )
 
-                        reasoning_duration = block.get("duration", None)
+                    reasoning_duration = block.get("duration", None)
 
-                        if reasoning_duration is not None:
-                            if raw:
-                                content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
-                            else:
-                                content = f'{content}\n<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+                    if reasoning_duration is not None:
+                        if raw:
+                            content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
                         else:
-                            if raw:
-                                content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
-                            else:
-                                content = f'{content}\n<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+                            content = f'{content}\n<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+                    else:
+                        if raw:
+                            content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
+                        else:
+                            content = f'{content}\n<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
 
-                    elif block["type"] == "code_interpreter":
-                        attributes = block.get("attributes", {})
-                        output = block.get("output", None)
-                        lang = attributes.get("lang", "")
+                elif block["type"] == "code_interpreter":
+                    attributes = block.get("attributes", {})
+                    output = block.get("output", None)
+                    lang = attributes.get("lang", "")
 
-                        content_stripped, original_whitespace = (
-                            split_content_and_whitespace(content)
+                    content_stripped, original_whitespace = (
+                        split_content_and_whitespace(content)
+                    )
+                    if is_opening_code_block(content_stripped):
+                        # Remove trailing backticks that would open a new block
+                        content = (
+                            content_stripped.rstrip("`").rstrip() + original_whitespace
                         )
-                        if is_opening_code_block(content_stripped):
-                            # Remove trailing backticks that would open a new block
-                            content = (
-                                content_stripped.rstrip("`").rstrip()
-                                + original_whitespace
-                            )
-                        else:
-                            # Keep content as is - either closing backticks or no backticks
-                            content = content_stripped + original_whitespace
+                    else:
+                        # Keep content as is - either closing backticks or no backticks
+                        content = content_stripped + original_whitespace
 
-                        if output:
-                            output = html.escape(json.dumps(output))
+                    if output:
+                        output = html.escape(json.dumps(output))
 
-                            if raw:
-                                content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
-                            else:
-                                content = f'{content}\n<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+                        if raw:
+                            content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
                         else:
-                            if raw:
-                                content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
-                            else:
-                                content = f'{content}\n<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-
+                            content = f'{content}\n<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
                     else:
-                        block_content = str(block["content"]).strip()
-                        content = f"{content}{block['type']}: {block_content}\n"
+                        if raw:
+                            content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
+                        else:
+                            content = f'{content}\n<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+
+                else:
+                    block_content = str(block["content"]).strip()
+                    content = f"{content}{block['type']}: {block_content}\n"
+
+                return content
+
+            def serialize_content_blocks(content_blocks, raw=False):
+                content = ""
+
+                for block in content_blocks:
+                    content = serialize_content_block(content, block, raw)
 
                 return content.strip()
 
+            # Serialization state for streaming, so each delta does not
+            # re-serialize the whole answer (see get_content_update)
+            stream_state = {
+                "prefix_blocks": [],
+                "prefix": "",
+                "last_block": None,
+                "text_length": 0,
+                "pending_whitespace": "",
+                "deltas": 0,
+            }
+
+            def serialize_stream_content(content_blocks):
+                """serialize_content_blocks, reusing the cached serialization of every block but the last"""
+                prefix_blocks = content_blocks[:-1]
+                if len(prefix_blocks) != len(stream_state["prefix_blocks"]) or any(
+                    block is not serialized_block
+                    for block, serialized_block in zip(
+                        prefix_blocks, stream_state["prefix_blocks"]
+                    )
+                ):
+                    prefix = ""
+                    for block in prefix_blocks:
+                        prefix = serialize_content_block(prefix, block)
+                    stream_state["prefix_blocks"] = list(prefix_blocks)
+                    stream_state["prefix"] = prefix
+
+                content = stream_state["prefix"]
+                if content_blocks:
+                    content = serialize_content_block(content, content_blocks[-1])
+                return content.strip()
+
+            def get_content_update(content_blocks):
+                """
+                Build the chat:completion data for the current content.
+
+                While text is appended to the same trailing text block, only the
+                appended text is sent ({"content_delta": ...}). Any other change
+                (new block, reasoning, tag handling) and every
+                CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL deltas send the full
+                serialized content ({"content": ...}) so clients can resync.
+                Returns None when there is nothing new to send.
+                """
+                last_block = content_blocks[-1] if content_blocks else None
+
+                if (
+                    ENABLE_CHAT_RESPONSE_STREAM_DELTA
+                    and last_block is not None
+                    and last_block is stream_state["last_block"]
+                    and last_block["type"] == "text"
+                    and len(last_block["content"]) >= stream_state["text_length"]
+                    and stream_state["deltas"] < CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL
+                ):
+                    appended = last_block["content"][stream_state["text_length"] :]
+                    stream_state["text_length"] = len(last_block["content"])
+
+                    # Serialization strips surrounding whitespace of a text block, so
+                    # trailing whitespace is held back until more text follows it
+                    pending = stream_state["pending_whitespace"] + appended
+                    value = pending.rstrip()
+                    stream_state["pending_whitespace"] = pending[len(value) :]
+                    if not value:
+                        return None
+
+                    stream_state["deltas"] += 1
+                    return {"content_delta": value}
+
+                content = serialize_stream_content(content_blocks)
+
+                stream_state["deltas"] = 0
+                stream_state["last_block"] = None
+                if last_block is not None and last_block["type"] == "text":
+                    block_content = last_block["content"]
+                    # Deltas are only valid once the block has visible text
+                    if block_content.strip():
+                        stream_state["last_block"] = last_block
+                        stream_state["text_length"] = len(block_content)
+                        stream_state["pending_whitespace"] = block_content[
+                            len(block_content.rstrip()) :
+                        ]
+
+                return {"content": content}
+
             def convert_content_blocks_to_messages(content_blocks):
                 messages = []
 
@@ -1509,6 +1594,7 @@ async def process_chat_response(
 
                 return content, content_blocks, end_flag
 
+            chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
             message = Chats.get_message_by_id_and_message_id(
                 metadata["chat_id"], metadata["message_id"]
             )
@@ -1568,7 +1654,7 @@ async def process_chat_response(
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    chat_message_buffer.upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -1600,18 +1686,12 @@ async def process_chat_response(
                         try:
                             data = json.loads(data)
 
-                            data, _ = await process_filter_functions(
-                                request=request,
-                                filter_functions=filter_functions,
-                                filter_type="stream",
-                                form_data=data,
-                                extra_params=extra_params,
-                            )
+                            data, _ = await stream_filter_chain.run(data, extra_params)
 
                             if data:
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    chat_message_buffer.upsert_message(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -1710,11 +1790,7 @@ async def process_chat_response(
 
                                         reasoning_block["content"] += reasoning_content
 
-                                        data = {
-                                            "content": serialize_content_blocks(
-                                                content_blocks
-                                            )
-                                        }
+                                        data = get_content_update(content_blocks)
 
                                     if value:
                                         if (
@@ -1787,8 +1863,8 @@ async def process_chat_response(
                                             )
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
-                                            # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            # Save message in the database (written behind)
+                                            chat_message_buffer.upsert_message(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -1798,18 +1874,15 @@ async def process_chat_response(
                                                 },
                                             )
                                         else:
-                                            data = {
-                                                "content": serialize_content_blocks(
-                                                    content_blocks
-                                                ),
-                                            }
+                                            data = get_content_update(content_blocks)
 
-                                await event_emitter(
-                                    {
-                                        "type": "chat:completion",
-                                        "data": data,
-                                    }
-                                )
+                                if data:
+                                    await event_emitter(
+                                        {
+                                            "type": "chat:completion",
+                                            "data": data,
+                                        }
+                                    )
                         except Exception as e:
                             done = "data: [DONE]" in line
                             if done:
@@ -2191,6 +2264,7 @@ async def process_chat_response(
                     "title": title,
                 }
 
+                chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
                     Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -2202,7 +2276,7 @@ async def process_chat_response(
                     )
 
                 # Send a webhook notification if the user is not active
-                if get_active_status_by_user_id(user.id) is None:
+                if await get_active_status_by_user_id(user.id) is None:
                     webhook_url = Users.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         post_webhook(
@@ -2229,6 +2303,7 @@ async def process_chat_response(
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "task-cancelled"})
 
+                chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
                     Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -2238,6 +2313,9 @@ async def process_chat_response(
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+            finally:
+                # Never leave buffered updates of a finished response behind
+                chat_message_buffer.flush(metadata["chat_id"], metadata["message_id"])
 
             if response.background is not None:
                 await response.background()
@@ -2253,25 +2331,13 @@ async def process_chat_response(
                 return f"data: {item}\n\n"
 
             for event in events:
-                event, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=event,
-                    extra_params=extra_params,
-                )
+                event, _ = await stream_filter_chain.run(event, extra_params)
 
                 if event:
                     yield wrap_item(json.dumps(event))
 
             async for data in original_generator:
-                data, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=data,
-                    extra_params=extra_params,
-                )
+                data, _ = await stream_filter_chain.run(data, extra_params)
 
                 if data:
                     yield data
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    MODELS_CACHE_REFRESH_INTERVAL,
+    MODELS_UPSTREAM_RETRY_INTERVAL,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class ModelRegistryEntry:
+    def __init__(self):
+        self.value: Any = None
+        self.updated_at = 0.0
+        self.loaded = False
+        # Bumped by invalidate() so a load started before it is not stored
+        self.generation = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class ModelRegistry:
+    """
+    Stale-while-revalidate cache of model lists ("openai", "ollama" and the merged
+    "models" list).
+
+    get() returns the cached list and, once it is older than refresh_interval,
+    reloads it in the background, so only the first load (or the first one after
+    invalidate()) waits for the upstreams. Concurrent callers share one load.
+    invalidate() is called when models, functions or connections change; it drops
+    the list so the next get() loads it again.
+
+    Lists are shared by all users and loaded without one, unless user info is
+    forwarded to the upstreams (ENABLE_FORWARD_USER_INFO_HEADERS); they are then
+    cached per user under "{key}:{user_id}", see user_scope().
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._entries: dict[str, ModelRegistryEntry] = {}
+
+    def _get_entry(self, key: str) -> ModelRegistryEntry:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = ModelRegistryEntry()
+            self._entries[key] = entry
+        return entry
+
+    async def get(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._get_entry(key)
+
+        if not entry.loaded:
+            return await asyncio.shield(self._start_load(key, entry, load))
+
+        if time.monotonic() - entry.updated_at >= self.refresh_interval:
+            self._start_load(key, entry, load)
+        return entry.value
+
+    def user_scope(self, key: str, user=None) -> tuple[str, Optional[Any]]:
+        """Returns the entry key of the list for user and the user to load it with"""
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user is not None:
+            return f"{key}:{user.id}", user
+        return key, None
+
+    def invalidate(self, *keys: str):
+        for name, entry in list(self._entries.items()):
+            # Also drops the lists cached per user
+            if keys and name.split(":", 1)[0] not in keys:
+                continue
+
+            entry.loaded = False
+            entry.value = None
+            entry.generation += 1
+            # Let an in-flight load finish on its own, the next get() starts a new one
+            entry.task = None
+
+    def _start_load(
+        self, key: str, entry: ModelRegistryEntry, load: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.create_task(self._load(key, entry, load))
+        return entry.task
+
+    async def _load(
+        self, key: str, entry: ModelRegistryEntry, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        generation = entry.generation
+        try:
+            value = await load()
+        except Exception as e:
+            log.exception(f"Error loading {key} models: {e}")
+            if generation != entry.generation:
+                # Invalidated meanwhile, nobody is waiting for this load
+                return None
+            if entry.loaded:
+                # Keep serving the previous list, retry after refresh_interval
+                entry.updated_at = time.monotonic()
+                return entry.value
+            raise
+
+        if generation == entry.generation:
+            entry.value = value
+            entry.updated_at = time.monotonic()
+            entry.loaded = True
+        return value
+
+
+class UpstreamHealth:
+    """
+    Tracks model list requests per upstream URL. An upstream whose last request
+    failed is skipped for retry_interval seconds, so a dead connection doesn't add
+    its timeout to every model list load.
+    """
+
+    def __init__(self, retry_interval: float):
+        self.retry_interval = retry_interval
+        self._failed_at: dict[str, float] = {}
+
+    def is_available(self, url: str) -> bool:
+        failed_at = self._failed_at.get(url)
+        return failed_at is None or time.monotonic() - failed_at >= self.retry_interval
+
+    async def track(self, url: str, request: Awaitable[Optional[Any]]):
+        # send_get_request returns None when the upstream couldn't be reached
+        response = await request
+        if response is None:
+            if url not in self._failed_at:
+                log.warning(
+                    f"{url} is unreachable, skipping it for {self.retry_interval}s"
+                )
+            self._failed_at[url] = time.monotonic()
+        else:
+            self._failed_at.pop(url, None)
+        return response
+
+
+model_registry = ModelRegistry(refresh_interval=MODELS_CACHE_REFRESH_INTERVAL)
+upstream_health = UpstreamHealth(retry_interval=MODELS_UPSTREAM_RETRY_INTERVAL)
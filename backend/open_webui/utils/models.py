@@ -2,7 +2,6 @@ import time
 import logging
 import sys
 
-from aiocache import cached
 from fastapi import Request
 
 from open_webui.routers import openai, ollama
@@ -13,8 +12,9 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 
-from open_webui.utils.plugin import load_function_module_by_id
+from open_webui.utils.plugin import get_function_module
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_registry import model_registry
 
 
 from open_webui.config import (
@@ -61,8 +61,16 @@ async def get_all_base_models(request: Request, user: UserModel = None):
 
 
 async def get_all_models(request, user: UserModel = None):
+    key, user = model_registry.user_scope("models", user)
+    return await model_registry.get(key, lambda: load_all_models(request, user=user))
+
+
+async def load_all_models(request, user: UserModel = None):
     models = await get_all_base_models(request, user=user)
 
+    # The upstream lists are cached, copy their models before customizing them
+    models = [{**model} for model in models]
+
     # If there are no models, return an empty list
     if len(models) == 0:
         return []
@@ -194,13 +202,6 @@ async def get_all_models(request, user: UserModel = None):
                 }
             ]
 
-    def get_function_module_by_id(function_id):
-        if function_id in request.app.state.FUNCTIONS:
-            function_module = request.app.state.FUNCTIONS[function_id]
-        else:
-            function_module, _, _ = load_function_module_by_id(function_id)
-            request.app.state.FUNCTIONS[function_id] = function_module
-
     for model in models:
         action_ids = [
             action_id
@@ -214,7 +215,7 @@ async def get_all_models(request, user: UserModel = None):
             if action_function is None:
                 raise Exception(f"Action not found: {action_id}")
 
-            function_module = get_function_module_by_id(action_id)
+            function_module = get_function_module(request, action_id)
             model["actions"].extend(
                 get_action_items_from_module(action_function, function_module)
             )
@@ -1,19 +1,45 @@
+import hashlib
+import hmac
+import marshal
 import os
 import re
 import subprocess
 import sys
+import time
 from importlib import util
 import types
 import tempfile
 import logging
 
-from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    PLUGIN_MODULE_CHECK_INTERVAL,
+    SRC_LOG_LEVELS,
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    WEBUI_SECRET_KEY,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Plugin sources and their compiled bytecode, shared by all workers
+PLUGIN_CACHE_DIR = CACHE_DIR / "plugins"
+
+# Bytecode is only cached when signed with a key other processes can't derive,
+# it is compiled from the source otherwise
+PLUGIN_CODE_SIGNATURE_KEY = (
+    WEBUI_SECRET_KEY.encode("utf-8")
+    if WEBUI_SECRET_KEY not in ("", "t0p-s3cr3t")
+    else None
+)
+
+# Content hash of every loaded plugin module and when it was last compared with
+# the stored content (module name -> (hash, checked_at))
+_module_hashes: dict[str, tuple[str, float]] = {}
+
 
 def extract_frontmatter(content):
     """
@@ -68,6 +94,123 @@ def replace_imports(content):
     return content
 
 
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def write_plugin_cache_file(path, data: bytes):
+    # Written to a temporary file and renamed, so other workers never read a
+    # partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with temp_file:
+            temp_file.write(data)
+        os.replace(temp_file.name, path)
+    except Exception:
+        os.unlink(temp_file.name)
+        raise
+
+
+def get_code_signature(content_hash: str, data: bytes) -> bytes:
+    # 32 bytes, prefixed to the marshalled code
+    return hmac.new(
+        PLUGIN_CODE_SIGNATURE_KEY, content_hash.encode("utf-8") + data, hashlib.sha256
+    ).digest()
+
+
+def get_plugin_cache_paths(content_hash: str):
+    return (
+        PLUGIN_CACHE_DIR / f"{content_hash}.py",
+        PLUGIN_CACHE_DIR / f"{content_hash}.{sys.implementation.cache_tag}.pyc",
+    )
+
+
+def get_plugin_code(content: str) -> tuple[types.CodeType, str, str]:
+    """
+    Compiles plugin source, reusing the bytecode that any worker already stored
+    for the same content in PLUGIN_CACHE_DIR. The bytecode is prefixed with an
+    HMAC of the content hash and the code, and is only loaded when it matches.
+    Returns the code, the path of the source file (the module's __file__) and the
+    content hash.
+    """
+    content_hash = get_content_hash(content)
+    source_path, code_path = get_plugin_cache_paths(content_hash)
+
+    try:
+        if source_path.exists():
+            touch_plugin_cache_file(content_hash)
+        else:
+            write_plugin_cache_file(source_path, content.encode("utf-8"))
+
+        if PLUGIN_CODE_SIGNATURE_KEY and code_path.exists():
+            with open(code_path, "rb") as f:
+                data = f.read()
+            signature, code_data = data[:32], data[32:]
+            if hmac.compare_digest(
+                signature, get_code_signature(content_hash, code_data)
+            ):
+                return marshal.loads(code_data), str(source_path), content_hash
+            log.warning(f"Ignoring plugin bytecode with a wrong signature: {code_path}")
+    except Exception as e:
+        log.warning(f"Error reading plugin cache {code_path}: {e}")
+
+    code = compile(content, str(source_path), "exec")
+    if PLUGIN_CODE_SIGNATURE_KEY:
+        try:
+            data = marshal.dumps(code)
+            write_plugin_cache_file(
+                code_path, get_code_signature(content_hash, data) + data
+            )
+        except Exception as e:
+            log.warning(f"Error writing plugin cache {code_path}: {e}")
+    return code, str(source_path), content_hash
+
+
+def touch_plugin_cache_file(content_hash: str):
+    # Marks the source file (a loaded module's __file__) as in use
+    try:
+        os.utime(get_plugin_cache_paths(content_hash)[0])
+    except OSError:
+        pass
+
+
+def remove_stale_plugin_cache_files(content_hashes: set[str]):
+    """
+    Removes the cached files of plugin versions that are no longer stored. Files
+    used by a worker within the last two PLUGIN_MODULE_CHECK_INTERVALs are kept,
+    another worker may still run that version until its next check.
+    """
+    if not PLUGIN_CACHE_DIR.exists():
+        return
+
+    used_after = time.time() - 2 * PLUGIN_MODULE_CHECK_INTERVAL
+    for path in PLUGIN_CACHE_DIR.iterdir():
+        if path.name.split(".", 1)[0] in content_hashes:
+            continue
+        try:
+            if path.stat().st_mtime > used_after:
+                continue
+            path.unlink(missing_ok=True)
+        except Exception as e:
+            log.warning(f"Error removing plugin cache {path}: {e}")
+
+
+def exec_plugin_module(module_name: str, content: str) -> types.ModuleType:
+    code, file_path, content_hash = get_plugin_code(content)
+
+    module = types.ModuleType(module_name)
+    sys.modules[module_name] = module
+    module.__dict__["__file__"] = file_path
+
+    # Execute the content in the created module's namespace
+    exec(code, module.__dict__)
+    _module_hashes[module_name] = (content_hash, time.monotonic())
+    return module
+
+
 def load_tools_module_by_id(tool_id, content=None):
 
     if content is None:
@@ -75,30 +218,17 @@ def load_tools_module_by_id(tool_id, content=None):
         if not tool:
             raise Exception(f"Toolkit not found: {tool_id}")
 
-        content = tool.content
-
-        content = replace_imports(content)
-        Tools.update_tool_by_id(tool_id, {"content": content})
+        content = replace_imports(tool.content)
+        if content != tool.content:
+            Tools.update_tool_by_id(tool_id, {"content": content})
     else:
         frontmatter = extract_frontmatter(content)
         # Install required packages found within the frontmatter
         install_frontmatter_requirements(frontmatter.get("requirements", ""))
 
     module_name = f"tool_{tool_id}"
-    module = types.ModuleType(module_name)
-    sys.modules[module_name] = module
-
-    # Create a temporary file and use it to define `__file__` so
-    # that it works as expected from the module's perspective.
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
-    temp_file.close()
     try:
-        with open(temp_file.name, "w", encoding="utf-8") as f:
-            f.write(content)
-        module.__dict__["__file__"] = temp_file.name
-
-        # Executing the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        module = exec_plugin_module(module_name, content)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -109,10 +239,8 @@ def load_tools_module_by_id(tool_id, content=None):
             raise Exception("No Tools class found in the module")
     except Exception as e:
         log.error(f"Error loading module: {tool_id}: {e}")
-        del sys.modules[module_name]  # Clean up
+        sys.modules.pop(module_name, None)  # Clean up
         raise e
-    finally:
-        os.unlink(temp_file.name)
 
 
 def load_function_module_by_id(function_id, content=None):
@@ -120,29 +248,17 @@ def load_function_module_by_id(function_id, content=None):
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
-        content = function.content
 
-        content = replace_imports(content)
-        Functions.update_function_by_id(function_id, {"content": content})
+        content = replace_imports(function.content)
+        if content != function.content:
+            Functions.update_function_by_id(function_id, {"content": content})
     else:
         frontmatter = extract_frontmatter(content)
         install_frontmatter_requirements(frontmatter.get("requirements", ""))
 
     module_name = f"function_{function_id}"
-    module = types.ModuleType(module_name)
-    sys.modules[module_name] = module
-
-    # Create a temporary file and use it to define `__file__` so
-    # that it works as expected from the module's perspective.
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
-    temp_file.close()
     try:
-        with open(temp_file.name, "w", encoding="utf-8") as f:
-            f.write(content)
-        module.__dict__["__file__"] = temp_file.name
-
-        # Execute the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        module = exec_plugin_module(module_name, content)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -157,12 +273,90 @@ def load_function_module_by_id(function_id, content=None):
             raise Exception("No Function class found in the module")
     except Exception as e:
         log.error(f"Error loading module: {function_id}: {e}")
-        del sys.modules[module_name]  # Cleanup by removing the module in case of error
+        # Cleanup by removing the module in case of error
+        sys.modules.pop(module_name, None)
 
         Functions.update_function_by_id(function_id, {"is_active": False})
         raise e
-    finally:
-        os.unlink(temp_file.name)
+
+
+def get_loaded_module(modules: dict, id: str, module_name: str, get_content, load):
+    if id in modules and module_name in _module_hashes:
+        content_hash, checked_at = _module_hashes[module_name]
+        if time.monotonic() - checked_at < PLUGIN_MODULE_CHECK_INTERVAL:
+            return modules[id]
+
+        # Compare with the stored content, it may have been updated by another worker
+        content = get_content()
+        if (
+            content is not None
+            and get_content_hash(replace_imports(content)) == content_hash
+        ):
+            _module_hashes[module_name] = (content_hash, time.monotonic())
+            touch_plugin_cache_file(content_hash)
+            return modules[id]
+        log.info(f"Reloading changed module: {module_name}")
+
+    modules[id] = load()
+    return modules[id]
+
+
+def get_function_module(request, function_id):
+    """
+    Returns the loaded function from request.app.state.FUNCTIONS, loading it on
+    first use and reloading it when its stored content changed (checked at most
+    every PLUGIN_MODULE_CHECK_INTERVAL seconds).
+    """
+    return get_loaded_module(
+        request.app.state.FUNCTIONS,
+        function_id,
+        f"function_{function_id}",
+        lambda: getattr(Functions.get_function_by_id(function_id), "content", None),
+        lambda: load_function_module_by_id(function_id)[0],
+    )
+
+
+def get_tools_module(request, tool_id):
+    """Same as get_function_module for request.app.state.TOOLS"""
+    return get_loaded_module(
+        request.app.state.TOOLS,
+        tool_id,
+        f"tool_{tool_id}",
+        lambda: getattr(Tools.get_tool_by_id(tool_id), "content", None),
+        lambda: load_tools_module_by_id(tool_id)[0],
+    )
+
+
+def warm_up_plugin_modules(app):
+    """
+    Loads the active filters and pipes and all tools into app.state, so the first
+    chats of a new worker don't wait for them to compile. Cached files of plugin
+    versions that are no longer stored are removed.
+    """
+    functions = Functions.get_functions()
+    tools = Tools.get_tools()
+    remove_stale_plugin_cache_files(
+        {
+            get_content_hash(replace_imports(plugin.content))
+            for plugin in [*functions, *tools]
+        }
+    )
+
+    for function in functions:
+        if not function.is_active or function.type not in ("filter", "pipe"):
+            continue
+        try:
+            app.state.FUNCTIONS[function.id], _, _ = load_function_module_by_id(
+                function.id
+            )
+        except Exception as e:
+            log.warning(f"Error warming up function {function.id}: {e}")
+
+    for tool in tools:
+        try:
+            app.state.TOOLS[tool.id], _ = load_tools_module_by_id(tool.id)
+        except Exception as e:
+            log.warning(f"Error warming up tool {tool.id}: {e}")
 
 
 def install_frontmatter_requirements(requirements: str):
@@ -1,4 +1,5 @@
 from open_webui.config import PersistentConfig
+from open_webui.env import REDIS_URL, REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
 import os
 
 ####################################
@@ -35,6 +36,142 @@ NAVER_MAP_CLIENT_SECRET = PersistentConfig(
     os.environ.get("NAVER_MAP_CLIENT_SECRET", "")
 )
 
+####################################
+# Corpsearch result cache
+####################################
+
+try:
+    CORPSEARCH_CACHE_TTL = int(os.environ.get("CORPSEARCH_CACHE_TTL", "300"))
+except ValueError:
+    CORPSEARCH_CACHE_TTL = 300
+
+try:
+    CORPSEARCH_CACHE_MAXSIZE = int(os.environ.get("CORPSEARCH_CACHE_MAXSIZE", "1000"))
+except ValueError:
+    CORPSEARCH_CACHE_MAXSIZE = 1000
+
+# Redis 가 설정되어 있으면 워커 간 캐시를 공유한다. 빈 문자열이면 프로세스 내 캐시만 사용
+CORPSEARCH_CACHE_REDIS_URL = os.environ.get("CORPSEARCH_CACHE_REDIS_URL", REDIS_URL)
+CORPSEARCH_CACHE_REDIS_SENTINEL_HOSTS = os.environ.get(
+    "CORPSEARCH_CACHE_REDIS_SENTINEL_HOSTS", REDIS_SENTINEL_HOSTS
+)
+CORPSEARCH_CACHE_REDIS_SENTINEL_PORT = os.environ.get(
+    "CORPSEARCH_CACHE_REDIS_SENTINEL_PORT", REDIS_SENTINEL_PORT
+)
+
+# 목록 조회 시 한 페이지 최대 크기 (limit 파라미터 상한)
+try:
+    CORPSEARCH_MAX_PAGE_SIZE = int(os.environ.get("CORPSEARCH_MAX_PAGE_SIZE", "1000"))
+except ValueError:
+    CORPSEARCH_MAX_PAGE_SIZE = 1000
+
+# stream=true 응답에서 DB 커서로부터 한 번에 가져오는 행 수
+try:
+    CORPSEARCH_STREAM_BATCH_SIZE = int(
+        os.environ.get("CORPSEARCH_STREAM_BATCH_SIZE", "500")
+    )
+except ValueError:
+    CORPSEARCH_STREAM_BATCH_SIZE = 500
+
+####################################
+# Corpsearch spatial index
+####################################
+
+# auto: PostGIS geog 컬럼이 있으면 ST_DWithin/KNN, 없으면 위경도 bounding box 인덱스 사용
+# postgis: 항상 PostGIS 사용 / bbox: 항상 bounding box 사용 / haversine: 기존 전체 계산 방식
+CORPSEARCH_SPATIAL_INDEX = os.environ.get("CORPSEARCH_SPATIAL_INDEX", "auto").lower()
+
+####################################
+# Rooibos SQL
+####################################
+
+# psycopg2 는 파라미터를 클라이언트에서 치환하므로, 실행 계획 재사용을 위해
+# 조건 형태(filter shape)별로 서버 측 PREPARE 문을 만들어 커넥션마다 재사용한다.
+# pgbouncer 트랜잭션 풀링처럼 커넥션이 세션을 유지하지 않는 환경에서는 false 로 설정
+ROOIBOS_PREPARED_STATEMENTS = (
+    os.environ.get("ROOIBOS_PREPARED_STATEMENTS", "True").lower() == "true"
+)
+
+# rooibos 라우터의 동기 DB 작업을 실행하는 전용 스레드 수 (이벤트 루프 블로킹 방지)
+# 기본 스레드 풀(채팅 스트리밍 등과 공유)을 모두 점유하지 않도록 별도로 제한한다
+try:
+    ROOIBOS_DB_THREADPOOL_SIZE = int(os.environ.get("ROOIBOS_DB_THREADPOOL_SIZE", "10"))
+except ValueError:
+    ROOIBOS_DB_THREADPOOL_SIZE = 10
+
+try:
+    ROOIBOS_PREPARED_STATEMENTS_MAX = int(
+        os.environ.get("ROOIBOS_PREPARED_STATEMENTS_MAX", "256")
+    )
+except ValueError:
+    ROOIBOS_PREPARED_STATEMENTS_MAX = 256
+
+####################################
+# Corpsearch text search
+####################################
+
+# auto: trigram_search_master_company.sql 이 적용되어 있으면 trigram 모드 사용
+# trigram: pg_trgm 인덱스 기반 검색 + 사업자등록번호 접두어 검색 + 유사도 정렬(sort=relevance)
+# ilike: 기존 ILIKE '%검색어%' 방식
+CORPSEARCH_TEXT_SEARCH = os.environ.get("CORPSEARCH_TEXT_SEARCH", "auto").lower()
+
+####################################
+# Naver API client
+####################################
+
+try:
+    NAVER_API_TIMEOUT = float(os.environ.get("NAVER_API_TIMEOUT", "5"))
+except ValueError:
+    NAVER_API_TIMEOUT = 5.0
+
+# 연속 실패가 임계값에 도달하면 NAVER_API_CIRCUIT_BREAKER_COOLDOWN 초 동안 호출을 차단
+try:
+    NAVER_API_CIRCUIT_BREAKER_THRESHOLD = int(
+        os.environ.get("NAVER_API_CIRCUIT_BREAKER_THRESHOLD", "5")
+    )
+except ValueError:
+    NAVER_API_CIRCUIT_BREAKER_THRESHOLD = 5
+
+try:
+    NAVER_API_CIRCUIT_BREAKER_COOLDOWN = float(
+        os.environ.get("NAVER_API_CIRCUIT_BREAKER_COOLDOWN", "30")
+    )
+except ValueError:
+    NAVER_API_CIRCUIT_BREAKER_COOLDOWN = 30.0
+
+# 장소/주소 검색 결과 캐시 유지 시간 (초, 기본 7일). 저장소는 기업 검색 캐시와 동일 (Redis 또는 프로세스 내)
+# 재시작 후 유지/워커 간 공유는 Redis 또는 rb_geocode_cache 테이블(sql_migrations/geocode_cache.sql)이 있어야 함
+# 둘 다 없으면 워커별 프로세스 메모리에만 저장됨
+try:
+    GEOCODE_CACHE_TTL = int(os.environ.get("GEOCODE_CACHE_TTL", str(60 * 60 * 24 * 7)))
+except ValueError:
+    GEOCODE_CACHE_TTL = 60 * 60 * 24 * 7
+
+try:
+    NAVER_API_POOL_SIZE = int(os.environ.get("NAVER_API_POOL_SIZE", "20"))
+except ValueError:
+    NAVER_API_POOL_SIZE = 20
+
+####################################
+# Financial summary
+####################################
+
+# financial_summary_company.sql 로 만든 rb_company_financial_summary 테이블 갱신 주기 (초, 0 이면 비활성)
+try:
+    FINANCIAL_SUMMARY_REFRESH_INTERVAL = int(
+        os.environ.get("FINANCIAL_SUMMARY_REFRESH_INTERVAL", str(60 * 60 * 24))
+    )
+except ValueError:
+    FINANCIAL_SUMMARY_REFRESH_INTERVAL = 60 * 60 * 24
+
+# 갱신 시 한 트랜잭션에서 처리하는 기업(master_id) 수
+try:
+    FINANCIAL_SUMMARY_BATCH_SIZE = int(
+        os.environ.get("FINANCIAL_SUMMARY_BATCH_SIZE", "1000")
+    )
+except ValueError:
+    FINANCIAL_SUMMARY_BATCH_SIZE = 1000
+
 
 def init_extended_config(app):
     """Initialize extended configurations"""
@@ -1,6 +1,13 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware
-from rooibos.config_extension import init_extended_config
+from rooibos.config_extension import (
+    init_extended_config,
+    FINANCIAL_SUMMARY_REFRESH_INTERVAL,
+)
+from rooibos.utils.http import close_http_session
+from rooibos.utils.financial_summary import periodic_financial_summary_refresh
 from rooibos.routers import (
     corpsearch,
     mycompanies,
@@ -28,6 +35,25 @@ def extend_app(app: FastAPI):
 
     # Initialize extended configurations
     init_extended_config(app)
+
+    # Run the financial summary refresh job and close shared HTTP connections
+    # when the application shuts down
+    app_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with app_lifespan(app) as state:
+            refresh_task = None
+            if FINANCIAL_SUMMARY_REFRESH_INTERVAL > 0:
+                refresh_task = asyncio.create_task(periodic_financial_summary_refresh())
+            try:
+                yield state
+            finally:
+                if refresh_task:
+                    refresh_task.cancel()
+        await close_http_session()
+
+    app.router.lifespan_context = lifespan
     
     # Add custom middlewares
     # app.add_middleware(CustomHeaderMiddleware)
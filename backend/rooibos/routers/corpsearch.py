@@ -3,13 +3,39 @@ from typing import Optional, Dict, Any
 from open_webui.internal.db import get_db
 from sqlalchemy import text
 from open_webui.env import SRC_LOG_LEVELS
-from rooibos.config_extension import NAVER_MAP_CLIENT_ID, NAVER_MAP_CLIENT_SECRET, NAVER_ID, NAVER_CLIENT_SECRET
-from starlette.responses import JSONResponse
-from functools import lru_cache
+from rooibos.config_extension import (
+    NAVER_MAP_CLIENT_ID,
+    NAVER_MAP_CLIENT_SECRET,
+    NAVER_ID,
+    NAVER_CLIENT_SECRET,
+    CORPSEARCH_SPATIAL_INDEX,
+    CORPSEARCH_MAX_PAGE_SIZE,
+    CORPSEARCH_STREAM_BATCH_SIZE,
+    CORPSEARCH_TEXT_SEARCH,
+    NAVER_API_CIRCUIT_BREAKER_THRESHOLD,
+    NAVER_API_CIRCUIT_BREAKER_COOLDOWN,
+    GEOCODE_CACHE_TTL,
+)
+from rooibos.utils.cache import (
+    corpsearch_cache,
+    financial_data_cache,
+    geocode_cache,
+    make_cache_key,
+)
+from rooibos.utils.query import execute_query, normalize_query, has_schema_feature
+from rooibos.utils.http import get_http_session, coalesce, CircuitBreaker
+from rooibos.utils.threadpool import run_in_db_threadpool, db_threadpool
+from rooibos.utils.financial_summary import FINANCIAL_COLUMNS, refresh_financial_summary
+from open_webui.utils.auth import get_admin_user
+from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse, StreamingResponse
 
+import base64
 import json
 import logging
-import requests
+import math
+import re
 import time
 
 log = logging.getLogger(__name__)
@@ -17,24 +43,28 @@ log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
 
 router = APIRouter()
 
-# 쿼리 결과 캐싱을 위한 LRU 캐시 (최근 100개 쿼리 결과 저장)
-@lru_cache(maxsize=100)
-def cached_query_results(query_hash: str):
-    return {}
+naver_api_breaker = CircuitBreaker(
+    "Naver API",
+    failure_threshold=NAVER_API_CIRCUIT_BREAKER_THRESHOLD,
+    reset_timeout=NAVER_API_CIRCUIT_BREAKER_COOLDOWN,
+)
 
-def search_place(query: str):
+
+class NaverAPIError(Exception):
+    pass
+
+async def search_place(query: str):
     url = "https://openapi.naver.com/v1/search/local.json"
     headers = {
         "X-Naver-Client-Id": str(NAVER_ID).strip(),
         "X-Naver-Client-Secret": str(NAVER_CLIENT_SECRET).strip(),
     }
     params = {"query": query}
-    response = requests.get(url, headers=headers, params=params)
+    async with get_http_session().get(url, headers=headers, params=params) as response:
+        data = await response.json(content_type=None)
 
-    if response.status_code != 200:
-        return {"error": response.json()}
-
-    data = response.json()
+    if response.status != 200:
+        raise NaverAPIError(data)
 
     if data.get("items"):
         for place in data["items"]:
@@ -50,45 +80,133 @@ def search_place(query: str):
         return {"error": "검색된 장소가 없습니다."}
 
 
-def get_coordinates(query: str):
+async def get_coordinates(query: str):
     url = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"
     headers = {
         "X-NCP-APIGW-API-KEY-ID": str(NAVER_MAP_CLIENT_ID).strip(),
         "X-NCP-APIGW-API-KEY": str(NAVER_MAP_CLIENT_SECRET).strip(),
     }
     params = {"query": query}
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
+    async with get_http_session().get(url, headers=headers, params=params) as response:
+        data = await response.json(content_type=None)
+
+    if response.status != 200:
+        raise NaverAPIError(data)
 
     if data.get("addresses"):
         return data["addresses"]
     else:
         return {"error": "주소로 검색된 결과가 없습니다."}
 
-def format_parameter(param):
-    if param is None:
-        return "NULL"
-    if isinstance(param, str):
-        param = param.replace("'", "''")
-        return f"'{param}'"
-    return str(param)
 
-def get_executable_query(sql_query: str, params: list) -> str:   
-    executable_query = sql_query
-    
-    sorted_params = sorted(
-        [(param, index + 1) for index, param in enumerate(params)],
-        key=lambda x: -x[1]
+async def fetch_location(query: str, cache_key: str):
+    if not naver_api_breaker.allow():
+        return {"error": "위치 검색 서비스를 일시적으로 사용할 수 없습니다."}
+
+    lookup = search_place if "역" in query else get_coordinates
+    try:
+        result = await lookup(query)
+    except NaverAPIError as e:
+        naver_api_breaker.record_failure()
+        return {"error": e.args[0]}
+    except Exception as e:
+        # 타임아웃(NAVER_API_TIMEOUT), 연결 오류 등
+        naver_api_breaker.record_failure()
+        log.warning(f"Naver location lookup failed for {query!r}: {e!r}")
+        return {"error": "위치 검색 중 오류가 발생했습니다."}
+
+    naver_api_breaker.record_success()
+    # "검색 결과 없음" 도 같은 검색어에 대해서는 동일하므로 함께 캐시 (API 오류는 캐시하지 않음)
+    await geocode_cache.aset(cache_key, result)
+    await run_in_db_threadpool(store_location, query, result)
+    return result
+
+
+def is_geocode_table_available() -> bool:
+    """geocode_cache.sql 이 적용되어 있는지 확인"""
+    return has_schema_feature(
+        "geocode_cache",
+        "SELECT 1 FROM pg_tables WHERE tablename = 'rb_geocode_cache'",
     )
-    for param, index in sorted_params:
-        placeholder = f"${index}"
-        formatted_param = format_parameter(param)
-        executable_query = executable_query.replace(placeholder, formatted_param)
-    return executable_query
 
-# 거리 계산 함수를 최적화 (지구구체 계산 대신 PostGIS 활용)
-def get_distance_conditions(lat, lng, distance, param_count):
-    """효율적인 거리 계산 조건 생성 (구면 거리 계산 사용)"""
+
+def load_stored_location(query: str):
+    """rb_geocode_cache 에 저장된 결과 (없거나 GEOCODE_CACHE_TTL 이 지났으면 None)"""
+    if not is_geocode_table_available():
+        return None
+    try:
+        with get_db() as db:
+            row = execute_query(
+                db,
+                """
+                SELECT result FROM rb_geocode_cache
+                WHERE query = $1
+                  AND updated_at > now() - make_interval(secs => $2)
+                """,
+                [query, GEOCODE_CACHE_TTL],
+            ).first()
+    except Exception as e:
+        log.warning(f"Failed to load stored location for {query!r}: {e!r}")
+        return None
+    return row[0] if row else None
+
+
+def store_location(query: str, result):
+    """검색 결과를 rb_geocode_cache 에 저장하고 만료된 결과를 정리"""
+    if not is_geocode_table_available():
+        return
+    try:
+        with get_db() as db:
+            execute_query(
+                db,
+                """
+                INSERT INTO rb_geocode_cache (query, result, updated_at)
+                VALUES ($1, CAST($2 AS jsonb), now())
+                ON CONFLICT (query) DO UPDATE
+                SET result = EXCLUDED.result, updated_at = EXCLUDED.updated_at
+                """,
+                [query, json.dumps(result, ensure_ascii=False)],
+            )
+            execute_query(
+                db,
+                """
+                DELETE FROM rb_geocode_cache
+                WHERE updated_at < now() - make_interval(secs => $1)
+                """,
+                [GEOCODE_CACHE_TTL],
+            )
+            db.commit()
+    except Exception as e:
+        log.warning(f"Failed to store location for {query!r}: {e!r}")
+
+
+async def load_location(query: str, cache_key: str):
+    """DB 에 저장된 결과가 있으면 캐시를 채우고 사용, 없으면 네이버 API 호출"""
+    stored = await run_in_db_threadpool(load_stored_location, query)
+    if stored is not None:
+        await geocode_cache.aset(cache_key, stored)
+        return stored
+    return await fetch_location(query, cache_key)
+
+
+async def lookup_location(query: str):
+    """역 이름은 장소 검색, 그 외는 주소 검색. 정규화한 검색어 기준으로 캐시/중복 호출 병합"""
+    normalized = " ".join(query.split()).lower()
+    cache_key = make_cache_key("location", normalized)
+
+    cached = await geocode_cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
+    return await coalesce(cache_key, lambda: load_location(normalized, cache_key))
+
+EARTH_RADIUS_M = 6371000
+
+
+def get_distance_expression(param_count):
+    """
+    rmc 좌표와 ($param_count, $param_count + 1) 위경도 사이의 거리(m) 계산식 (구면 거리)
+    """
     return f"""
         ROUND(
             (
@@ -100,30 +218,300 @@ def get_distance_conditions(lat, lng, distance, param_count):
                     )
                 )
             ) * 1000
-        ) <= ${param_count + 2}
+        )
     """
 
+
+def get_bounding_box(lat: float, lng: float, distance: float):
+    """
+    반경 distance(m) 원을 감싸는 위경도 사각형 (min_lat, max_lat, min_lng, max_lng)
+    ROUND 오차를 고려해 1m 여유를 둔다.
+    """
+    distance = float(distance) + 1
+    delta_lat = math.degrees(distance / EARTH_RADIUS_M)
+
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6:
+        delta_lng = 180.0
+    else:
+        delta_lng = min(math.degrees(distance / (EARTH_RADIUS_M * cos_lat)), 180.0)
+
+    return (
+        max(lat - delta_lat, -90.0),
+        min(lat + delta_lat, 90.0),
+        max(lng - delta_lng, -180.0),
+        min(lng + delta_lng, 180.0),
+    )
+
+
+def is_postgis_available() -> bool:
+    """rb_master_company.geog (PostGIS geography) 컬럼이 있는지 확인"""
+    return has_schema_feature(
+        "postgis",
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'rb_master_company' AND column_name = 'geog'
+        """,
+    )
+
+
+def is_trigram_search_available() -> bool:
+    """trigram_search_master_company.sql 이 적용되어 있는지 확인"""
+    return has_schema_feature(
+        "trigram",
+        """
+        SELECT 1 FROM pg_indexes
+        WHERE tablename = 'rb_master_company' AND indexname = 'idx_rb_master_company_name_trgm'
+        """,
+    )
+
+
+def is_financial_summary_available() -> bool:
+    """financial_summary_company.sql 의 rb_company_financial_summary 테이블이 있는지 확인"""
+    return has_schema_feature(
+        "financial_summary",
+        """
+        SELECT 1 FROM pg_tables WHERE tablename = 'rb_company_financial_summary'
+        """,
+    )
+
+
+def get_spatial_mode() -> str:
+    if CORPSEARCH_SPATIAL_INDEX == "auto":
+        return "postgis" if is_postgis_available() else "bbox"
+    return CORPSEARCH_SPATIAL_INDEX
+
+
+def get_latest_financials_join() -> str:
+    """상세 조회용 최신 연도 재무 데이터 조인 (요약 테이블이 있으면 master_id 로 바로 조회)"""
+    if is_financial_summary_available():
+        return """
+            LEFT JOIN rb_company_financial_summary sfd
+                ON sfd.master_id = rmc.master_id AND sfd.is_latest
+        """
+    return """
+        LEFT JOIN LATERAL (
+            SELECT sfd.total_equity
+            FROM smtp_financial_company sfc 
+            JOIN smtp_financial_data sfd ON sfd.financial_company_id = sfc.id
+            WHERE sfc.company_name = rmc.company_name
+            ORDER BY sfd.year DESC
+            LIMIT 1
+        ) sfd ON true
+    """
+
+
+def get_text_search_mode() -> str:
+    if CORPSEARCH_TEXT_SEARCH == "auto":
+        return "trigram" if is_trigram_search_available() else "ilike"
+    return CORPSEARCH_TEXT_SEARCH
+
+
+BUSINESS_NUMBER_PATTERN = re.compile(r"^[0-9\-\s]+$")
+
+
+def get_text_search_conditions(query: str, categories: list, param_count):
+    """
+    검색어 조건 생성. 반환: (조건 SQL, 파라미터 목록)
+    trigram 모드에서는 ILIKE 조건이 GIN trigram 인덱스로 처리되고,
+    숫자로만 된 사업자등록번호 검색은 접두어 검색으로 btree 인덱스를 사용한다.
+    """
+    mode = get_text_search_mode()
+    params = []
+
+    if len(categories) == 0:
+        # 카테고리가 없으면 기본 검색 필드에서 검색
+        condition = f"""(
+            rmc.company_name ILIKE ${param_count}
+            OR rmc.representative ILIKE ${param_count}
+            OR rmc.address ILIKE ${param_count}
+        )"""
+        return condition, [f"%{query}%"]
+
+    # 여러 토글 중 활성화된 것만 조건 생성
+    conditions = []
+    columns = {
+        "company": "rmc.company_name",
+        "representative": "rmc.representative",
+        "bizNumber": "rmc.business_registration_number",
+        "location": "rmc.address",
+    }
+    for cat in categories:
+        if cat not in columns:
+            continue
+
+        index = param_count + len(params)
+        if (
+            cat == "bizNumber"
+            and mode == "trigram"
+            and BUSINESS_NUMBER_PATTERN.match(query)
+        ):
+            conditions.append(
+                f"regexp_replace(rmc.business_registration_number, '[^0-9]', '', 'g') LIKE ${index}"
+            )
+            params.append(re.sub(r"[^0-9]", "", query) + "%")
+        else:
+            conditions.append(f"{columns[cat]} ILIKE ${index}")
+            params.append(f"%{query}%")
+
+    if not conditions:
+        return None, []
+    return f"({' OR '.join(conditions)})", params
+
+
+def get_search_point(param_count):
+    return f"ST_SetSRID(ST_MakePoint(${param_count + 1}, ${param_count}), 4326)::geography"
+
+
+def get_distance_conditions(lat, lng, distance, param_count):
+    """
+    반경 검색 조건 생성. 인덱스를 탈 수 있는 조건으로 후보를 먼저 좁히고
+    정확한 거리 계산은 후보에 대해서만 수행한다.
+    반환: (조건 SQL, 파라미터 목록) - 파라미터는 $param_count 부터 순서대로 사용
+    """
+    mode = get_spatial_mode()
+    lat = float(lat)
+    lng = float(lng)
+    distance = float(distance)
+
+    if mode == "postgis":
+        # GiST 인덱스를 사용하는 ST_DWithin (구면 계산으로 기존 거리값과 일치)
+        condition = f"""
+            ST_DWithin(rmc.geog, {get_search_point(param_count)}, ${param_count + 2}, false)
+            AND {get_distance_expression(param_count)} <= ${param_count + 2}
+        """
+        return condition, [lat, lng, distance]
+
+    if mode == "bbox":
+        # (latitude, longitude) btree 인덱스로 사각형 범위를 먼저 필터링
+        min_lat, max_lat, min_lng, max_lng = get_bounding_box(lat, lng, distance)
+        condition = f"""
+            rmc.latitude BETWEEN ${param_count + 3} AND ${param_count + 4}
+            AND rmc.longitude BETWEEN ${param_count + 5} AND ${param_count + 6}
+            AND {get_distance_expression(param_count)} <= ${param_count + 2}
+        """
+        return condition, [lat, lng, distance, min_lat, max_lat, min_lng, max_lng]
+
+    return f"{get_distance_expression(param_count)} <= ${param_count + 2}", [lat, lng, distance]
+
+
+def get_distance_order(param_count):
+    """
+    거리순 정렬 (검색 중심점 파라미터 $param_count, $param_count + 1 재사용)
+    PostGIS 를 사용하면 KNN(<->) 으로 인덱스 순서대로 읽는다.
+    """
+    if get_spatial_mode() == "postgis":
+        return f"rmc.geog <-> {get_search_point(param_count)}, distance_from_search ASC"
+    return "distance_from_search ASC"
+
+def encode_cursor(values: list) -> str:
+    """keyset 페이지네이션 커서 (마지막 행의 정렬 키)를 불투명 문자열로 인코딩"""
+    raw = json.dumps(jsonable_encoder(values), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def get_estimated_count(db, count_from_query: str, count_params: list) -> int:
+    """
+    실행 계획의 예상 행 수로 개수를 추정 (COUNT(*) 전체 스캔 없이 계산)
+    """
+    result = execute_query(
+        db,
+        f"EXPLAIN (FORMAT JSON) SELECT 1 {count_from_query}",
+        count_params,
+        prepare=False,
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def stream_search_response(sql_query: str, params: list, response: dict, cursor_columns):
+    """
+    검색 결과를 서버 측 커서로 읽으면서 JSON 으로 바로 내보낸다.
+    data 배열을 먼저 보내고, next_cursor 등 나머지 필드는 마지막에 붙인다.
+    """
+    yield '{"data": ['
+    last_row = None
+    count = 0
+    try:
+        with get_db() as db:
+            result = execute_query(
+                db,
+                sql_query,
+                params,
+                prepare=False,
+                execution_options={
+                    "stream_results": True,
+                    "yield_per": CORPSEARCH_STREAM_BATCH_SIZE,
+                },
+            )
+            for row in result:
+                row = dict(row._mapping)
+                yield ("," if count else "") + json.dumps(
+                    jsonable_encoder(row), ensure_ascii=False
+                )
+                last_row = row
+                count += 1
+    except Exception as e:
+        log.error(f"Search stream error: {str(e)}")
+        response = {
+            **response,
+            "success": False,
+            "error": "Search failed",
+            "message": str(e),
+        }
+
+    limit = response.pop("limit", None)
+    if limit and count == limit and last_row is not None:
+        response["next_cursor"] = encode_cursor([last_row[c] for c in cursor_columns])
+    else:
+        response["next_cursor"] = None
+    response["count"] = count
+
+    trailer = json.dumps(jsonable_encoder(response), ensure_ascii=False)
+    yield "], " + trailer[1:]
+
+
 @router.get("/")
 async def search(
     request: Request,
 ):
     start_time = time.time()
     search_params = request.query_params
-    id = search_params.get("id")    
     query = search_params.get("query", "").strip()
-    user_id = search_params.get("user_id")
-    latitude = search_params.get("latitude")
-    longitude = search_params.get("longitude")
 
     categories_str = search_params.get("queryCategories", "")
     categories = [cat.strip() for cat in categories_str.split(",") if cat.strip()]
 
+    # 페이지네이션: limit 이 없으면 기존처럼 전체 결과를 반환
+    # cursor 는 이전 응답의 next_cursor (정렬 키 기준 keyset 페이지네이션)
+    limit = search_params.get("limit")
+    try:
+        limit = min(int(limit), CORPSEARCH_MAX_PAGE_SIZE) if limit else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid limit")
+    cursor = search_params.get("cursor")
+    cursor_values = decode_cursor(cursor) if cursor else None
+    # exact: COUNT(*) / estimate: 실행 계획 예상 행 수 / none: 개수 조회 생략
+    count_mode = search_params.get("count", "exact").lower()
+    # relevance: trigram 모드에서 회사명 유사도 순 정렬 (기본은 회사명/거리순)
+    sort = search_params.get("sort", "").lower()
+    stream = search_params.get("stream", "false").lower() in ["true", "1", "yes", "y"]
+
     # 위치 검색이면 해당 API를 빠르게 호출
     if "location" in categories and query:
-        if "역" in query:
-            location_result = search_place(query)
-        else:
-            location_result = get_coordinates(query)
+        location_result = await lookup_location(query)
         if location_result:
             return {
                 "success": True,
@@ -142,7 +530,39 @@ async def search(
                 "total": 0,
                 "query": {"search": query, "filters": {}},
             }     
-    
+
+    # 기업 검색은 동기 DB 작업이므로 전용 스레드 풀에서 실행
+    return await run_in_db_threadpool(
+        search_companies,
+        search_params,
+        start_time,
+        limit=limit,
+        cursor=cursor,
+        cursor_values=cursor_values,
+        count_mode=count_mode,
+        sort=sort,
+        stream=stream,
+    )
+
+
+def search_companies(
+    search_params,
+    start_time: float,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    cursor_values: Optional[list] = None,
+    count_mode: str = "exact",
+    sort: str = "",
+    stream: bool = False,
+):
+    id = search_params.get("id")    
+    query = search_params.get("query", "").strip()
+    user_id = search_params.get("user_id")
+    latitude = search_params.get("latitude")
+    longitude = search_params.get("longitude")
+
+    categories_str = search_params.get("queryCategories", "")
+    categories = [cat.strip() for cat in categories_str.split(",") if cat.strip()]
     # 사용자 위치 정보 (항상 필요함)
     user_latitude = float(search_params.get("userLatitude", 0))
     user_longitude = float(search_params.get("userLongitude", 0))
@@ -189,12 +609,27 @@ async def search(
     unallocated_profit_min, unallocated_profit_max = process_range_filter(filters.get("unallocated_profit"))
     total_equity_min, total_equity_max = process_range_filter(filters.get("total_equity"))
     
-    # 캐싱을 위한 쿼리 해시값 생성
-    query_hash = f"{id}_{query}_{user_id}_{latitude}_{longitude}_{categories_str}_{filters_param}"
-    cached_result = cached_query_results(query_hash)
-    if cached_result:
+    # 캐싱을 위한 쿼리 해시값 생성 (카테고리 순서, 필터 키 순서와 무관하게 정규화)
+    query_hash = make_cache_key(
+        id,
+        query,
+        user_id,
+        latitude,
+        longitude,
+        user_latitude,
+        user_longitude,
+        sorted(categories),
+        filters,
+        limit,
+        cursor,
+        count_mode,
+        sort,
+    )
+    cached_result = None if stream else corpsearch_cache.get(query_hash)
+    if cached_result is not None:
         log.info(f"Cache hit for query: {query_hash}")
         return cached_result
+    cache_generation = corpsearch_cache.generation()
     
     try:
         params = []
@@ -207,11 +642,6 @@ async def search(
         # 카운트 쿼리와 실제 데이터 쿼리 분리
         if not id:
             # 먼저 조건에 맞는 전체 개수를 효율적으로 계산
-            count_query = """
-                SELECT COUNT(*) 
-                FROM rb_master_company rmc
-            """
-            
             count_where_clauses = ["rmc.company_type != '개인' AND rmc.latitude IS NOT NULL"]
             count_params = []
             count_param_idx = 1
@@ -219,55 +649,21 @@ async def search(
             # 검색어 유무에 따라 다른 조건 적용
             if query:
                 # 검색어가 있는 경우: 거리 제한 없이 검색어만으로 필터링
-                if len(categories) > 0:
-                    search_conditions = []
-                    for cat in categories:
-                        if cat == "company":
-                            search_conditions.append(f"rmc.company_name ILIKE ${count_param_idx}")
-                            count_params.append(f"%{query}%")
-                            count_param_idx += 1
-                        elif cat == "representative":
-                            search_conditions.append(f"rmc.representative ILIKE ${count_param_idx}")
-                            count_params.append(f"%{query}%")
-                            count_param_idx += 1
-                        elif cat == "bizNumber":
-                            search_conditions.append(f"rmc.business_registration_number ILIKE ${count_param_idx}")
-                            count_params.append(f"%{query}%")
-                            count_param_idx += 1
-                        elif cat == "location":
-                            search_conditions.append(f"rmc.address ILIKE ${count_param_idx}")
-                            count_params.append(f"%{query}%")
-                            count_param_idx += 1
-
-                    if search_conditions:
-                        count_where_clauses.append(f"({' OR '.join(search_conditions)})")
-                else:
-                    # 카테고리가 없으면 기본 검색 필드에서 검색
-                    count_where_clauses.append(f"""(
-                        rmc.company_name ILIKE ${count_param_idx}
-                        OR rmc.representative ILIKE ${count_param_idx}
-                        OR rmc.address ILIKE ${count_param_idx}
-                    )""")
-                    count_params.append(f"%{query}%")
-                    count_param_idx += 1
+                search_condition, search_params_list = get_text_search_conditions(
+                    query, categories, count_param_idx
+                )
+                if search_condition:
+                    count_where_clauses.append(search_condition)
+                    count_params.extend(search_params_list)
+                    count_param_idx += len(search_params_list)
             else:
                 # 검색어가 없는 경우: 거리 제한 적용
-                dist_condition = f"""
-                    ROUND(
-                        (
-                            6371 * 2 * asin(
-                                sqrt(
-                                    power(sin((radians(rmc.latitude) - radians(${count_param_idx})) / 2), 2) +
-                                    cos(radians(${count_param_idx})) * cos(radians(rmc.latitude)) * 
-                                    power(sin((radians(rmc.longitude) - radians(${count_param_idx + 1})) / 2), 2)
-                                )
-                            )
-                        ) * 1000
-                    ) <= ${count_param_idx + 2}
-                """
+                dist_condition, dist_params = get_distance_conditions(
+                    search_latitude, search_longitude, distance, count_param_idx
+                )
                 count_where_clauses.append(dist_condition)
-                count_params.extend([search_latitude, search_longitude, distance])
-                count_param_idx += 3
+                count_params.extend(dist_params)
+                count_param_idx += len(dist_params)
             
             # 기타 필터 조건들 추가
             # 숫자형 필드 필터링
@@ -325,13 +721,24 @@ async def search(
                 count_params.extend(excluded_list)
                 count_param_idx += len(excluded_list)
 
-            count_query += " WHERE " + " AND ".join(count_where_clauses)
-            count_executable_query = get_executable_query(count_query, count_params)
-            log.info(f"Executing Count Query: {count_executable_query}")
-            
-            with get_db() as db:
-                count_result = db.execute(text(count_executable_query))
-                total_count = count_result.scalar()
+            count_from_query = " FROM rb_master_company rmc WHERE " + " AND ".join(count_where_clauses)
+
+            # 개수는 커서와 무관하므로 다음 페이지 요청에서는 캐시된 값을 사용
+            count_cache_key = make_cache_key(
+                "count", count_mode, normalize_query(count_from_query), count_params
+            )
+            total_count = corpsearch_cache.get(count_cache_key)
+            if total_count is None and count_mode != "none":
+                with get_db() as db:
+                    if count_mode == "estimate":
+                        log.info(f"Estimating Count Query: {normalize_query(count_from_query)} | Parameters: {count_params}")
+                        total_count = get_estimated_count(db, count_from_query, count_params)
+                    else:
+                        count_query = "SELECT COUNT(*)" + count_from_query
+                        log.info(f"Executing Count Query: {normalize_query(count_query)} | Parameters: {count_params}")
+                        count_result = execute_query(db, count_query, count_params)
+                        total_count = count_result.scalar()
+                corpsearch_cache.set(count_cache_key, total_count, cache_generation)
         else:
             # ID로 조회하는 경우는 항상 1개만 반환하므로 count는 1로 설정
             total_count = 1
@@ -355,24 +762,14 @@ async def search(
         
         # ID로 조회하는 경우만 모든 필드 조회
         if id:
-            sql_query = """
+            sql_query = f"""
                 SELECT 
                     rmc.*,
                     cb.id as bookmark_id,
                     cb.user_id as bookmark_user_id,
                     cb.data as files,
                     sfd.total_equity as financial_total_equity,
-                    ROUND(
-                        (
-                            6371 * 2 * asin(
-                                sqrt(
-                                    power(sin((radians(rmc.latitude) - radians(${param_count})) / 2), 2) +
-                                    cos(radians(${param_count})) * cos(radians(rmc.latitude)) * 
-                                    power(sin((radians(rmc.longitude) - radians(${param_count + 1})) / 2), 2)
-                                )
-                            )
-                        ) * 1000
-                    ) AS distance_from_user
+                    {get_distance_expression(param_count)} AS distance_from_user
             """
             params.extend([user_latitude, user_longitude])
             param_count += 2
@@ -385,40 +782,34 @@ async def search(
             """
 
         # 거리 계산 열 추가 (검색 중심점과의 거리)
+        # 거리 계산은 WHERE 조건으로 걸러진 후보 행에 대해서만 수행됨
         if not id:
+            search_point_param = param_count
             sql_query += f"""
-                , ROUND(
-                    (
-                        6371 * 2 * asin(
-                            sqrt(
-                                power(sin((radians(rmc.latitude) - radians(${param_count})) / 2), 2) +
-                                cos(radians(${param_count})) * cos(radians(rmc.latitude)) * 
-                                power(sin((radians(rmc.longitude) - radians(${param_count + 1})) / 2), 2)
-                            )
-                        )
-                    ) * 1000
-                ) AS distance_from_search
+                , {get_distance_expression(param_count)} AS distance_from_search
             """
             params.extend([search_latitude, search_longitude])
             param_count += 2
 
             # 추가: 항상 사용자 위치와의 거리도 계산 (검색 위치와 다를 수 있음)
             sql_query += f"""
-                , ROUND(
-                    (
-                        6371 * 2 * asin(
-                            sqrt(
-                                power(sin((radians(rmc.latitude) - radians(${param_count})) / 2), 2) +
-                                cos(radians(${param_count})) * cos(radians(rmc.latitude)) * 
-                                power(sin((radians(rmc.longitude) - radians(${param_count + 1})) / 2), 2)
-                            )
-                        )
-                    ) * 1000
-                ) AS distance_from_user
+                , {get_distance_expression(param_count)} AS distance_from_user
             """
             params.extend([user_latitude, user_longitude])
             param_count += 2
 
+            # 검색어 유사도 (trigram 모드에서 sort=relevance 인 경우)
+            rank_by_relevance = (
+                bool(query) and sort == "relevance" and get_text_search_mode() == "trigram"
+            )
+            if rank_by_relevance:
+                rank_expression = f"similarity(rmc.company_name, ${param_count})"
+                sql_query += f"""
+                    , {rank_expression} AS search_rank
+                """
+                params.append(query)
+                param_count += 1
+
         # 북마크 정보를 위한 사용자 ID 추가
         params.append(user_id)
         user_id_param = param_count
@@ -437,14 +828,7 @@ async def search(
                     AND me.position = '대표이사'
                     LIMIT 1
                 ) me ON true
-                LEFT JOIN LATERAL (
-                    SELECT sfd.total_equity
-                    FROM smtp_financial_company sfc 
-                    JOIN smtp_financial_data sfd ON sfd.financial_company_id = sfc.id
-                    WHERE sfc.company_name = rmc.company_name
-                    ORDER BY sfd.year DESC
-                    LIMIT 1
-                ) sfd ON true
+                {get_latest_financials_join()}
                 WHERE rmc.company_type != '개인' AND rmc.latitude IS NOT NULL
             """
         else:
@@ -464,59 +848,21 @@ async def search(
             # 검색어 유무에 따라 다른 조건 적용
             if query:
                 # 검색어가 있는 경우: 거리 제한 없이 검색어로만 필터링
-                if len(categories) > 0:
-                    # 여러 토글 중 활성화된 것만 조건 생성
-                    conditions = []
-                    for cat in categories:
-                        if cat == "company":
-                            conditions.append(f"rmc.company_name ILIKE ${param_count}")
-                            params.append(f"%{query}%")
-                            param_count += 1
-                        elif cat == "representative":
-                            conditions.append(f"rmc.representative ILIKE ${param_count}")
-                            params.append(f"%{query}%")
-                            param_count += 1
-                        elif cat == "bizNumber":
-                            conditions.append(f"rmc.business_registration_number ILIKE ${param_count}")
-                            params.append(f"%{query}%")
-                            param_count += 1
-                        elif cat == "location":
-                            conditions.append(f"rmc.address ILIKE ${param_count}")
-                            params.append(f"%{query}%")
-                            param_count += 1
-
-                    if conditions:
-                        joined_conditions = " OR ".join(conditions)
-                        sql_query += f" AND ({joined_conditions}) "
-                else:
-                    # 카테고리가 없으면 기본 검색 필드에서 검색
-                    sql_query += f"""
-                        AND (
-                            rmc.company_name ILIKE ${param_count}
-                            OR rmc.representative ILIKE ${param_count}
-                            OR rmc.address ILIKE ${param_count}
-                        )
-                    """
-                    params.append(f"%{query}%")
-                    param_count += 1
+                search_condition, search_params_list = get_text_search_conditions(
+                    query, categories, param_count
+                )
+                if search_condition:
+                    sql_query += f" AND {search_condition} "
+                    params.extend(search_params_list)
+                    param_count += len(search_params_list)
             else:
                 # 검색어가 없는 경우에만 거리 제한 적용
-                distance_condition = f"""
-                    ROUND(
-                        (
-                            6371 * 2 * asin(
-                                sqrt(
-                                    power(sin((radians(rmc.latitude) - radians(${param_count})) / 2), 2) +
-                                    cos(radians(${param_count})) * cos(radians(rmc.latitude)) * 
-                                    power(sin((radians(rmc.longitude) - radians(${param_count + 1})) / 2), 2)
-                                )
-                            )
-                        ) * 1000
-                    ) <= ${param_count + 2}
-                """
+                distance_condition, distance_params = get_distance_conditions(
+                    search_latitude, search_longitude, distance, param_count
+                )
                 sql_query += f" AND {distance_condition}"
-                params.extend([search_latitude, search_longitude, float(distance)])
-                param_count += 3
+                params.extend(distance_params)
+                param_count += len(distance_params)
             
             # 추가 필터 조건 적용
             # 숫자형 필드 필터링
@@ -574,45 +920,100 @@ async def search(
                 params.extend(excluded_list)
                 param_count += len(excluded_list)
 
-        # 정렬 기준 추가
+            # keyset 페이지네이션: (정렬 키, master_id) 가 커서보다 큰 행만 조회
+            if rank_by_relevance:
+                cursor_columns = ["search_rank", "master_id"]
+            elif query:
+                cursor_columns = ["company_name", "master_id"]
+                sort_expression = "rmc.company_name"
+            else:
+                cursor_columns = ["distance_from_search", "master_id"]
+                sort_expression = get_distance_expression(search_point_param)
+
+            if cursor_values and rank_by_relevance:
+                # 유사도는 내림차순이므로 행 비교 대신 조건을 풀어서 작성
+                sql_query += f"""
+                    AND (
+                        {rank_expression} < ${param_count}
+                        OR ({rank_expression} = ${param_count} AND rmc.master_id > ${param_count + 1})
+                    )
+                """
+                params.extend(cursor_values)
+                param_count += 2
+            elif cursor_values:
+                sql_query += f" AND ({sort_expression}, rmc.master_id) > (${param_count}, ${param_count + 1})"
+                params.extend(cursor_values)
+                param_count += 2
+
+        # 정렬 기준 추가 (동일 값은 master_id 로 정렬해 페이지 간 순서를 고정)
         if not id:
-            if query:
+            if rank_by_relevance:
+                sql_query += " ORDER BY search_rank DESC, rmc.master_id ASC"
+            elif query:
                 # 검색어가 있는 경우: 기본 정렬 (회사명)
-                sql_query += " ORDER BY rmc.company_name ASC"
+                sql_query += " ORDER BY rmc.company_name ASC, rmc.master_id ASC"
+            elif limit or cursor_values:
+                # 페이지 조회는 커서와 같은 키로 정렬해야 함
+                sql_query += " ORDER BY distance_from_search ASC, rmc.master_id ASC"
             else:
                 # 검색어가 없는 경우: 거리 기준 정렬
-                sql_query += " ORDER BY distance_from_search ASC"
+                sql_query += f" ORDER BY {get_distance_order(search_point_param)}, rmc.master_id ASC"
+
+            if limit:
+                sql_query += f" LIMIT ${param_count}"
+                params.append(limit)
+                param_count += 1
         
-        # 쿼리 실행
-        executable_query = get_executable_query(sql_query, params)
-        executable_query = '\n'.join(line for line in executable_query.splitlines() if line.strip())
-        log.info(f"Executing SQL Query: {executable_query}")
+        # 쿼리 실행 (값은 바인드 파라미터로 전달되어 조건 형태가 같으면 실행 계획을 재사용)
+        log.info(f"Executing SQL Query: {normalize_query(sql_query)} | Parameters: {params}")
+
+        query_info = id or {
+            "search": query,
+            "filters": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "userLatitude": user_latitude,
+                "userLongitude": user_longitude,
+                "distance": distance,
+            },
+        }
+
+        if stream and not id:
+            return StreamingResponse(
+                stream_search_response(
+                    sql_query,
+                    params,
+                    {
+                        "success": True,
+                        "total": total_count,
+                        "limit": limit,
+                        "query": query_info,
+                    },
+                    cursor_columns,
+                ),
+                media_type="application/json",
+            )
 
         with get_db() as db:
-            result = db.execute(text(executable_query))
+            result = execute_query(db, sql_query, params)
             companies = [dict(row._mapping) for row in result.fetchall()]
+
+        next_cursor = None
+        if not id and limit and len(companies) == limit:
+            next_cursor = encode_cursor([companies[-1][c] for c in cursor_columns])
         
         # 응답 생성
         response = {
             "success": True,
             "data": companies,
             "total": total_count,
-            "query": id or {
-                "search": query,
-                "filters": {
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "userLatitude": user_latitude,
-                    "userLongitude": user_longitude,
-                    "distance": distance,
-                },
-            },
+            "next_cursor": next_cursor,
+            "query": query_info,
             "execution_time_ms": round((time.time() - start_time) * 1000, 2)
         }
         
         # 결과를 캐시에 저장
-        cached_query_results.cache_clear()  # 캐시 크기 관리를 위해 주기적으로 클리어
-        cached_query_results(query_hash)
+        corpsearch_cache.set(query_hash, response, cache_generation)
         
         return response
 
@@ -628,7 +1029,8 @@ async def search(
         )
 
 @router.get("/industries")
-async def get_industries(query: str = ""):
+@db_threadpool
+def get_industries(query: str = ""):
     """
     rb_master_company 테이블에서 중복되지 않는 industry 값을 오름차순으로 조회합니다.
     query 파라미터가 전달되면, 해당 문자열을 포함하는 업종만 필터링하여 반환합니다.
@@ -674,64 +1076,78 @@ async def get_industries(query: str = ""):
 
     
 @router.get("/{id}/financialData")
-async def get_corp_financialData(id: str):
+@db_threadpool
+def get_corp_financialData(id: str):
     try:
         # 캐시 키 생성
-        cache_key = f"financial_data_{id}"
-        cached_data = cached_query_results(cache_key)
-        if cached_data:
+        cache_key = make_cache_key("financial_data", id)
+        cached_data = financial_data_cache.get(cache_key)
+        if cached_data is not None:
             return cached_data
         
         params = [id]
 
-        sql_query = """
-            WITH financial_data AS (
-                SELECT 
-                    sfd.financial_company_id,
-                    sfd.year,
-                    sfd.revenue,
-                    sfd.net_income,
-                    sfd.operating_income,
-                    sfd.total_assets,
-                    sfd.total_liabilities,
-                    sfd.total_equity,
-                    sfd.capital_stock,
-                    sfd.corporate_tax,
-                    sfd.current_assets,
-                    sfd.quick_assets,
-                    sfd.inventory,
-                    sfd.non_current_assets,
-                    sfd.investment_assets,
-                    sfd.tangible_assets,
-                    sfd.intangible_assets,
-                    sfd.current_liabilities,
-                    sfd.non_current_liabilities,
-                    sfd.retained_earnings,
-                    sfd.profit,
-                    sfd.sales_cost,
-                    sfd.sales_profit,
-                    sfd.sga,
-                    sfd.other_income,
-                    sfd.other_expenses,
-                    sfd.pre_tax_income,
+        if is_financial_summary_available():
+            # 기업/연도별로 미리 정리된 요약 테이블 조회 (rooibos/utils/financial_summary.py 가 갱신)
+            sql_query = f"""
+                SELECT
+                    sfs.financial_company_id,
+                    sfs.year,
+                    {", ".join(f"sfs.{column}" for column in FINANCIAL_COLUMNS)},
                     rmc.recent_total_assets,
-                    rmc.recent_total_equity,
-                    ROW_NUMBER() OVER (PARTITION BY sfd.year ORDER BY sfd.financial_company_id) as rn
-                FROM rb_master_company rmc /*+ INDEX(rmc idx_rb_master_company_id) */
-                JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
-                JOIN smtp_financial_data sfd ON sfc.id = sfd.financial_company_id
-                WHERE rmc.master_id = $1
-            )
-            SELECT * FROM financial_data
-            WHERE rn = 1
-            ORDER BY year DESC
-        """
-
-        query = get_executable_query(sql_query, params)
+                    rmc.recent_total_equity
+                FROM rb_company_financial_summary sfs
+                JOIN rb_master_company rmc ON rmc.master_id = sfs.master_id
+                WHERE sfs.master_id = $1
+                ORDER BY sfs.year DESC
+            """
+        else:
+            sql_query = """
+                WITH financial_data AS (
+                    SELECT 
+                        sfd.financial_company_id,
+                        sfd.year,
+                        sfd.revenue,
+                        sfd.net_income,
+                        sfd.operating_income,
+                        sfd.total_assets,
+                        sfd.total_liabilities,
+                        sfd.total_equity,
+                        sfd.capital_stock,
+                        sfd.corporate_tax,
+                        sfd.current_assets,
+                        sfd.quick_assets,
+                        sfd.inventory,
+                        sfd.non_current_assets,
+                        sfd.investment_assets,
+                        sfd.tangible_assets,
+                        sfd.intangible_assets,
+                        sfd.current_liabilities,
+                        sfd.non_current_liabilities,
+                        sfd.retained_earnings,
+                        sfd.profit,
+                        sfd.sales_cost,
+                        sfd.sales_profit,
+                        sfd.sga,
+                        sfd.other_income,
+                        sfd.other_expenses,
+                        sfd.pre_tax_income,
+                        rmc.recent_total_assets,
+                        rmc.recent_total_equity,
+                        ROW_NUMBER() OVER (PARTITION BY sfd.year ORDER BY sfd.financial_company_id) as rn
+                    FROM rb_master_company rmc /*+ INDEX(rmc idx_rb_master_company_id) */
+                    JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+                    JOIN smtp_financial_data sfd ON sfc.id = sfd.financial_company_id
+                    WHERE rmc.master_id = $1
+                )
+                SELECT * FROM financial_data
+                WHERE rn = 1
+                ORDER BY year DESC
+            """
 
         with get_db() as db:
-            log.info(f"Executing Financial Data Query: {query}")
-            result = db.execute(text(query))
+            log.info(f"Executing Financial Data Query for master_id={id}")
+            result = execute_query(db, sql_query, params)
             financial_data = [dict(row._mapping) for row in result.fetchall()]        
 
         response = {
@@ -741,7 +1157,7 @@ async def get_corp_financialData(id: str):
         }
         
         # 캐시에 저장
-        cached_query_results(cache_key)
+        financial_data_cache.set(cache_key, response)
         
         return response
     except Exception as e:
@@ -752,3 +1168,21 @@ async def get_corp_financialData(id: str):
             "message": str(e)
         }
 
+
+class FinancialSummaryRefreshForm(BaseModel):
+    master_ids: Optional[list] = None
+
+
+@router.post("/financialData/refresh")
+@db_threadpool
+def refresh_corp_financialData(
+    form_data: FinancialSummaryRefreshForm, user=Depends(get_admin_user)
+):
+    """재무 요약 테이블 갱신 (master_ids 가 없으면 전체)"""
+    if not is_financial_summary_available():
+        raise HTTPException(
+            status_code=400,
+            detail="rb_company_financial_summary table does not exist",
+        )
+    updated = refresh_financial_summary(form_data.master_ids)
+    return {"success": updated is not None, "updated": updated}
@@ -4,9 +4,9 @@ from open_webui.internal.db import get_db
 from sqlalchemy import text
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.models.users import Users
+from rooibos.utils.threadpool import db_threadpool, read_json_body
 
 import logging
-import requests
 import uuid
 import time
 import json
@@ -17,7 +17,8 @@ log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
 router = APIRouter()
 
 @router.get("/")
-async def getNoteFolder(request: Request):
+@db_threadpool
+def getNoteFolder(request: Request):
     search_params = request.query_params
     userId = search_params.get("userId")  
     folderType = search_params.get("folderType")
@@ -66,8 +67,9 @@ async def getNoteFolder(request: Request):
         )
 
 @router.post("/add")
-async def addNoteFolder(request: Request):
-    data = await request.json()
+@db_threadpool
+def addNoteFolder(request: Request):
+    data = read_json_body(request)
     userId = request.query_params.get("userId")  
     folder_name = data.get("name", "Untitle")
     folder_type = data.get("type")
@@ -101,7 +103,8 @@ async def addNoteFolder(request: Request):
         )
 
 @router.get("/rename")
-async def update_folder_name(request: Request):
+@db_threadpool
+def update_folder_name(request: Request):
     search_params = request.query_params
     folderId = search_params.get("folderId")
     folderName = search_params.get("folderName")
@@ -144,7 +147,8 @@ async def update_folder_name(request: Request):
 
 
 @router.get("/{folderId}/companies")
-async def getFolderCompanyList(folderId: str, request: Request):    
+@db_threadpool
+def getFolderCompanyList(folderId: str, request: Request):    
     search_params = request.query_params
     userId = search_params.get("userId")
     deleted_param = search_params.get("deleted", "false")
@@ -360,7 +364,8 @@ async def getFolderCompanyList(folderId: str, request: Request):
         )
 
 @router.get("/trash/companies")
-async def getTrashCompanyList(request: Request):    
+@db_threadpool
+def getTrashCompanyList(request: Request):    
     search_params = request.query_params
     userId = search_params.get("userId")
     try:
@@ -400,7 +405,8 @@ async def getTrashCompanyList(request: Request):
         }
 
 @router.get("/shared/companies")
-async def getSharedCompanyList(request: Request):    
+@db_threadpool
+def getSharedCompanyList(request: Request):    
     search_params = request.query_params
     userId = search_params.get("userId")
     try:
@@ -441,7 +447,8 @@ async def getSharedCompanyList(request: Request):
         }
 
 @router.get("/{id}/accessControl/users")
-async def get_access_control_users(id: str, request: Request):
+@db_threadpool
+def get_access_control_users(id: str, request: Request):
     try:
         with get_db() as db:
             # folder의 access_control 필드를 조회
@@ -466,7 +473,8 @@ async def get_access_control_users(id: str, request: Request):
         return {"success": False, "error": "Get users failed", "message": str(e)}
 
 @router.post("/{id}/accessControl/addUser")
-async def add_user_access_control(id: str, request: Request):
+@db_threadpool
+def add_user_access_control(id: str, request: Request):
     try:
         search_params = request.query_params
         user_id = search_params.get("user_id")
@@ -526,7 +534,8 @@ async def add_user_access_control(id: str, request: Request):
 
 
 @router.post("/{id}/accessControl/removeUser")
-async def remove_user_access_control(id: str, request: Request):
+@db_threadpool
+def remove_user_access_control(id: str, request: Request):
     try:
         search_params = request.query_params
         user_id = search_params.get("user_id")
@@ -585,7 +594,8 @@ async def remove_user_access_control(id: str, request: Request):
         }
 
 @router.delete("/{id}/delete")
-async def delete_folder(id: str, request: Request):
+@db_threadpool
+def delete_folder(id: str, request: Request):
     try:
         with get_db() as db:
             # 폴더 삭제
@@ -618,7 +628,8 @@ async def delete_folder(id: str, request: Request):
         )
 
 @router.get("/{id}")
-async def get_folder_by_id(id: str, request: Request):
+@db_threadpool
+def get_folder_by_id(id: str, request: Request):
     try:
         with get_db() as db:
             query = """
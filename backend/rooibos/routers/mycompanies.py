@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
 
 from open_webui.internal.db import get_db
 from sqlalchemy import text
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.models.users import UserModel, Users
 from open_webui.utils.access_control import has_access
+from open_webui.utils.auth import get_verified_user
 from open_webui.models.groups import Groups
+from open_webui.models.chats import Chats
+from rooibos.utils.cache import corpsearch_cache
+from rooibos.utils.query import execute_query, has_schema_feature
+from rooibos.utils.threadpool import db_threadpool, read_json_body
 
 import json
 import logging
@@ -16,29 +21,224 @@ log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
 
 router = APIRouter()
 
-def format_parameter(param):
-    if param is None:
-        return "NULL"
-    if isinstance(param, str):
-        param = param.replace("'", "''")
-        return f"'{param}'"
-    return str(param)
+# 북마크 상세 조회에서 함께 반환하는 기업 정보 컬럼
+BOOKMARK_COMPANY_COLUMNS = """
+            -- 회사 기본 정보
+            rmc.master_id,
+            rmc.company_name,
+            rmc.representative,
+            rmc.postal_code,
+            rmc.address,
+            rmc.phone_number,
+            rmc.fax_number,
+            rmc.website,
+            rmc.email,
+            rmc.business_registration_number,
+            
+            -- 회사 추가 정보
+            rmc.company_type,
+            rmc.establishment_date,
+            rmc.founding_date,
+            rmc.employee_count,
+            rmc.industry_code1,
+            rmc.industry_code2,
+            rmc.industry,
+            rmc.main_product,
+            rmc.main_bank,
+            rmc.main_branch,
+            rmc.group_name,
+            rmc.stock_code,
+            rmc.corporate_number,
+            rmc.english_name,
+            rmc.trade_name,
+            
+            -- 재무 정보
+            rmc.fiscal_month,
+            rmc.sales_year,
+            rmc.recent_sales,
+            rmc.profit_year,
+            rmc.recent_profit,
+            rmc.operating_profit_year,
+            rmc.recent_operating_profit,
+            rmc.asset_year,
+            rmc.recent_total_assets,
+            rmc.debt_year,
+            rmc.recent_total_debt,
+            rmc.equity_year,
+            rmc.recent_total_equity,
+            rmc.capital_year,
+            rmc.recent_capital,
+            
+            -- 지역 및 산업 정보
+            rmc.region1,
+            rmc.region2,
+            rmc.industry_major,
+            rmc.industry_middle,
+            rmc.industry_small,
+            rmc.latitude,
+            rmc.longitude,
+            
+            -- 기타 회사 정보
+            rmc.sme_type,
+            rmc.research_info,
+            rmc.representative_birth,
+            rmc.is_family_shareholder,
+            rmc.is_non_family_shareholder,
+            rmc.financial_statement_year,
+            rmc.total_assets,
+            rmc.total_equity,
+            rmc.net_income,
+            rmc.venture_confirmation_type,
+            rmc.venture_valid_from,
+            rmc.venture_valid_until,
+            rmc.confirming_authority,
+            rmc.new_reconfirmation_code
+"""
+# 채팅 목록에 표시하는 요약 정보 (chat JSON 본문은 제외)
+CHAT_SUMMARY_QUERY = """
+    SELECT
+        c.id,
+        c.user_id,
+        c.title,
+        c.share_id,
+        c.business_registration_number,
+        c.created_at,
+        c.updated_at
+    FROM chat c
+    JOIN unnest(CAST($1 AS text[]), CAST($2 AS text[])) AS target(user_id, business_registration_number)
+        ON c.user_id = target.user_id
+        AND c.business_registration_number = target.business_registration_number
+    ORDER BY c.updated_at DESC
+"""
 
-def get_executable_query(sql_query: str, params: list) -> str:   
-    executable_query = sql_query
-    
-    sorted_params = sorted(
-        [(param, index + 1) for index, param in enumerate(params)],
-        key=lambda x: -x[1]
+
+def get_chat_summaries(db, owners: list) -> list:
+    """(북마크 소유자 ID, 사업자등록번호) 목록에 해당하는 채팅 요약을 한 번에 조회"""
+    owners = [(user_id, brn) for user_id, brn in owners if user_id and brn]
+    if not owners:
+        return []
+    params = [[user_id for user_id, _ in owners], [brn for _, brn in owners]]
+    result = execute_query(db, CHAT_SUMMARY_QUERY, params)
+    return [dict(row._mapping) for row in result.fetchall()]
+
+
+def has_bookmark_write_access(
+    user_id: str, user_group_ids: list, bookmark_user_id: str, access_control
+) -> bool:
+    if user_id == bookmark_user_id:
+        return True
+    if access_control is None:
+        return False
+    write_permission = access_control.get("write", {})
+    permitted_group_ids = write_permission.get("group_ids", [])
+    permitted_user_ids = write_permission.get("user_ids", [])
+    return user_id in permitted_user_ids or any(
+        group_id in permitted_group_ids for group_id in user_group_ids
+    )
+
+
+def is_bookmark_file_table_available() -> bool:
+    """bookmark_file_relation.sql 의 corp_bookmark_file 테이블이 있는지 확인"""
+    return has_schema_feature(
+        "bookmark_file",
+        """
+        SELECT 1 FROM pg_tables WHERE tablename = 'corp_bookmark_file'
+        """,
+    )
+
+
+def get_bookmark_file_ids_query() -> str:
+    """북마크 f 의 (file_id, position) 행을 반환하는 LATERAL 서브쿼리"""
+    if is_bookmark_file_table_available():
+        return """
+            SELECT cbf.file_id, cbf.position
+            FROM corp_bookmark_file cbf
+            WHERE cbf.bookmark_id = f.id
+        """
+    return """
+        SELECT ids.file_id, ids.position
+        FROM jsonb_array_elements_text(f.data::jsonb->'file_ids')
+            WITH ORDINALITY AS ids(file_id, position)
+    """
+
+
+# corp_bookmark.data 의 file_ids 를 관계 테이블 기준으로 다시 만듦 (기존 data 사용처 호환)
+SYNC_BOOKMARK_FILE_IDS_QUERY = """
+    UPDATE corp_bookmark
+    SET
+        data = (
+            SELECT jsonb_build_object('file_ids', jsonb_agg(cbf.file_id ORDER BY cbf.position))
+            FROM corp_bookmark_file cbf
+            WHERE cbf.bookmark_id = corp_bookmark.id
+            HAVING COUNT(*) > 0
+        ),
+        updated_at = now()
+    WHERE id = :id
+    RETURNING data
+"""
+
+
+def lock_bookmark(db, id: str) -> bool:
+    """
+    북마크 행을 잠가 같은 북마크에 대한 파일 추가/삭제를 순서대로 처리
+    (잠금 이후 문장은 먼저 커밋된 변경을 보고 data 를 다시 만듦)
+    """
+    result = db.execute(
+        text("SELECT id FROM corp_bookmark WHERE id = :id FOR UPDATE"), {"id": id}
+    )
+    return result.fetchone() is not None
+
+
+def add_bookmark_file(db, id: str, file_id: str):
+    if not lock_bookmark(db, id):
+        raise HTTPException(status_code=404, detail="Bookmark not found.")
+    db.execute(
+        text(
+            """
+            INSERT INTO corp_bookmark_file (bookmark_id, file_id, position)
+            SELECT :id, :file_id, COALESCE(MAX(position), 0) + 1
+            FROM corp_bookmark_file
+            WHERE bookmark_id = :id
+            ON CONFLICT (bookmark_id, file_id) DO NOTHING
+            """
+        ),
+        {"id": id, "file_id": file_id},
+    )
+    return db.execute(text(SYNC_BOOKMARK_FILE_IDS_QUERY), {"id": id}).scalar()
+
+
+def remove_bookmark_file(db, id: str, file_id: str):
+    if not lock_bookmark(db, id):
+        raise HTTPException(status_code=404, detail="Bookmark not found.")
+    result = db.execute(
+        text(
+            """
+            DELETE FROM corp_bookmark_file
+            WHERE bookmark_id = :id AND file_id = :file_id
+            """
+        ),
+        {"id": id, "file_id": file_id},
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="File ID not found in bookmark.")
+    return db.execute(text(SYNC_BOOKMARK_FILE_IDS_QUERY), {"id": id}).scalar()
+
+
+def reset_bookmark_files(db, id: str) -> list:
+    if not lock_bookmark(db, id):
+        raise HTTPException(status_code=404, detail="Bookmark not found.")
+    result = db.execute(
+        text("DELETE FROM corp_bookmark_file WHERE bookmark_id = :id RETURNING file_id"),
+        {"id": id},
     )
-    for param, index in sorted_params:
-        placeholder = f"${index}"
-        formatted_param = format_parameter(param)
-        executable_query = executable_query.replace(placeholder, formatted_param)
-    return executable_query
+    file_ids = [row[0] for row in result.fetchall()]
+    db.execute(text(SYNC_BOOKMARK_FILE_IDS_QUERY), {"id": id})
+    return file_ids
+
 
 @router.get("/user/{user_id}")
-async def get_mycompanies(user_id: str):
+@db_threadpool
+def get_mycompanies(user_id: str):
     try:
         params = [user_id]
         sql_query = """
@@ -57,11 +257,10 @@ async def get_mycompanies(user_id: str):
             AND (f.is_deleted IS NULL OR f.is_deleted = FALSE)
             ORDER BY f.updated_at DESC
         """
-        favorites = get_executable_query(sql_query, params)
-        log.info(f"Executing query: {favorites}")
+        log.info(f"Executing query: {sql_query} | Parameters: {params}")
 
         with get_db() as db:
-            result = db.execute(text(favorites))
+            result = execute_query(db, sql_query, params)
             bookmarks = [row._mapping for row in result.fetchall()]
 
         return {
@@ -79,7 +278,8 @@ async def get_mycompanies(user_id: str):
 
     
 @router.get("/{id}")
-async def get_mycompany_by_id(id: str, request: Request):
+@db_threadpool
+def get_mycompany_by_id(id: str, request: Request):
     search_params = request.query_params
     user_id = search_params.get("user_id")
     
@@ -88,7 +288,7 @@ async def get_mycompany_by_id(id: str, request: Request):
         #   - WITH 절 사용하여 파일 정보를 미리 필터링
         #   - 필요 없는 LEFT JOIN 제거 (smtp_financial_company, smtp_executives)
         #   - 주석을 추가하여 가독성 향상
-        bookmark_sql_query = """
+        bookmark_sql_query = f"""
         WITH file_data AS (
             -- 파일 정보를 미리 필터링하여 메인 쿼리와 조인
             SELECT 
@@ -106,13 +306,14 @@ async def get_mycompany_by_id(id: str, request: Request):
                     'access_control', fi.access_control
                 ) AS file_info
             FROM (
-                -- 북마크에서 파일 ID만 추출하는 서브쿼리
+                -- 북마크에 연결된 파일 ID만 추출하는 서브쿼리
                 SELECT 
-                    jsonb_array_elements_text(f.data::jsonb->'file_ids') AS file_id
+                    bf.file_id
                 FROM corp_bookmark f
+                CROSS JOIN LATERAL ({get_bookmark_file_ids_query()}) bf
                 WHERE f.id = :id AND (f.is_deleted IS NULL OR f.is_deleted = FALSE)
             ) AS file_ids
-            JOIN file fi ON fi.id::text = file_ids.file_id
+            JOIN file fi ON fi.id = file_ids.file_id
         )
         SELECT DISTINCT
             -- 북마크 기본 정보
@@ -131,76 +332,7 @@ async def get_mycompany_by_id(id: str, request: Request):
                 ELSE NULL 
             END AS files,
             
-            -- 회사 기본 정보
-            rmc.master_id,
-            rmc.company_name,
-            rmc.representative,
-            rmc.postal_code,
-            rmc.address,
-            rmc.phone_number,
-            rmc.fax_number,
-            rmc.website,
-            rmc.email,
-            rmc.business_registration_number,
-            
-            -- 회사 추가 정보
-            rmc.company_type,
-            rmc.establishment_date,
-            rmc.founding_date,
-            rmc.employee_count,
-            rmc.industry_code1,
-            rmc.industry_code2,
-            rmc.industry,
-            rmc.main_product,
-            rmc.main_bank,
-            rmc.main_branch,
-            rmc.group_name,
-            rmc.stock_code,
-            rmc.corporate_number,
-            rmc.english_name,
-            rmc.trade_name,
-            
-            -- 재무 정보
-            rmc.fiscal_month,
-            rmc.sales_year,
-            rmc.recent_sales,
-            rmc.profit_year,
-            rmc.recent_profit,
-            rmc.operating_profit_year,
-            rmc.recent_operating_profit,
-            rmc.asset_year,
-            rmc.recent_total_assets,
-            rmc.debt_year,
-            rmc.recent_total_debt,
-            rmc.equity_year,
-            rmc.recent_total_equity,
-            rmc.capital_year,
-            rmc.recent_capital,
-            
-            -- 지역 및 산업 정보
-            rmc.region1,
-            rmc.region2,
-            rmc.industry_major,
-            rmc.industry_middle,
-            rmc.industry_small,
-            rmc.latitude,
-            rmc.longitude,
-            
-            -- 기타 회사 정보
-            rmc.sme_type,
-            rmc.research_info,
-            rmc.representative_birth,
-            rmc.is_family_shareholder,
-            rmc.is_non_family_shareholder,
-            rmc.financial_statement_year,
-            rmc.total_assets,
-            rmc.total_equity,
-            rmc.net_income,
-            rmc.venture_confirmation_type,
-            rmc.venture_valid_from,
-            rmc.venture_valid_until,
-            rmc.confirming_authority,
-            rmc.new_reconfirmation_code
+            {BOOKMARK_COMPANY_COLUMNS}
         FROM corp_bookmark f
         -- 기업 정보와 조인 (타입 맞추기 위해 ::text 유지)
         JOIN rb_master_company rmc ON f.company_id::text = rmc.master_id::text
@@ -254,24 +386,10 @@ async def get_mycompany_by_id(id: str, request: Request):
             access_control = bookmark_data[0].access_control
             
             if user_id and user_id != bookmark_user_id:
-                
-                if access_control is None:
-                    return {
-                        "success": False,
-                        "error": "권한 없음",
-                        "message": f"Bookmark with id '{id}' 에 대한 접근 권한이 없습니다."
-                    }
-                
-                user_groups = Groups.get_groups_by_member_id(user_id)
-                user_group_ids = [group.id for group in user_groups]
-                
-                write_permission = access_control.get("write", {})
-                permitted_group_ids = write_permission.get("group_ids", [])
-                permitted_user_ids = write_permission.get("user_ids", [])
-                
-                if not (user_id in permitted_user_ids or any(
-                    group_id in permitted_group_ids for group_id in user_group_ids
-                )):
+                user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+                if not has_bookmark_write_access(
+                    user_id, user_group_ids, bookmark_user_id, access_control
+                ):
                     return {
                         "success": False,
                         "error": "권한 없음",
@@ -279,23 +397,12 @@ async def get_mycompany_by_id(id: str, request: Request):
                     }
             
             # Chat List 조회 - 기존 로직 유지
-            conditions = []
-            
             bookmark_owner_id = bookmark_data[0].bookmark_user_id            
             
-            # 항상 북마크 소유자의 채팅을 가져옴
-            conditions.append("user_id = " + format_parameter(bookmark_owner_id))
-            conditions.append("c.business_registration_number = " + format_parameter(bookmark_data[0].business_registration_number))
-            
-            chat_query = "SELECT * FROM chat c WHERE " + " AND ".join(conditions)
-            chat_query = get_executable_query(chat_query, [])
-            
-            # 디버그 레벨에서만 로깅
-            if log.level <= logging.DEBUG:
-                log.debug(f"Chat query: {chat_query}")
-                
-            chat_result = db.execute(text(chat_query))
-            chat_list = [row._mapping for row in chat_result.fetchall()]
+            # 항상 북마크 소유자의 채팅을 가져옴 (목록 표시에 필요한 요약 정보만)
+            chat_list = get_chat_summaries(
+                db, [(bookmark_owner_id, bookmark_data[0].business_registration_number)]
+            )
         
         return {
             "success": True,
@@ -313,9 +420,128 @@ async def get_mycompany_by_id(id: str, request: Request):
         }
 
 
+@router.post("/batch")
+@db_threadpool
+def get_mycompanies_batch(request: Request, user=Depends(get_verified_user)):
+    """
+    여러 북마크의 기업 정보, 파일, 채팅 요약을 두 번의 쿼리로 조회
+    요청: {"ids": [북마크 ID...]}
+    요청 사용자(관리자 제외)가 접근 권한이 없거나 존재하지 않는 북마크는 결과에서 제외
+    """
+    data = read_json_body(request)
+    ids = [str(id) for id in (data.get("ids") or [])]
+    # 관리자는 모든 북마크를 조회할 수 있음
+    user_id = None if user.role == "admin" else user.id
+
+    if not ids:
+        return {"success": True, "data": [], "total": 0}
+
+    try:
+        bookmark_sql_query = f"""
+            SELECT
+                f.id as bookmark_id,
+                f.created_at,
+                f.updated_at,
+                f.company_id,
+                f.user_id as bookmark_user_id,
+                f.folder_id,
+                f.data::jsonb as data_files,
+                f.access_control::jsonb,
+                COALESCE(files.files, '[]'::jsonb) AS files,
+                {BOOKMARK_COMPANY_COLUMNS}
+            FROM corp_bookmark f
+            JOIN rb_master_company rmc ON f.company_id::text = rmc.master_id::text
+            -- 북마크별 파일 추가 순서대로 파일 정보 집계
+            LEFT JOIN LATERAL (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', fi.id,
+                        'user_id', fi.user_id,
+                        'filename', fi.filename,
+                        'meta', fi.meta,
+                        'created_at', fi.created_at,
+                        'hash', fi.hash,
+                        'data', fi."data",
+                        'updated_at', fi.updated_at,
+                        'path', fi."path",
+                        'access_control', fi.access_control
+                    )
+                    ORDER BY file_ids.position
+                ) AS files
+                FROM ({get_bookmark_file_ids_query()}) file_ids
+                JOIN file fi ON fi.id = file_ids.file_id
+            ) files ON true
+            WHERE f.id = ANY(CAST($1 AS text[]))
+            AND (f.is_deleted IS NULL OR f.is_deleted = FALSE)
+            ORDER BY f.updated_at DESC
+        """
+
+        with get_db() as db:
+            result = execute_query(db, bookmark_sql_query, [ids])
+            bookmarks = [dict(row._mapping) for row in result.fetchall()]
+
+            user_group_ids = None
+            accessible = []
+            for bookmark in bookmarks:
+                if user_id and user_id != bookmark["bookmark_user_id"]:
+                    if user_group_ids is None:
+                        user_group_ids = [
+                            group.id for group in Groups.get_groups_by_member_id(user_id)
+                        ]
+                    if not has_bookmark_write_access(
+                        user_id,
+                        user_group_ids,
+                        bookmark["bookmark_user_id"],
+                        bookmark["access_control"],
+                    ):
+                        continue
+                accessible.append(bookmark)
+
+            chats = get_chat_summaries(
+                db,
+                {
+                    (bookmark["bookmark_user_id"], bookmark["business_registration_number"])
+                    for bookmark in accessible
+                },
+            )
+
+        chats_by_owner = {}
+        for chat in chats:
+            chats_by_owner.setdefault(
+                (chat["user_id"], chat["business_registration_number"]), []
+            ).append(chat)
+
+        items = []
+        for bookmark in accessible:
+            chat_list = chats_by_owner.get(
+                (bookmark["bookmark_user_id"], bookmark["business_registration_number"]), []
+            )
+            items.append(
+                {
+                    "bookmark": bookmark,
+                    "files": bookmark.pop("files"),
+                    "chatList": chat_list,
+                    "chat_total": len(chat_list),
+                }
+            )
+
+        return {
+            "success": True,
+            "data": items,
+            "total": len(items),
+        }
+    except Exception as e:
+        log.error(f"Get mycompanies batch error: {str(e)}")
+        return {
+            "success": False,
+            "error": "Fetch failed",
+            "message": str(e)
+        }
+
 
 @router.delete("/{id}/delete")
-async def delete_mycompany(id: str):
+@db_threadpool
+def delete_mycompany(id: str):
     try:
         sql_query = """
         DELETE FROM corp_bookmark
@@ -325,6 +551,7 @@ async def delete_mycompany(id: str):
         with get_db() as db:
             db.execute(text(sql_query), {"id": id})
             db.commit() 
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -339,7 +566,8 @@ async def delete_mycompany(id: str):
         }
     
 @router.put("/{id}/softdelete")
-async def soft_delete_mycompany(id: str):
+@db_threadpool
+def soft_delete_mycompany(id: str):
     try:
         sql_query = """
         UPDATE corp_bookmark
@@ -361,6 +589,7 @@ async def soft_delete_mycompany(id: str):
                 }
                 
             db.commit()
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -375,7 +604,8 @@ async def soft_delete_mycompany(id: str):
         }
 
 @router.put("/{id}/restore")
-async def restore_mycompany(id: str):
+@db_threadpool
+def restore_mycompany(id: str):
     try:
         sql_query = """
         UPDATE corp_bookmark
@@ -397,6 +627,7 @@ async def restore_mycompany(id: str):
                 }
                 
             db.commit()
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -411,9 +642,10 @@ async def restore_mycompany(id: str):
         }
     
 @router.post("/add")
-async def add_mycompany(request: Request):
+@db_threadpool
+def add_mycompany(request: Request):
     try:
-        body = await request.json()
+        body = read_json_body(request)
         user_id = body.get("userId")
         company_id = body.get("companyId")
         business_registration_number = body.get("business_registration_number")
@@ -455,6 +687,7 @@ async def add_mycompany(request: Request):
                         {"id": bookmark_id}
                     )
                     db.commit()
+                    corpsearch_cache.invalidate()
                     
                     return {
                         "success": True,
@@ -494,6 +727,7 @@ async def add_mycompany(request: Request):
                 raise HTTPException(status_code=500, detail="Insertion failed, no ID returned.")
             bookmark_id = row[0]
             db.commit()
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -510,9 +744,10 @@ async def add_mycompany(request: Request):
 
 
 @router.post("/{id}/file/add")
-async def add_file_to_bookmark_by_id(request: Request, id: str):
+@db_threadpool
+def add_file_to_bookmark_by_id(request: Request, id: str):
     try:
-        body = await request.json()
+        body = read_json_body(request)
         file_id = body.get("file_id")
 
         if not file_id:
@@ -529,6 +764,16 @@ async def add_file_to_bookmark_by_id(request: Request, id: str):
         WHERE id = :id
         RETURNING data
         """
+        if is_bookmark_file_table_available():
+            with get_db() as db:
+                add_bookmark_file(db, id, file_id)
+                db.commit()
+            corpsearch_cache.invalidate()
+            return {
+                "success": True,
+                "message": "File successfully added to bookmark."
+            }
+
         log.info(f"Executing query: {check_query} with parameter id={id}")
         with get_db() as db:
             result = db.execute(text(check_query), {"id": id})
@@ -549,6 +794,7 @@ async def add_file_to_bookmark_by_id(request: Request, id: str):
                 {"id": id, "new_data": json.dumps(new_data)}
             )
             db.commit()
+        corpsearch_cache.invalidate()
                         
         return {
             "success": True,
@@ -564,9 +810,10 @@ async def add_file_to_bookmark_by_id(request: Request, id: str):
         }
 
 @router.post("/{id}/file/remove")
-async def remove_file_from_bookmark_by_id(request: Request, id: str):
+@db_threadpool
+def remove_file_from_bookmark_by_id(request: Request, id: str):
     try:
-        body = await request.json()
+        body = read_json_body(request)
         file_id = body.get("file_id")
 
         if not file_id:
@@ -586,6 +833,19 @@ async def remove_file_from_bookmark_by_id(request: Request, id: str):
         delete_file_query = """
         DELETE FROM file WHERE id = :file_id
         """
+        if is_bookmark_file_table_available():
+            with get_db() as db:
+                updated_data = remove_bookmark_file(db, id, file_id)
+                log.info(f"Executing query: {delete_file_query} with parameter file_id={file_id}")
+                db.execute(text(delete_file_query), {"file_id": file_id})
+                db.commit()
+            corpsearch_cache.invalidate()
+            return {
+                "success": True,
+                "data": updated_data,
+                "message": "File successfully removed from bookmark and deleted."
+            }
+
         log.info(f"Executing query: {check_query} with parameter id={id}")
         with get_db() as db:
             result = db.execute(text(check_query), {"id": id})
@@ -618,6 +878,7 @@ async def remove_file_from_bookmark_by_id(request: Request, id: str):
             )
 
             db.commit()
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -633,7 +894,8 @@ async def remove_file_from_bookmark_by_id(request: Request, id: str):
         }
 
 @router.post("/{id}/file/reset")
-async def file_reset_mycompany_by_id(id: str):
+@db_threadpool
+def file_reset_mycompany_by_id(id: str):
     try:
         # corp_bookmark의 data 컬럼 초기화
         check_query = """
@@ -650,6 +912,18 @@ async def file_reset_mycompany_by_id(id: str):
         delete_file_query = """
         DELETE FROM file WHERE id = :file_id
         """
+        if is_bookmark_file_table_available():
+            with get_db() as db:
+                for file_id in reset_bookmark_files(db, id):
+                    log.info(f"Executing query: {delete_file_query} with parameter file_id={file_id}")
+                    db.execute(text(delete_file_query), {"file_id": file_id})
+                db.commit()
+            corpsearch_cache.invalidate()
+            return {
+                "success": True,
+                "message": f"All files reset and removed for bookmark {id}."
+            }
+
         log.info(f"Executing query: {check_query} with parameter id={id}")
         with get_db() as db:
             result = db.execute(text(check_query), {"id": id})
@@ -669,6 +943,7 @@ async def file_reset_mycompany_by_id(id: str):
                 db.commit()
             else:
                 raise HTTPException(status_code=404, detail="Bookmark not found.")
+        corpsearch_cache.invalidate()
 
         return {
             "success": True,
@@ -683,7 +958,8 @@ async def file_reset_mycompany_by_id(id: str):
         }
 
 @router.get("/{id}/accessControl/users")
-async def get_access_control_users(id: str, request: Request):
+@db_threadpool
+def get_access_control_users(id: str, request: Request):
     try:
         with get_db() as db:
             # bookmark의 access_control 필드를 조회
@@ -708,7 +984,8 @@ async def get_access_control_users(id: str, request: Request):
         return {"success": False, "error": "Get users failed", "message": str(e)}
 
 @router.post("/{id}/accessControl/addUser")
-async def add_user_access_control(id: str, request: Request):
+@db_threadpool
+def add_user_access_control(id: str, request: Request):
     try:
         search_params = request.query_params
         user_id = search_params.get("user_id")
@@ -758,7 +1035,8 @@ async def add_user_access_control(id: str, request: Request):
 
 
 @router.post("/{id}/accessControl/removeUser")
-async def remove_user_access_control(id: str, request: Request):
+@db_threadpool
+def remove_user_access_control(id: str, request: Request):
     try:
         search_params = request.query_params
         user_id = search_params.get("user_id")
@@ -810,7 +1088,8 @@ async def remove_user_access_control(id: str, request: Request):
         } 
 
 @router.post("/{id}/accessControl")
-async def update_access_control(id: str, request: Request):
+@db_threadpool
+def update_access_control(id: str, request: Request):
     """
     북마크의 액세스 컨트롤 설정을 업데이트합니다.
     
@@ -834,7 +1113,7 @@ async def update_access_control(id: str, request: Request):
     }
     """
     try:
-        body = await request.json()
+        body = read_json_body(request)
         access_control = body.get("access_control")
         
         log.info(f"Updating access control for bookmark {id}: {access_control}")
@@ -895,8 +1174,9 @@ async def update_access_control(id: str, request: Request):
         }
     
 @router.post("/move")
-async def moveBookmark(request: Request):
-    data = await request.json()
+@db_threadpool
+def moveBookmark(request: Request):
+    data = read_json_body(request)
     userId = request.query_params.get("userId")
     bookmarkId = data.get("bookmarkId")
     targetFolderId = data.get("targetFolderId")
@@ -947,7 +1227,8 @@ async def moveBookmark(request: Request):
         )
 
 @router.get("/user/find-by-email/{email}")
-async def find_user_by_email(email: str, request: Request):
+@db_threadpool
+def find_user_by_email(email: str, request: Request):
     try:
         # Users 모델을 사용하여 이메일로 사용자 조회
         user = Users.get_user_by_email(email.lower())
@@ -976,7 +1257,8 @@ async def find_user_by_email(email: str, request: Request):
         }
 
 @router.get("/user/find-by-id/{user_id}")
-async def find_user_by_id(user_id: str, request: Request):
+@db_threadpool
+def find_user_by_id(user_id: str, request: Request):
     try:
         # Users 모델을 사용하여 ID로 사용자 조회
         user = Users.get_user_by_id(user_id)
@@ -1005,7 +1287,8 @@ async def find_user_by_id(user_id: str, request: Request):
         }
 
 @router.post("/{chat_id}/share")
-async def update_share_id_for_chat(chat_id: str, request: Request):
+@db_threadpool
+def update_share_id_for_chat(chat_id: str, request: Request):
     """
     채팅 공유 ID를 생성하거나 기존 공유 ID를 반환합니다.
     """
@@ -1047,7 +1330,8 @@ async def update_share_id_for_chat(chat_id: str, request: Request):
         }
 
 @router.get("/s/{share_id}")
-async def get_chat_by_share_id(share_id: str, request: Request):
+@db_threadpool
+def get_chat_by_share_id(share_id: str, request: Request):
     """
     공유 ID를 사용하여 채팅을 조회합니다.
     """
@@ -1070,6 +1354,11 @@ async def get_chat_by_share_id(share_id: str, request: Request):
                 }
             
             chat = dict(chat_data._mapping)
+
+        # chat JSON 의 history.messages 는 chat_message 테이블에 저장되어 있으므로 다시 채움
+        chat_model = Chats.get_chat_by_id(chat["id"])
+        if chat_model:
+            chat["chat"] = chat_model.chat
             
         return {
             "success": True,
@@ -1084,12 +1373,13 @@ async def get_chat_by_share_id(share_id: str, request: Request):
         }
 
 @router.post("/company/add")
-async def add_private_entity_info(request: Request):
+@db_threadpool
+def add_private_entity_info(request: Request):
     """
     기업 정보를 private_entity_info 테이블에 저장합니다.
     """
     try:
-        data = await request.json()
+        data = read_json_body(request)
         company_data = data.get("company_data", {})
         customer_data = data.get("customer_data", {})
         folder_id = data.get("folder_id")
@@ -1211,6 +1501,8 @@ async def add_private_entity_info(request: Request):
                     log.info(f"Added company to bookmark with id: {bookmark_row[0]}")
         
             db.commit()
+            if folder_id:
+                corpsearch_cache.invalidate()
                 
             return {
                 "success": True,
@@ -1231,12 +1523,13 @@ async def add_private_entity_info(request: Request):
         }
 
 @router.get("/private/{id}")
-async def get_private_company_by_id(id: str, request: Request):
+@db_threadpool
+def get_private_company_by_id(id: str, request: Request):
     search_params = request.query_params
     user_id = search_params.get("user_id")
     
     try:
-        bookmark_sql_query = """
+        bookmark_sql_query = f"""
         SELECT DISTINCT
             f.id as bookmark_id,
             f.created_at,
@@ -1299,10 +1592,8 @@ async def get_private_company_by_id(id: str, request: Request):
             'private' as company_type
         FROM corp_bookmark f
         INNER JOIN private_entity_info pci ON f.business_registration_number::text = pci.business_registration_number::text
-        LEFT JOIN file fi
-            ON fi.id::text = ANY(ARRAY(
-                SELECT jsonb_array_elements_text(f.data::jsonb->'file_ids')
-            ))
+        LEFT JOIN LATERAL ({get_bookmark_file_ids_query()}) bf ON true
+        LEFT JOIN file fi ON fi.id = bf.file_id
         WHERE f.id = :id
         AND (f.is_deleted IS NULL OR f.is_deleted = FALSE)           
         GROUP BY
@@ -1369,24 +1660,10 @@ async def get_private_company_by_id(id: str, request: Request):
             access_control = bookmark_data[0].access_control
             
             if user_id and user_id != bookmark_user_id:
-                
-                if access_control is None:
-                    return {
-                        "success": False,
-                        "error": "권한 없음",
-                        "message": f"Bookmark with id '{id}' 에 대한 접근 권한이 없습니다."
-                    }
-                
-                user_groups = Groups.get_groups_by_member_id(user_id)
-                user_group_ids = [group.id for group in user_groups]
-                
-                write_permission = access_control.get("write", {})
-                permitted_group_ids = write_permission.get("group_ids", [])
-                permitted_user_ids = write_permission.get("user_ids", [])
-                
-                if not (user_id in permitted_user_ids or any(
-                    group_id in permitted_group_ids for group_id in user_group_ids
-                )):
+                user_group_ids = [group.id for group in Groups.get_groups_by_member_id(user_id)]
+                if not has_bookmark_write_access(
+                    user_id, user_group_ids, bookmark_user_id, access_control
+                ):
                     return {
                         "success": False,
                         "error": "권한 없음",
@@ -1394,24 +1671,13 @@ async def get_private_company_by_id(id: str, request: Request):
                     }
             
             # Chat List 조회
-            conditions = []
-            
             bookmark_owner_id = bookmark_data[0].bookmark_user_id            
             
-            # 항상 북마크 소유자의 채팅을 가져옴
-            conditions.append("user_id = " + format_parameter(bookmark_owner_id))
-            conditions.append("c.business_registration_number = " + format_parameter(bookmark_data[0].business_registration_number))
-            
-            chat_query = "SELECT * FROM chat c WHERE " + " AND ".join(conditions)
-            chat_query = get_executable_query(chat_query, [])
-            
-            if log.level <= logging.DEBUG:
-                log.debug(f"Chat query: {chat_query}")
-            else:
-                log.info(f"Executing chat query for bookmark_id={id}")
-                
-            chat_result = db.execute(text(chat_query))
-            chat_list = [row._mapping for row in chat_result.fetchall()]
+            # 항상 북마크 소유자의 채팅을 가져옴 (목록 표시에 필요한 요약 정보만)
+            log.info(f"Executing chat query for bookmark_id={id}")
+            chat_list = get_chat_summaries(
+                db, [(bookmark_owner_id, bookmark_data[0].business_registration_number)]
+            )
         
         return {
             "success": True,
@@ -1429,12 +1695,13 @@ async def get_private_company_by_id(id: str, request: Request):
         }
 
 @router.put("/company/update")
-async def update_private_entity_info(request: Request):
+@db_threadpool
+def update_private_entity_info(request: Request):
     """
     기업 정보를 private_entity_info 테이블에서 업데이트합니다.
     """
     try:
-        data = await request.json()
+        data = read_json_body(request)
         company_data = data.get("company_data", {})
         business_registration_number = data.get("business_registration_number")
         
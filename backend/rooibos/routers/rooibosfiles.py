@@ -22,6 +22,7 @@ from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from rooibos.utils.threadpool import db_threadpool
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -39,7 +40,8 @@ class FilenameForm(BaseModel):
 ############################
 
 @router.post("/{id}/filename/update")
-async def update_file_filename_by_id(
+@db_threadpool
+def update_file_filename_by_id(
     id: str, form_data: FilenameForm, user=Depends(get_verified_user)
 ):
     try:
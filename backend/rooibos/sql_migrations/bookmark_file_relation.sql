@@ -0,0 +1,48 @@
+-- 북마크-파일 관계 테이블 생성 스크립트
+-- 목적: corp_bookmark.data 의 file_ids JSON 배열을 읽고/수정해 통째로 다시 쓰던 방식을
+--       corp_bookmark_file 관계 테이블로 대체 (동시 업로드 시 file_ids 유실 방지, 인덱스 조인)
+-- 사용: 테이블이 있으면 mycompanies 가 자동으로 관계 테이블을 사용 (없으면 기존 JSON 방식 유지)
+--       corp_bookmark.data 의 file_ids 는 호환성을 위해 관계 테이블 기준으로 계속 갱신됨
+
+-- 1. 관계 테이블 (corp_bookmark.id 와 같은 타입으로 생성)
+DO $$
+DECLARE
+    bookmark_id_type text;
+BEGIN
+    SELECT format_type(a.atttypid, a.atttypmod) INTO bookmark_id_type
+    FROM pg_attribute a
+    WHERE a.attrelid = 'corp_bookmark'::regclass AND a.attname = 'id';
+
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS corp_bookmark_file (
+            bookmark_id %s NOT NULL REFERENCES corp_bookmark(id) ON DELETE CASCADE,
+            file_id text NOT NULL REFERENCES file(id) ON DELETE CASCADE,
+            position integer NOT NULL DEFAULT 0,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (bookmark_id, file_id)
+        )',
+        bookmark_id_type
+    );
+END
+$$;
+
+-- 2. 북마크별 파일 목록 조회 (추가 순서)
+CREATE INDEX IF NOT EXISTS idx_corp_bookmark_file_bookmark_position
+    ON corp_bookmark_file(bookmark_id, position);
+
+-- 3. 파일 삭제 시 관계 정리 (ON DELETE CASCADE) 및 파일 기준 조회
+CREATE INDEX IF NOT EXISTS idx_corp_bookmark_file_file_id
+    ON corp_bookmark_file(file_id);
+
+-- 4. 기존 file_ids JSON 배열 이관 (존재하는 파일만, 기존 순서 유지)
+INSERT INTO corp_bookmark_file (bookmark_id, file_id, position)
+SELECT cb.id, ids.file_id, ids.position
+FROM corp_bookmark cb
+CROSS JOIN LATERAL jsonb_array_elements_text(cb.data::jsonb->'file_ids')
+    WITH ORDINALITY AS ids(file_id, position)
+JOIN file fi ON fi.id = ids.file_id
+WHERE cb.data IS NOT NULL
+ON CONFLICT (bookmark_id, file_id) DO NOTHING;
+
+-- 통계 갱신 명령
+ANALYZE corp_bookmark_file;
@@ -0,0 +1,97 @@
+-- 기업별 연도별 재무 요약 테이블 생성 스크립트
+-- 목적: corpsearch 재무정보(financialData)/상세 조회가 매 요청마다 회사명으로
+--       smtp_financial_company, smtp_financial_data 를 조인하고 연도별 ROW_NUMBER() 를
+--       계산하지 않도록, master_id 기준으로 미리 계산한 결과를 저장
+-- 사용: 테이블이 있으면 corpsearch 가 자동으로 요약 테이블을 조회 (없으면 기존 조인 방식 유지)
+--       데이터는 애플리케이션의 갱신 작업(FINANCIAL_SUMMARY_REFRESH_INTERVAL)이 채우고 갱신함
+--       (rooibos/utils/financial_summary.py, 테이블이 비어 있으면 시작 시 바로 전체 갱신)
+
+-- 1. 요약 테이블 (원본과 동일한 컬럼 타입을 사용하도록 CREATE TABLE AS ... WITH NO DATA)
+-- is_latest: 기업별 가장 최근 연도 행 여부
+CREATE TABLE IF NOT EXISTS rb_company_financial_summary AS
+    SELECT
+        rmc.master_id,
+        sfd.financial_company_id,
+        sfd.year,
+        sfd.revenue,
+        sfd.net_income,
+        sfd.operating_income,
+        sfd.total_assets,
+        sfd.total_liabilities,
+        sfd.total_equity,
+        sfd.capital_stock,
+        sfd.corporate_tax,
+        sfd.current_assets,
+        sfd.quick_assets,
+        sfd.inventory,
+        sfd.non_current_assets,
+        sfd.investment_assets,
+        sfd.tangible_assets,
+        sfd.intangible_assets,
+        sfd.current_liabilities,
+        sfd.non_current_liabilities,
+        sfd.retained_earnings,
+        sfd.profit,
+        sfd.sales_cost,
+        sfd.sales_profit,
+        sfd.sga,
+        sfd.other_income,
+        sfd.other_expenses,
+        sfd.pre_tax_income,
+        TRUE AS is_latest,
+        now() AS refreshed_at
+    FROM rb_master_company rmc
+    JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+    JOIN smtp_financial_data sfd ON sfc.id = sfd.financial_company_id
+    WITH NO DATA;
+
+-- 2. 기본키: 기업/연도별 1행 (financialData 조회, 갱신 시 ON CONFLICT 대상)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rb_company_financial_summary_master_year
+    ON rb_company_financial_summary(master_id, year);
+
+-- 3. 최신 연도 행 조회 (상세 조회의 자기자본 등)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rb_company_financial_summary_latest
+    ON rb_company_financial_summary(master_id)
+    WHERE is_latest;
+
+-- 4. 최신 연도 매출/영업이익/자기자본 범위 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_rb_company_financial_summary_latest_revenue
+    ON rb_company_financial_summary(revenue)
+    WHERE is_latest;
+
+CREATE INDEX IF NOT EXISTS idx_rb_company_financial_summary_latest_operating_income
+    ON rb_company_financial_summary(operating_income)
+    WHERE is_latest;
+
+CREATE INDEX IF NOT EXISTS idx_rb_company_financial_summary_latest_total_equity
+    ON rb_company_financial_summary(total_equity)
+    WHERE is_latest;
+
+-- 5. 갱신 작업의 회사명 조인용 인덱스
+CREATE INDEX IF NOT EXISTS idx_smtp_financial_company_company_name
+    ON smtp_financial_company(company_name);
+
+CREATE INDEX IF NOT EXISTS idx_smtp_financial_data_financial_company_id
+    ON smtp_financial_data(financial_company_id, year);
+
+-- 6. corpsearch 매출/이익/순이익/직원수 범위 필터((컬럼)::numeric 비교)용 표현식 인덱스
+-- 검색 쿼리의 공통 조건과 동일한 부분 인덱스로 만들어 인덱스 크기를 줄임
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_recent_sales_numeric
+    ON rb_master_company(((recent_sales)::numeric))
+    WHERE company_type != '개인' AND latitude IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_recent_profit_numeric
+    ON rb_master_company(((recent_profit)::numeric))
+    WHERE company_type != '개인' AND latitude IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_net_income_numeric
+    ON rb_master_company(((net_income)::numeric))
+    WHERE company_type != '개인' AND latitude IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_employee_count_numeric
+    ON rb_master_company(((employee_count)::numeric))
+    WHERE company_type != '개인' AND latitude IS NOT NULL;
+
+-- 통계 갱신 명령
+ANALYZE rb_company_financial_summary;
+ANALYZE rb_master_company;
@@ -0,0 +1,16 @@
+-- 장소/주소 검색 결과 캐시 테이블 생성 스크립트
+-- 목적: Redis 없이 운영할 때도 네이버 장소/주소 검색 결과를 재시작 후에도 유지하고 워커 간 공유
+--       (프로세스 내 캐시는 워커별로 따로 채워지고 재시작하면 사라짐)
+-- 사용: 테이블이 있으면 corpsearch 가 자동으로 결과를 저장/조회 (없으면 기존 캐시만 사용)
+--       GEOCODE_CACHE_TTL 이 지난 행은 조회하지 않으며, 새 결과를 저장할 때 함께 삭제됨
+
+-- 1. 캐시 테이블 (정규화한 검색어 기준)
+CREATE TABLE IF NOT EXISTS rb_geocode_cache (
+    query text PRIMARY KEY,
+    result jsonb NOT NULL,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- 2. 만료된 결과 정리
+CREATE INDEX IF NOT EXISTS idx_rb_geocode_cache_updated_at
+    ON rb_geocode_cache(updated_at);
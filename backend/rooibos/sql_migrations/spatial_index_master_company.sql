@@ -0,0 +1,39 @@
+-- 기업 검색 반경 조회를 위한 공간 인덱스 생성 스크립트
+-- 목적: corpsearch 반경 검색/거리순 정렬이 rb_master_company 전체를 스캔하지 않도록 개선
+-- 사용: CORPSEARCH_SPATIAL_INDEX=auto (기본값) 이면 geog 컬럼 존재 여부로 검색 방식을 자동 선택
+
+-- 1. 위경도 bounding box 사전 필터용 복합 인덱스 (PostGIS 없이도 사용)
+-- 검색 쿼리의 공통 조건과 동일한 부분 인덱스로 만들어 인덱스 크기를 줄임
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_latitude_longitude
+    ON rb_master_company(latitude, longitude)
+    WHERE company_type != '개인' AND latitude IS NOT NULL;
+
+-- 2. PostGIS 를 사용할 수 있는 경우 geography 컬럼 + GiST 인덱스 생성
+-- ST_DWithin 반경 검색과 KNN(<->) 거리순 정렬에 사용
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'postgis') THEN
+        CREATE EXTENSION IF NOT EXISTS postgis;
+
+        ALTER TABLE rb_master_company
+            ADD COLUMN IF NOT EXISTS geog geography(Point, 4326)
+            GENERATED ALWAYS AS (
+                CASE
+                    WHEN latitude IS NOT NULL AND longitude IS NOT NULL
+                    THEN ST_SetSRID(
+                        ST_MakePoint(longitude::double precision, latitude::double precision),
+                        4326
+                    )::geography
+                END
+            ) STORED;
+
+        CREATE INDEX IF NOT EXISTS idx_rb_master_company_geog
+            ON rb_master_company USING GIST (geog);
+    ELSE
+        RAISE NOTICE 'PostGIS 확장을 사용할 수 없어 bounding box 인덱스만 생성합니다.';
+    END IF;
+END
+$$;
+
+-- 통계 갱신 명령
+ANALYZE rb_master_company;
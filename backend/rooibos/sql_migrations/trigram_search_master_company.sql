@@ -0,0 +1,29 @@
+-- 기업 검색어(회사명/대표자/주소/사업자등록번호) 검색을 위한 trigram 인덱스 생성 스크립트
+-- 목적: corpsearch 의 ILIKE '%검색어%' 조건이 rb_master_company 전체를 스캔하지 않도록 개선
+-- 사용: CORPSEARCH_TEXT_SEARCH=auto (기본값) 이면 idx_rb_master_company_name_trgm 인덱스
+--       존재 여부로 trigram 검색 모드를 자동 선택 (SQLite 등에서는 기존 방식 유지)
+-- 참고: 한글 trigram 추출은 DB 의 LC_CTYPE 이 UTF-8 로케일(예: ko_KR.UTF-8, C.UTF-8)이어야 동작함
+--       2글자 이하 검색어는 trigram 이 만들어지지 않아 인덱스 효과가 제한적임
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 1. ILIKE '%검색어%' 를 처리하는 GIN trigram 인덱스
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_name_trgm
+    ON rb_master_company USING GIN (company_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_representative_trgm
+    ON rb_master_company USING GIN (representative gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_address_trgm
+    ON rb_master_company USING GIN (address gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_brn_trgm
+    ON rb_master_company USING GIN (business_registration_number gin_trgm_ops);
+
+-- 2. 사업자등록번호 앞자리 검색용 인덱스 (하이픈 등 숫자 외 문자를 제거한 값 기준)
+-- regexp_replace(...) LIKE '1234%' 형태의 접두어 검색을 btree 범위 검색으로 처리
+CREATE INDEX IF NOT EXISTS idx_rb_master_company_brn_digits
+    ON rb_master_company ((regexp_replace(business_registration_number, '[^0-9]', '', 'g')) text_pattern_ops);
+
+-- 통계 갱신 명령
+ANALYZE rb_master_company;
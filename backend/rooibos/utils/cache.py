@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import anyio.to_thread
+from fastapi.encoders import jsonable_encoder
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+from rooibos.config_extension import (
+    CORPSEARCH_CACHE_TTL,
+    CORPSEARCH_CACHE_MAXSIZE,
+    CORPSEARCH_CACHE_REDIS_URL,
+    CORPSEARCH_CACHE_REDIS_SENTINEL_HOSTS,
+    CORPSEARCH_CACHE_REDIS_SENTINEL_PORT,
+    GEOCODE_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    캐시 키를 생성합니다. dict/list 는 키 순서와 무관하게 동일한 키가 되도록 정규화합니다.
+    """
+    normalized = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """
+    TTL 과 최대 크기를 갖는 결과 캐시.
+
+    redis_url 이 주어지면 Redis 에 저장하여 모든 워커가 같은 캐시를 공유하고,
+    그렇지 않으면 프로세스 내 LRU 캐시를 사용합니다.
+    invalidate() 는 세대(generation) 값을 올려 이전 세대의 항목을 모두 무효화합니다.
+    Redis 항목은 TTL 로 만료되므로 오래된 세대의 키는 자연히 정리됩니다.
+    Redis 에서도 maxsize 를 지키기 위해 저장 시각 순 인덱스(sorted set)를 두고,
+    넘치면 가장 먼저 저장된 항목부터 제거합니다.
+
+    Redis 호출은 동기(blocking)이므로 async 핸들러에서는 aget()/aset() 을 사용합니다.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int,
+        maxsize: int,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self._redis = None
+        if redis_url:
+            try:
+                self._redis = get_redis_connection(
+                    redis_url, redis_sentinels, decode_responses=True
+                )
+            except Exception as e:
+                log.error(f"Failed to connect cache '{namespace}' to Redis: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.namespace}:entry:{key}"
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    def _index_key(self) -> str:
+        return f"{self.namespace}:index"
+
+    def generation(self) -> int:
+        """
+        현재 세대 값을 반환합니다. 조회 전에 읽어 set() 에 넘기면
+        조회 도중 발생한 무효화가 캐시에 반영되지 않는 문제를 막을 수 있습니다.
+        """
+        if self._redis:
+            try:
+                return int(self._redis.get(self._generation_key()) or 0)
+            except Exception as e:
+                log.warning(f"Cache '{self.namespace}' generation lookup failed: {e}")
+                return -1
+        return self._generation
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        if self._redis:
+            try:
+                generation, raw = self._redis.mget(
+                    self._generation_key(), self._entry_key(key)
+                )
+            except Exception as e:
+                log.warning(f"Cache '{self.namespace}' get failed: {e}")
+                return None
+
+            if raw is None:
+                return None
+            entry = json.loads(raw)
+            if entry.get("generation") != int(generation or 0):
+                return None
+            return entry.get("value")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, generation, value = entry
+            if expires_at <= time.monotonic() or generation != self._generation:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None):
+        if not self.enabled:
+            return
+        if generation is None:
+            generation = self.generation()
+        if generation < 0:
+            # 세대 값을 알 수 없으면 무효화 여부를 보장할 수 없으므로 저장하지 않음
+            return
+
+        # 응답과 같은 형태(Decimal, datetime 등 변환)로 저장
+        value = jsonable_encoder(value)
+
+        if self._redis:
+            try:
+                self._redis_set(key, generation, value)
+            except Exception as e:
+                log.warning(f"Cache '{self.namespace}' set failed: {e}")
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+
+            # 만료된 항목을 먼저 정리하고, 그래도 넘치면 가장 오래된 항목부터 제거
+            if len(self._entries) > self.maxsize:
+                now = time.monotonic()
+                for k in [k for k, e in self._entries.items() if e[0] <= now]:
+                    del self._entries[k]
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _redis_set(self, key: str, generation: int, value: Any):
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.set(
+            self._entry_key(key),
+            json.dumps({"generation": generation, "value": value}, ensure_ascii=False),
+            ex=self.ttl,
+        )
+        # 인덱스에서 만료된 항목을 정리한 뒤 크기 확인
+        pipe.zadd(self._index_key(), {key: now})
+        pipe.zremrangebyscore(self._index_key(), "-inf", now - self.ttl)
+        pipe.expire(self._index_key(), self.ttl)
+        pipe.zcard(self._index_key())
+        size = pipe.execute()[-1]
+
+        if size > self.maxsize:
+            evicted = self._redis.zpopmin(self._index_key(), size - self.maxsize)
+            if evicted:
+                self._redis.delete(*[self._entry_key(k) for k, _ in evicted])
+
+    async def aget(self, key: str) -> Optional[Any]:
+        if self._redis:
+            return await anyio.to_thread.run_sync(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, generation: Optional[int] = None):
+        if self._redis:
+            return await anyio.to_thread.run_sync(self.set, key, value, generation)
+        return self.set(key, value, generation)
+
+    def invalidate(self):
+        if self._redis:
+            try:
+                self._redis.incr(self._generation_key())
+            except Exception as e:
+                log.error(f"Cache '{self.namespace}' invalidation failed: {e}")
+
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+_redis_sentinels = get_sentinels_from_env(
+    CORPSEARCH_CACHE_REDIS_SENTINEL_HOSTS, CORPSEARCH_CACHE_REDIS_SENTINEL_PORT
+)
+
+# 기업 검색 결과 캐시 (북마크 변경 시 무효화)
+corpsearch_cache = TTLCache(
+    "rooibos:corpsearch",
+    ttl=CORPSEARCH_CACHE_TTL,
+    maxsize=CORPSEARCH_CACHE_MAXSIZE,
+    redis_url=CORPSEARCH_CACHE_REDIS_URL,
+    redis_sentinels=_redis_sentinels,
+)
+
+# 재무 데이터 캐시 (북마크와 무관)
+financial_data_cache = TTLCache(
+    "rooibos:financial_data",
+    ttl=CORPSEARCH_CACHE_TTL,
+    maxsize=CORPSEARCH_CACHE_MAXSIZE,
+    redis_url=CORPSEARCH_CACHE_REDIS_URL,
+    redis_sentinels=_redis_sentinels,
+)
+
+# 네이버 장소/주소 검색 결과 캐시 (역 이름, 주소는 사용자 간에 반복되므로 길게 유지)
+geocode_cache = TTLCache(
+    "rooibos:geocode",
+    ttl=GEOCODE_CACHE_TTL,
+    maxsize=CORPSEARCH_CACHE_MAXSIZE,
+    redis_url=CORPSEARCH_CACHE_REDIS_URL,
+    redis_sentinels=_redis_sentinels,
+)
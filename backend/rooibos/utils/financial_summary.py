@@ -0,0 +1,241 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.internal.db import engine, get_db
+from rooibos.config_extension import (
+    FINANCIAL_SUMMARY_BATCH_SIZE,
+    FINANCIAL_SUMMARY_REFRESH_INTERVAL,
+)
+from rooibos.utils.cache import corpsearch_cache, financial_data_cache
+from rooibos.utils.query import execute_query
+from rooibos.utils.threadpool import run_in_db_threadpool
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
+
+####################
+# Financial summary (rb_company_financial_summary)
+#
+# smtp_financial_data 를 기업(master_id)/연도별 1행으로 정리한 요약 테이블을 갱신한다.
+# 테이블과 인덱스는 sql_migrations/financial_summary_company.sql 로 생성한다.
+# master_id 묶음 단위로 갱신하며, 값이 바뀐 행만 다시 쓴다.
+####################
+
+FINANCIAL_COLUMNS = [
+    "revenue",
+    "net_income",
+    "operating_income",
+    "total_assets",
+    "total_liabilities",
+    "total_equity",
+    "capital_stock",
+    "corporate_tax",
+    "current_assets",
+    "quick_assets",
+    "inventory",
+    "non_current_assets",
+    "investment_assets",
+    "tangible_assets",
+    "intangible_assets",
+    "current_liabilities",
+    "non_current_liabilities",
+    "retained_earnings",
+    "profit",
+    "sales_cost",
+    "sales_profit",
+    "sga",
+    "other_income",
+    "other_expenses",
+    "pre_tax_income",
+]
+
+# 여러 워커가 동시에 전체 갱신을 수행하지 않도록 잡는 advisory lock 키
+_REFRESH_LOCK_KEY = 7305100
+
+_VALUE_COLUMNS = ["financial_company_id", *FINANCIAL_COLUMNS, "is_latest"]
+
+# 기존 financialData 쿼리의 ROW_NUMBER() OVER (PARTITION BY year ORDER BY financial_company_id) = 1
+# 과 같은 기준으로 기업/연도별 1행을 선택
+_REFRESH_QUERY = f"""
+    WITH src AS (
+        SELECT
+            ranked.*,
+            ranked.year = MAX(ranked.year) OVER (PARTITION BY ranked.master_id) AS is_latest
+        FROM (
+            SELECT DISTINCT ON (rmc.master_id, sfd.year)
+                rmc.master_id,
+                sfd.financial_company_id,
+                sfd.year,
+                {", ".join(f"sfd.{column}" for column in FINANCIAL_COLUMNS)}
+            FROM rb_master_company rmc
+            JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+            JOIN smtp_financial_data sfd ON sfc.id = sfd.financial_company_id
+            WHERE rmc.master_id = ANY($1)
+            ORDER BY rmc.master_id, sfd.year, sfd.financial_company_id
+        ) ranked
+    ),
+    removed AS (
+        DELETE FROM rb_company_financial_summary s
+        WHERE s.master_id = ANY($1)
+        AND NOT EXISTS (
+            SELECT 1 FROM src WHERE src.master_id = s.master_id AND src.year = s.year
+        )
+    )
+    INSERT INTO rb_company_financial_summary (
+        master_id, year, {", ".join(_VALUE_COLUMNS)}, refreshed_at
+    )
+    SELECT master_id, year, {", ".join(_VALUE_COLUMNS)}, now()
+    FROM src
+    ON CONFLICT (master_id, year) DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in _VALUE_COLUMNS)},
+        refreshed_at = EXCLUDED.refreshed_at
+    WHERE ({", ".join(f"rb_company_financial_summary.{column}" for column in _VALUE_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"EXCLUDED.{column}" for column in _VALUE_COLUMNS)})
+"""
+
+_FIRST_BATCH_QUERY = """
+    SELECT DISTINCT rmc.master_id
+    FROM rb_master_company rmc
+    JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+    ORDER BY rmc.master_id
+    LIMIT $1
+"""
+
+_NEXT_BATCH_QUERY = """
+    SELECT DISTINCT rmc.master_id
+    FROM rb_master_company rmc
+    JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+    WHERE rmc.master_id > $1
+    ORDER BY rmc.master_id
+    LIMIT $2
+"""
+
+# 재무 데이터가 더 이상 연결되지 않는 기업(회사명 변경 등)의 행 정리
+_CLEANUP_QUERY = """
+    DELETE FROM rb_company_financial_summary s
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM rb_master_company rmc
+        JOIN smtp_financial_company sfc ON rmc.company_name = sfc.company_name
+        WHERE rmc.master_id = s.master_id
+    )
+"""
+
+
+def is_financial_summary_table_present() -> bool:
+    with get_db() as db:
+        if db.bind.dialect.name != "postgresql":
+            return False
+        return (
+            db.execute(
+                text("SELECT to_regclass('rb_company_financial_summary')")
+            ).scalar()
+            is not None
+        )
+
+
+def refresh_financial_summary_batch(master_ids: list) -> int:
+    """지정한 기업들의 요약 행을 갱신하고 변경된 행 수를 반환"""
+    if not master_ids:
+        return 0
+
+    with get_db() as db:
+        result = execute_query(db, _REFRESH_QUERY, [list(master_ids)])
+        db.commit()
+    return result.rowcount
+
+
+def invalidate_financial_caches():
+    financial_data_cache.invalidate()
+    # 상세 조회 응답에도 최신 자기자본이 포함됨
+    corpsearch_cache.invalidate()
+
+
+def refresh_financial_summary(master_ids: Optional[list] = None) -> Optional[int]:
+    """
+    master_ids 를 지정하면 해당 기업만, 없으면 전체를 FINANCIAL_SUMMARY_BATCH_SIZE 단위로 갱신.
+    다른 워커가 갱신 중이면 건너뛰고 None 을 반환
+    """
+    if master_ids is not None:
+        updated = refresh_financial_summary_batch(master_ids)
+        if updated:
+            invalidate_financial_caches()
+        return updated
+
+    # 세션 단위 advisory lock 은 같은 커넥션에서 해제해야 하므로 별도 커넥션에서 잡음
+    with engine.connect() as lock_connection:
+        locked = lock_connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": _REFRESH_LOCK_KEY}
+        ).scalar()
+        if not locked:
+            log.info("Financial summary refresh already running elsewhere, skipping")
+            return None
+
+        try:
+            updated = 0
+            last_master_id = None
+            while True:
+                with get_db() as db:
+                    if last_master_id is None:
+                        result = execute_query(
+                            db, _FIRST_BATCH_QUERY, [FINANCIAL_SUMMARY_BATCH_SIZE]
+                        )
+                    else:
+                        result = execute_query(
+                            db,
+                            _NEXT_BATCH_QUERY,
+                            [last_master_id, FINANCIAL_SUMMARY_BATCH_SIZE],
+                        )
+                    batch = [row[0] for row in result.fetchall()]
+
+                if not batch:
+                    break
+
+                updated += refresh_financial_summary_batch(batch)
+                last_master_id = batch[-1]
+
+            with get_db() as db:
+                updated += execute_query(db, _CLEANUP_QUERY, prepare=False).rowcount
+                db.commit()
+
+            if updated:
+                invalidate_financial_caches()
+            log.info(f"Financial summary refreshed, {updated} rows changed")
+            return updated
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": _REFRESH_LOCK_KEY}
+            )
+
+
+def is_financial_summary_empty() -> bool:
+    with get_db() as db:
+        return (
+            db.execute(
+                text("SELECT 1 FROM rb_company_financial_summary LIMIT 1")
+            ).first()
+            is None
+        )
+
+
+async def periodic_financial_summary_refresh():
+    """요약 테이블이 있으면 FINANCIAL_SUMMARY_REFRESH_INTERVAL 마다 전체 갱신 (비어 있으면 즉시)"""
+    try:
+        if not await run_in_db_threadpool(is_financial_summary_table_present):
+            return
+        if not await run_in_db_threadpool(is_financial_summary_empty):
+            await asyncio.sleep(FINANCIAL_SUMMARY_REFRESH_INTERVAL)
+    except Exception as e:
+        log.warning(f"Financial summary refresh disabled: {e}")
+        return
+
+    while True:
+        try:
+            await run_in_db_threadpool(refresh_financial_summary)
+        except Exception as e:
+            log.error(f"Financial summary refresh failed: {e}")
+        await asyncio.sleep(FINANCIAL_SUMMARY_REFRESH_INTERVAL)
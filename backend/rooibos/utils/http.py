@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+
+from open_webui.env import SRC_LOG_LEVELS
+from rooibos.config_extension import NAVER_API_TIMEOUT, NAVER_API_POOL_SIZE
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
+
+####################
+# Shared aiohttp session for external APIs (Naver)
+#
+# 요청마다 세션을 만들지 않고 keep-alive 커넥션 풀을 재사용한다.
+####################
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=NAVER_API_POOL_SIZE,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(total=NAVER_API_TIMEOUT),
+            trust_env=True,
+        )
+    return _session
+
+
+async def close_http_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+####################
+# Request coalescing
+#
+# 같은 키로 동시에 들어온 요청은 하나의 upstream 호출 결과를 함께 기다린다.
+####################
+
+_inflight: dict[str, asyncio.Future] = {}
+
+
+async def coalesce(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # 먼저 요청한 클라이언트가 연결을 끊어도 나머지 대기자를 위해 호출은 계속 진행
+    return await asyncio.shield(task)
+
+
+####################
+# Circuit breaker
+#
+# 연속 실패가 failure_threshold 에 도달하면 reset_timeout 초 동안 호출을 차단한다.
+# 차단 시간이 지나면 다음 호출을 시험 삼아 허용하고, 다시 실패하면 즉시 차단한다.
+####################
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                log.warning(
+                    f"{self.name}: {self.failures} consecutive failures, "
+                    f"blocking calls for {self.reset_timeout}s"
+                )
+            self.opened_at = time.monotonic()
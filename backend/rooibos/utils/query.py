@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.internal.db import get_db
+from rooibos.config_extension import (
+    ROOIBOS_PREPARED_STATEMENTS,
+    ROOIBOS_PREPARED_STATEMENTS_MAX,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["COMFYUI"])
+
+####################
+# Parameterized query helpers
+#
+# 라우터에서는 기존처럼 $1, $2 ... 자리표시자로 SQL 을 조립하고 값은 params 리스트에 담는다.
+# 값이 SQL 문자열에 들어가지 않으므로 같은 조건 형태(filter shape)의 요청은 항상 같은
+# SQL 문자열이 되고, 컴파일 결과와 서버 측 실행 계획을 재사용할 수 있다.
+####################
+
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+
+# 커넥션별로 PREPARE 된 문장 이름을 저장하는 connection.info 키
+_PREPARED_INFO_KEY = "rooibos_prepared_statements"
+
+# PREPARE 에 실패한 (타입 추론 불가 등) 문장은 다시 시도하지 않음
+_unpreparable: set[str] = set()
+_unpreparable_lock = threading.Lock()
+
+
+def normalize_query(sql_query: str) -> str:
+    """빈 줄을 제거해 로그와 캐시 키를 일정하게 유지"""
+    return "\n".join(line for line in sql_query.splitlines() if line.strip())
+
+
+@lru_cache(maxsize=512)
+def compile_query(sql_query: str) -> TextClause:
+    """
+    $n 자리표시자를 :pn 바인드 파라미터로 바꾼 text() 문을 조건 형태별로 캐시합니다.
+    같은 TextClause 객체를 재사용하므로 SQLAlchemy 컴파일 캐시도 항상 적중합니다.
+    """
+    return text(_PLACEHOLDER.sub(lambda m: f":p{m.group(1)}", sql_query))
+
+
+def bind_params(params: list) -> dict:
+    return {f"p{index + 1}": param for index, param in enumerate(params)}
+
+
+def get_statement_name(sql_query: str) -> str:
+    return "rb_" + hashlib.sha1(sql_query.encode("utf-8")).hexdigest()[:20]
+
+
+@lru_cache(maxsize=512)
+def get_execute_statement(name: str, param_count: int) -> TextClause:
+    if param_count == 0:
+        return text(f"EXECUTE {name}")
+    placeholders = ", ".join(f":p{index + 1}" for index in range(param_count))
+    return text(f"EXECUTE {name}({placeholders})")
+
+
+def _use_prepared_statements(db: Session) -> bool:
+    if not ROOIBOS_PREPARED_STATEMENTS:
+        return False
+    dialect = db.bind.dialect
+    # psycopg(3) 등은 드라이버가 서버 측 바인딩/prepare 를 직접 처리함
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _prepare(db: Session, name: str, sql_query: str) -> bool:
+    connection = db.connection()
+    prepared = connection.info.setdefault(_PREPARED_INFO_KEY, set())
+    if name in prepared:
+        return True
+    if name in _unpreparable:
+        return False
+
+    if len(prepared) >= ROOIBOS_PREPARED_STATEMENTS_MAX:
+        connection.exec_driver_sql("DEALLOCATE ALL")
+        prepared.clear()
+
+    try:
+        # PREPARE 실패 시 트랜잭션 전체가 abort 되지 않도록 savepoint 안에서 실행
+        with db.begin_nested():
+            connection.exec_driver_sql(f"PREPARE {name} AS {sql_query}")
+    except Exception as e:
+        log.warning(f"Failed to prepare statement {name}, falling back: {e}")
+        with _unpreparable_lock:
+            _unpreparable.add(name)
+        return False
+
+    prepared.add(name)
+    return True
+
+
+def execute_query(
+    db: Session,
+    sql_query: str,
+    params: list = [],
+    prepare: bool = True,
+    execution_options: Optional[dict] = None,
+):
+    """
+    $n 자리표시자 SQL 을 바인드 파라미터로 실행합니다.
+    PostgreSQL(psycopg2) 에서는 서버 측 prepared statement 를 커넥션별로 재사용합니다.
+    EXPLAIN 이나 서버 측 커서(stream_results)처럼 EXECUTE 로 감쌀 수 없는 경우 prepare=False
+    """
+    sql_query = normalize_query(sql_query)
+
+    if prepare and _use_prepared_statements(db):
+        name = get_statement_name(sql_query)
+        if _prepare(db, name, sql_query):
+            return db.execute(
+                get_execute_statement(name, len(params)),
+                bind_params(params),
+                execution_options=execution_options or {},
+            )
+
+    return db.execute(
+        compile_query(sql_query),
+        bind_params(params),
+        execution_options=execution_options or {},
+    )
+
+
+_schema_features = {}
+
+
+def has_schema_feature(name: str, sql_query: str) -> bool:
+    """
+    sql_migrations 스크립트 적용 여부(테이블/컬럼/인덱스 존재)를 프로세스당 한 번만 확인
+    PostgreSQL 이 아니면 항상 False
+    """
+    if name not in _schema_features:
+        try:
+            with get_db() as db:
+                if db.bind.dialect.name != "postgresql":
+                    _schema_features[name] = False
+                else:
+                    _schema_features[name] = (
+                        db.execute(text(sql_query)).first() is not None
+                    )
+        except Exception as e:
+            log.warning(f"Schema feature check '{name}' failed: {e}")
+            _schema_features[name] = False
+        log.info(f"Rooibos schema feature '{name}' available: {_schema_features[name]}")
+    return _schema_features[name]
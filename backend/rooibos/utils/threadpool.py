@@ -0,0 +1,51 @@
+import functools
+from typing import Any, Callable, Optional
+
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+from fastapi import Request
+
+from rooibos.config_extension import ROOIBOS_DB_THREADPOOL_SIZE
+
+####################
+# Bounded thread pool for blocking DB work
+#
+# rooibos 라우터는 동기 SQLAlchemy 세션(get_db)을 사용하므로, 핸들러 본문을 전용 스레드에서
+# 실행해 이벤트 루프(채팅 스트리밍, 소켓 등)가 느린 쿼리 때문에 멈추지 않도록 한다.
+# 동시에 실행되는 작업 수는 ROOIBOS_DB_THREADPOOL_SIZE 로 제한한다.
+####################
+
+_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def get_db_limiter() -> anyio.CapacityLimiter:
+    # CapacityLimiter 는 이벤트 루프 안에서 생성해야 함
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(ROOIBOS_DB_THREADPOOL_SIZE)
+    return _limiter
+
+
+async def run_in_db_threadpool(func: Callable, *args, **kwargs) -> Any:
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=get_db_limiter()
+    )
+
+
+def db_threadpool(func: Callable) -> Callable:
+    """
+    동기 라우트 핸들러를 전용 스레드 풀에서 실행하는 async 핸들러로 감싼다.
+    functools.wraps 로 원래 시그니처를 유지하므로 FastAPI 파라미터/의존성 처리는 그대로 동작한다.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_in_db_threadpool(func, *args, **kwargs)
+
+    return wrapper
+
+
+def read_json_body(request: Request) -> Any:
+    """스레드 풀에서 실행 중인 핸들러에서 요청 본문(JSON)을 읽는다"""
+    return anyio.from_thread.run(request.json)
@@ -1,4 +1,42 @@
+import { get } from 'svelte/store';
+
 import { WEBUI_API_BASE_URL } from '$lib/constants';
+import { socket } from '$lib/stores';
+
+const FILE_JOB_FINISHED = ['completed', 'failed'];
+const FILE_JOB_POLL_INTERVAL = 5000;
+
+// Uploaded files are processed by a background job; its status comes through
+// "file-events", polling covers events missed while the socket was disconnected
+const waitForFileJob = (token: string, job) =>
+	new Promise<any>((resolve) => {
+		const s = get(socket);
+		let timer = null;
+
+		const finish = (result) => {
+			s?.off('file-events', onEvent);
+			clearTimeout(timer);
+			resolve(result);
+		};
+
+		const onEvent = (event) => {
+			if (event?.job_id === job.id && FILE_JOB_FINISHED.includes(event.status)) {
+				finish(event);
+			}
+		};
+
+		const poll = async () => {
+			const latest = await getFileJobById(token, job.file_id).catch(() => null);
+			if (latest?.id === job.id && FILE_JOB_FINISHED.includes(latest.status)) {
+				finish(latest);
+			} else {
+				timer = setTimeout(poll, FILE_JOB_POLL_INTERVAL);
+			}
+		};
+
+		s?.on('file-events', onEvent);
+		timer = setTimeout(poll, s ? FILE_JOB_POLL_INTERVAL : 1000);
+	});
 
 export const uploadFile = async (token: string, file: File) => {
 	const data = new FormData();
@@ -27,6 +65,44 @@ export const uploadFile = async (token: string, file: File) => {
 		throw error;
 	}
 
+	if (res?.job && !FILE_JOB_FINISHED.includes(res.job.status)) {
+		const job = await waitForFileJob(token, res.job);
+		const processed = await getFileById(token, res.id).catch(() => null);
+
+		return {
+			...(processed ?? res),
+			...(job.status === 'failed' ? { error: job.error } : {})
+		};
+	}
+
+	return res;
+};
+
+export const getFileJobById = async (token: string, id: string) => {
+	let error = null;
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/files/${id}/job`, {
+		method: 'GET',
+		headers: {
+			Accept: 'application/json',
+			'Content-Type': 'application/json',
+			authorization: `Bearer ${token}`
+		}
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.log(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
 	return res;
 };
 